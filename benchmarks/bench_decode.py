@@ -0,0 +1,97 @@
+"""Compare datafeed decoders on recorded feeds.
+
+Usage:
+    python benchmarks/bench_decode.py feed1.json [feed2.json ...] [-n 20]
+    python benchmarks/bench_decode.py --record data/feed.json   # save the live feed first
+
+Reports, per file, the time to decode to dicts with each available backend,
+the time to build a FeedSnapshot from those dicts, the msgspec typed decode
+straight into records (when msgspec is installed), and partial parses of
+single sections with the selected backend.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.client_records import FeedSnapshot  # noqa: E402
+from utils import json_decode  # noqa: E402
+from utils.vatsim_datafeed import VATSIM_DATA_URL  # noqa: E402
+
+
+def _time(func, raw, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(raw)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), min(timings)
+
+
+def _peak_kib(func, raw):
+    tracemalloc.start()
+    result = func(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / 1024
+
+
+def bench_file(path, runs):
+    with open(path, "rb") as f:
+        raw = f.read()
+    cases = []
+    for name, decoder in sorted(json_decode.DECODERS.items()):
+        cases.append((f"{name} -> dict", decoder))
+        cases.append((f"{name} -> records", lambda b, d=decoder: FeedSnapshot.from_feed(d(b))))
+    if json_decode.msgspec is not None:
+        decoder = json_decode._feed_decoder or json_decode._build_feed_schema()
+        cases.append(("msgspec typed -> records", lambda b: FeedSnapshot.from_struct(decoder.decode(b))))
+    # Partial parsing with the selected backend
+    snapshot_sections = json_decode.SNAPSHOT_SECTIONS
+    cases.append(("client sections -> records",
+                  lambda b: FeedSnapshot.from_feed(json_decode.decode_sections(b, snapshot_sections))))
+    cases.append(("pilots only", lambda b: json_decode.decode_sections(b, ("pilots",))))
+    cases.append(("controllers only", lambda b: json_decode.decode_sections(b, ("controllers",))))
+    cases.append(("cids only", json_decode.extract_cids))
+
+    print(f"\n{path} ({len(raw) / 1024:.0f} KiB, {runs} runs)")
+    print(f"  {'decoder':<28}{'median ms':>10}{'min ms':>10}{'peak KiB':>11}")
+    for label, func in cases:
+        median, best = _time(func, raw, runs)
+        peak = _peak_kib(func, raw)
+        print(f"  {label:<28}{median * 1000:>10.2f}{best * 1000:>10.2f}{peak:>11.0f}")
+
+
+def record(path):
+    import requests
+    response = requests.get(VATSIM_DATA_URL, timeout=30)
+    response.raise_for_status()
+    with open(path, "wb") as f:
+        f.write(response.content)
+    print(f"Saved {len(response.content) / 1024:.0f} KiB to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("feeds", nargs="*", help="Recorded vatsim-data.json files")
+    parser.add_argument("-n", "--runs", type=int, default=20)
+    parser.add_argument("--record", metavar="PATH", help="Download the live feed to PATH and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+    if not args.feeds:
+        parser.error("pass at least one recorded feed (use --record to capture one)")
+    print(f"Available backends: {', '.join(sorted(json_decode.DECODERS))} (auto -> {json_decode.BACKEND})")
+    for path in args.feeds:
+        bench_file(path, args.runs)
+
+
+if __name__ == "__main__":
+    main()
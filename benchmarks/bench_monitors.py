@@ -0,0 +1,294 @@
+"""Per-cycle benchmarks for the monitor loops.
+
+Feeds synthetic snapshots (see feedgen.py) through each monitor's matching and
+diffing logic with Discord, Mapbox, OpenCage and the VATSIM APIs stubbed out,
+and reports per-cycle latency, allocations and peak RSS.
+
+Usage:
+    python benchmarks/bench_monitors.py                      # 1k/5k/20k clients, all monitors
+    python benchmarks/bench_monitors.py --sizes 5000 --monitors cid,type -n 10
+    python benchmarks/bench_monitors.py --json results.json  # keep results to diff later
+
+Each (monitor, size) pair runs in a fresh process so peak RSS is per case.
+The feed is downloaded/decoded outside the timed section; the `decode` case
+measures that step on its own.
+"""
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MONITORS = ("decode", "cid", "callsign", "type", "a4", "keywords", "coc", "newcid")
+DEFAULT_SIZES = (1000, 5000, 20000)
+
+
+class _StubMessage:
+    _next_id = 0
+
+    def __init__(self):
+        _StubMessage._next_id += 1
+        self.id = _StubMessage._next_id
+
+    async def edit(self, **kwargs):
+        return self
+
+
+class _StubChannel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+        return _StubMessage()
+
+
+class _StubBot:
+    def __init__(self):
+        self.channel = _StubChannel(1)
+
+    def get_channel(self, channel_id):
+        return self.channel
+
+    def get_cog(self, name):
+        return None
+
+
+class _StubResponse:
+    status = 404
+
+    async def json(self):
+        return {}
+
+    async def text(self):
+        return ""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _StubSession:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get(self, *args, **kwargs):
+        return _StubResponse()
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _install_stubs(state):
+    """Patch every network and storage dependency the loops touch."""
+    import aiohttp
+    from discord.ext import tasks
+    import utils.vatsim_datafeed as vatsim_datafeed
+    import utils.datafeed_embed as datafeed_embed
+    import utils.routing as routing
+    import utils.feed_scheduler as feed_scheduler
+
+    tasks.Loop.start = lambda self, *args, **kwargs: None
+    aiohttp.ClientSession = _StubSession
+
+    async def fetch_raw():
+        return state["raw"]
+
+    async def geocode(lat, lon):
+        return "Somewhere"
+
+    async def map_image(*args, **kwargs):
+        return io.BytesIO(b"\x89PNG")
+
+    async def user_name(cid, session=None):
+        return "N/A"
+
+    async def no_wait(name):
+        pass
+
+    vatsim_datafeed.fetch_vatsim_raw = fetch_raw
+    datafeed_embed.reverse_geocode = geocode
+    datafeed_embed.generate_map_image = map_image
+    datafeed_embed.fetch_user_name = user_name
+    # Cycles are driven back to back here rather than on the feed's clock
+    feed_scheduler.scheduler.wait = no_wait
+    routing.load_channel_routes = lambda: {monitor: [1] for monitor in routing.MONITORS}
+
+
+def _new_cycle(raw):
+    """Swap in the next snapshot and drop the shared feed cache."""
+    import utils.vatsim_datafeed as vatsim_datafeed
+    vatsim_datafeed._feed_cache.update(raw=raw, snapshot=None, fetched_at=time.monotonic())
+
+
+def _build_case(monitor, first_feed):
+    """Return an async callable running one cycle of `monitor`."""
+    import utils.vatsim_datafeed as vatsim_datafeed
+    bot = _StubBot()
+    # Watch ~1% of the initial connections; churn logs some of them off over the run
+    online = [c["cid"] for c in first_feed["pilots"] + first_feed["controllers"]]
+    watched_cids = {cid: f"Watched {i}" for i, cid in enumerate(online[::100])}
+    keywords = ["TCAS", "EMERG*"]
+
+    if monitor == "decode":
+        async def run():
+            vatsim_datafeed._feed_cache["snapshot"] = None
+            await vatsim_datafeed.fetch_vatsim_snapshot()
+        return run
+
+    if monitor == "cid":
+        import extensions.cid_monitor_loop as mod
+        mod.get_cid_to_monitor = lambda: watched_cids
+        cog = mod.VATSIMMonitor(bot)
+        return cog.monitor_loop
+
+    if monitor == "callsign":
+        import extensions.callsign_monitor_loop as mod
+        mod.load_callsign_monitor = lambda: {"AAL1*": "AAL", "BAW*": "Speedbird", "N1*": "GA"}
+        cog = mod.CallsignMonitor(bot)
+        return cog.callsign_monitor_loop
+
+    if monitor == "type":
+        import extensions.type_monitor_loop as mod
+        mod.load_type_monitor = lambda: {"B744": "Queen", "A359": "A350", "C17*": "Cessna"}
+        cog = mod.TypeMonitorLoop(bot)
+        return cog.type_monitor_loop
+
+    import extensions.coc_monitor_loop as coc
+    coc.load_fake_names = lambda: ["Test Test", "John Doe*", "Pilot*"]
+    coc.load_a1_monitor = lambda: keywords
+    coc.load_a9_monitor = lambda: ["NORDO"]
+    cog = coc.CocMonitorLoop(bot)
+    cog.a4_muted = False
+
+    if monitor == "a4":
+        async def run():
+            snapshot = await vatsim_datafeed.fetch_vatsim_snapshot()
+            await cog.check_a4_violations(snapshot)
+        return run
+
+    if monitor == "keywords":
+        async def run():
+            snapshot = await vatsim_datafeed.fetch_vatsim_snapshot()
+            await cog.check_keyword_matches(snapshot, keywords, cog.a1_status_cache, "A1")
+        return run
+
+    if monitor == "coc":
+        return cog.coc_monitor_loop
+
+    if monitor == "newcid":
+        import extensions.newcid_monitor_loop as mod
+        mod.NewCidMonitorLoop._save_highest_cid = lambda self, cid: None
+        mod.NewCidMonitorLoop._load_highest_cid = lambda self: 0
+        cog = mod.NewCidMonitorLoop(bot)
+        return cog.newcid_monitor_loop
+
+    raise ValueError(f"unknown monitor {monitor}")
+
+
+def _run_case(args):
+    """Worker: time `cycles` cycles of one monitor at one size. Runs in its own process."""
+    monitor, clients, cycles, seed = args
+    import feedgen
+
+    snapshots = list(feedgen.Network(clients, seed=seed).snapshots(cycles + 2))
+    first_feed = snapshots[0]
+    feeds = [json.dumps(feed).encode() for feed in snapshots]
+    del snapshots
+    state = {"raw": feeds[0]}
+    _install_stubs(state)
+
+    async def main():
+        run = _build_case(monitor, first_feed)
+        import utils.vatsim_datafeed as vatsim_datafeed
+
+        async def one_cycle(raw, trace=False):
+            state["raw"] = raw
+            _new_cycle(raw)
+            if monitor not in ("decode", "newcid"):
+                # Decode outside the measured section for the matching/diffing cases
+                await vatsim_datafeed.fetch_vatsim_snapshot()
+            if trace:
+                tracemalloc.start()
+            start = time.perf_counter()
+            await run()
+            elapsed = time.perf_counter() - start
+            if trace:
+                traced = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                return traced
+            return elapsed
+
+        # Warm-up: first cycle sends every initial alert
+        await one_cycle(feeds[0])
+        timings = [await one_cycle(raw) for raw in feeds[1:cycles + 1]]
+        # Allocations are measured on a separate cycle since tracing slows everything down
+        current, peak = await one_cycle(feeds[cycles + 1], trace=True)
+        return timings, current, peak
+
+    timings, current, peak = asyncio.run(main())
+    return {
+        "monitor": monitor,
+        "clients": clients,
+        "median_ms": statistics.median(timings) * 1000,
+        "max_ms": max(timings) * 1000,
+        "alloc_peak_kib": peak / 1024,
+        "alloc_retained_kib": current / 1024,
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated client counts")
+    parser.add_argument("--monitors", default=",".join(MONITORS), help=f"Comma-separated subset of: {', '.join(MONITORS)}")
+    parser.add_argument("-n", "--cycles", type=int, default=5, help="Timed cycles per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Also write results as JSON")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    monitors = [m.strip() for m in args.monitors.split(",") if m.strip()]
+    unknown = set(monitors) - set(MONITORS)
+    if unknown:
+        parser.error(f"unknown monitors: {', '.join(sorted(unknown))}")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    print(f"{'monitor':<10}{'clients':>8}{'median ms':>11}{'max ms':>10}{'alloc peak KiB':>16}{'retained KiB':>14}{'peak RSS MiB':>14}")
+    for clients in sizes:
+        for monitor in monitors:
+            with ctx.Pool(1) as pool:
+                r = pool.apply(_run_case, ((monitor, clients, args.cycles, args.seed),))
+            results.append(r)
+            print(f"{r['monitor']:<10}{r['clients']:>8}{r['median_ms']:>11.2f}{r['max_ms']:>10.2f}"
+                  f"{r['alloc_peak_kib']:>16.0f}{r['alloc_retained_kib']:>14.0f}{r['peak_rss_mib']:>14.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""Synthetic VATSIM network generator for benchmarks and load tests.
+
+Emits v3 datafeed JSON at any scale. A `Network` evolves between snapshots
+the way the real one does:
+
+- pilots fly their filed route at their groundspeed (15s per snapshot)
+- a share of connections log off and new ones log on (`churn`)
+- a few brand-new members appear above the current highest CID
+- controllers carry ATIS text, ATIS stations carry a letter that advances
+
+Names follow a realistic mix (full names, shortened names, first names only,
+CID-only, home-airport suffixes) plus a configurable share of names that
+break CoC A4, so the A4 checks have realistic work to do.
+
+Usage:
+    python benchmarks/feedgen.py --clients 20000 --cycles 40 --out feeds/
+    python benchmarks/feedgen.py --scale 10 --cycles 240 --out ctp/   # 10x a normal evening
+    python scripts/replay_server.py --feeds ctp/
+
+In code:
+    network = Network(5000, seed=1)
+    for feed in network.snapshots(10): ...
+"""
+import argparse
+import json
+import math
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+# Roughly a busy evening today; --scale multiplies this
+NETWORK_BASELINE = 2000
+SNAPSHOT_INTERVAL = 15  # seconds between datafeed updates
+
+PILOT_SHARE = 0.85
+ATIS_SHARE = 0.03
+PREFILE_SHARE = 0.05
+
+_FIRST = (
+    "James", "John", "Robert", "Michael", "David", "William", "Richard", "Thomas", "Daniel", "Matthew",
+    "Mary", "Jennifer", "Linda", "Sarah", "Jessica", "Emily", "Laura", "Anna", "Emma", "Sofia",
+    "Lukas", "Jonas", "Felix", "Max", "Leon", "Paul", "Finn", "Elias", "Noah", "Ben",
+    "Luca", "Matteo", "Marco", "Giulia", "Chiara", "Pierre", "Louis", "Hugo", "Camille", "Chloe",
+    "Wei", "Chen", "Hiroshi", "Yuki", "Min-jun", "Ji-woo", "Ahmed", "Omar", "Fatima", "Ravi",
+    "Arjun", "Priya", "Carlos", "Jose", "Juan", "Lucia", "Mateus", "Gabriel", "Olga", "Dmitri",
+)
+_LAST = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis", "Wilson", "Anderson", "Taylor",
+    "Muller", "Schmidt", "Schneider", "Fischer", "Weber", "Rossi", "Russo", "Ferrari", "Martin", "Bernard",
+    "Dubois", "Garcia", "Rodriguez", "Martinez", "Lopez", "Silva", "Santos", "Oliveira", "Kim", "Lee",
+    "Park", "Wang", "Li", "Zhang", "Tanaka", "Suzuki", "Khan", "Patel", "Singh", "Novak",
+    "O'Brien", "van der Berg", "De Luca", "Kowalski", "Nielsen", "Johansson", "Ivanov", "Murphy", "Kelly", "Walsh",
+)
+_HOME_AIRPORTS = ("KJFK", "EGLL", "KW91", "NC0", "W00", "EDDF", "KBOS", "CYYZ", "LFPG", "KORD")
+_FAKE_NAMES = ("Pilot", "Test Test", "John Doe", "Captain", "Real Name", "XXXX", "asdf", "Mr Pilot", "N/A", "Anon")
+
+# (ICAO, lat, lon, weight) - hubs dominate, like on the real network
+_AIRPORTS = (
+    ("KJFK", 40.64, -73.78, 8), ("KBOS", 42.36, -71.01, 5), ("KDCA", 38.85, -77.04, 4), ("KATL", 33.64, -84.43, 7),
+    ("KORD", 41.98, -87.90, 6), ("KLAX", 33.94, -118.41, 7), ("KSFO", 37.62, -122.38, 5), ("KMIA", 25.79, -80.29, 4),
+    ("KDFW", 32.90, -97.04, 5), ("KDEN", 39.86, -104.67, 4), ("KSEA", 47.45, -122.31, 3), ("CYYZ", 43.68, -79.63, 4),
+    ("EGLL", 51.47, -0.45, 9), ("EGKK", 51.15, -0.19, 4), ("EHAM", 52.31, 4.76, 7), ("LFPG", 49.01, 2.55, 6),
+    ("EDDF", 50.03, 8.57, 7), ("EDDM", 48.35, 11.79, 4), ("LEMD", 40.47, -3.56, 4), ("LIRF", 41.80, 12.24, 3),
+    ("EIDW", 53.42, -6.27, 3), ("LOWW", 48.11, 16.57, 3), ("LSZH", 47.46, 8.55, 3), ("EKCH", 55.62, 12.66, 3),
+    ("OMDB", 25.25, 55.36, 4), ("VHHH", 22.31, 113.91, 3), ("RJTT", 35.55, 139.78, 3), ("YSSY", -33.95, 151.18, 3),
+    ("SBGR", -23.43, -46.47, 3), ("FAOR", -26.14, 28.25, 2), ("KGAI", 39.17, -77.17, 1), ("KHEF", 38.72, -77.52, 1),
+)
+# (short type, equipment suffix, cruise TAS, cruise FL, weight, airliner?)
+_TYPES = (
+    ("A320", "M-SDE2E3FGHIJ1RWXY/LB1", 450, 360, 14, True), ("B738", "M-SDE2E3FGHIJ1RWXY/LB1", 450, 370, 16, True),
+    ("A321", "M-SDE2E3FGHIJ1RWXY/LB1", 455, 350, 6, True), ("A20N", "M-SDE2E3FGHIJ1RWXY/LB1", 450, 370, 6, True),
+    ("B77W", "H-SDE2E3FGHIJ2J3J5M1RWXY/LB1D1", 490, 380, 6, True), ("B789", "H-SDE2E3FGHIJ2J3J5M1RWXY/LB1D1", 490, 400, 5, True),
+    ("A359", "H-SDE2E3FGHIJ2J3J5M1RWXY/LB1D1", 485, 390, 4, True), ("B744", "H-SDE2E3FGHIJ2J3J5M1RWXY/LB1D1", 490, 350, 3, True),
+    ("E175", "M-SDE2E3FGHIJ1RWXY/LB1", 430, 350, 3, True), ("CRJ9", "M-SDE2E3FGHIJ1RWXY/LB1", 430, 360, 2, True),
+    ("C172", "L-SG/C", 110, 45, 5, False), ("PA28", "L-SG/C", 115, 55, 2, False), ("SR22", "L-SGR/C", 170, 95, 2, False),
+    ("TBM9", "L-SDFGRY/S", 300, 280, 1, False),
+)
+_AIRLINES = ("AAL", "DAL", "UAL", "SWA", "JBU", "ACA", "BAW", "VIR", "DLH", "AFR", "KLM", "RYR", "EZY", "UAE", "QTR", "SIA")
+_FIXES = ("ALPHA", "BRAVO", "MERIT", "HAPIE", "JUDDS", "SWANN", "LAMMY", "BIGGN", "DOTTY", "RESNO", "NATW", "MALOT",
+          "GISTI", "BUNAV", "SUPUR", "DINIM", "ELSIR", "TOPPS", "MONTY", "ROBUC", "LENDY", "KOKSY", "TULIP", "RIVER")
+_AIRWAYS = ("J42", "J75", "J121", "Q430", "Y141", "UL9", "UN160", "L9", "N864", "T420", "UM605", "Z50")
+_REMARK_EXTRAS = ("TCAS", "/R/ RECEIVE ONLY", "/T/ TEXT ONLY", "NEW PILOT", "STUDENT", "SIMBRIEF", "RMK/TCAS EQUIPPED")
+_SERVERS = ("USA-EAST", "USA-WEST", "UK-1", "GERMANY", "CANADA", "SINGAPORE", "AUTOMATIC")
+_FACILITIES = ((2, "DEL", 20), (3, "GND", 20), (4, "TWR", 50), (5, "APP", 150), (6, "CTR", 600), (1, "FSS", 1500))
+
+
+def _stamp(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.0000000Z")
+
+
+def _weighted(rng, items, weight_index):
+    return rng.choices(items, weights=[item[weight_index] for item in items])[0]
+
+
+def _bearing_step(lat, lon, dest_lat, dest_lon, distance_nm):
+    """Move `distance_nm` from (lat, lon) toward the destination; returns (lat, lon, heading)."""
+    d_lat = dest_lat - lat
+    d_lon = (dest_lon - lon) * math.cos(math.radians(lat))
+    remaining = math.hypot(d_lat, d_lon) * 60
+    heading = (math.degrees(math.atan2(d_lon, d_lat)) + 360) % 360
+    if remaining <= distance_nm or remaining == 0:
+        return dest_lat, dest_lon, heading
+    frac = distance_nm / remaining
+    return lat + (dest_lat - lat) * frac, lon + (dest_lon - lon) * frac, heading
+
+
+class Network:
+    """A simulated network whose snapshots evolve with movement and churn."""
+
+    def __init__(self, clients, seed=0, churn=0.005, new_member_rate=0.02, a4_rate=0.02,
+                 start=datetime(2024, 5, 1, 18, 0, tzinfo=timezone.utc)):
+        self.rng = random.Random(seed)
+        self.churn = churn
+        self.new_member_rate = new_member_rate
+        self.a4_rate = a4_rate
+        self.now = start
+        self.cycle = 0
+        self.highest_cid = 1_900_000
+        self.online_cids = set()
+        self.pilots = []
+        self.controllers = []
+        self.atis = []
+        self.prefiles = []
+        n_pilots = int(clients * PILOT_SHARE)
+        n_atis = int(clients * ATIS_SHARE)
+        for _ in range(n_pilots):
+            self.pilots.append(self._new_pilot(airborne=True))
+        for _ in range(clients - n_pilots - n_atis):
+            self.controllers.append(self._new_controller())
+        for _ in range(n_atis):
+            self.atis.append(self._new_controller(atis=True))
+        for _ in range(int(clients * PREFILE_SHARE)):
+            self.prefiles.append(self._new_prefile())
+
+    # --- identities ---
+
+    def _new_cid(self):
+        rng = self.rng
+        if rng.random() < self.new_member_rate:
+            # Brand-new registration: above everything seen so far
+            self.highest_cid += rng.randint(1, 40)
+            cid = self.highest_cid
+        else:
+            cid = rng.randint(800_000, self.highest_cid - 1)
+        while cid in self.online_cids:
+            cid += 1
+        self.highest_cid = max(self.highest_cid, cid)
+        self.online_cids.add(cid)
+        return cid
+
+    def _name(self, cid):
+        rng = self.rng
+        if rng.random() < self.a4_rate:
+            style = rng.randrange(4)
+            if style == 0:
+                return rng.choice(_FAKE_NAMES)
+            if style == 1:
+                return f"{rng.choice(_FIRST)}{rng.randint(1, 999)}"
+            if style == 2:
+                return f"{rng.choice(_FIRST)}!!"
+            return rng.choice("AXZ") * rng.randint(4, 6)
+        roll = rng.random()
+        first, last = rng.choice(_FIRST), rng.choice(_LAST)
+        if roll < 0.55:
+            name = f"{first} {last}"
+        elif roll < 0.70:
+            name = f"{first} {last[0]}."
+        elif roll < 0.82:
+            name = first
+        elif roll < 0.92:
+            name = str(cid)
+        else:
+            name = f"{first} {last}"
+        if rng.random() < 0.08:
+            name = f"{name} {rng.choice(_HOME_AIRPORTS)}"
+        return name
+
+    # --- clients ---
+
+    def _flight_plan(self, airliner=None):
+        rng = self.rng
+        dep = _weighted(rng, _AIRPORTS, 3)
+        arr = _weighted(rng, _AIRPORTS, 3)
+        while arr is dep:
+            arr = _weighted(rng, _AIRPORTS, 3)
+        ac = _weighted(rng, _TYPES, 4)
+        if airliner is not None:
+            while ac[5] != airliner:
+                ac = _weighted(rng, _TYPES, 4)
+        short, equip, tas, fl, _, is_airliner = ac
+        route = " ".join(
+            rng.choice(_FIXES) + (f" {rng.choice(_AIRWAYS)}" if i % 2 == 0 else "")
+            for i in range(rng.randint(2, 9))
+        )
+        remarks = f"PBN/A1B1C1D1L1O1S1 DOF/{self.now:%y%m%d} REG/N{rng.randint(100, 999)}{rng.choice('ABCDEF')}{rng.choice('ABCDEF')} /V/"
+        if rng.random() < 0.05:
+            remarks += " " + rng.choice(_REMARK_EXTRAS)
+        return {
+            "flight_rules": "I" if is_airliner or rng.random() < 0.3 else "V",
+            "aircraft": f"{short}/{equip}",
+            "aircraft_faa": f"{short}/L",
+            "aircraft_short": short,
+            "departure": dep[0],
+            "arrival": arr[0],
+            "alternate": rng.choice(_AIRPORTS)[0] if is_airliner else "",
+            "cruise_tas": str(tas),
+            "altitude": str(fl * 100),
+            "deptime": f"{self.now:%H%M}",
+            "enroute_time": f"{rng.randint(0, 11):02d}{rng.randrange(0, 60, 5):02d}",
+            "fuel_time": f"{rng.randint(1, 14):02d}{rng.randrange(0, 60, 5):02d}",
+            "remarks": remarks,
+            "route": route if is_airliner else "DCT",
+            "revision_id": rng.randint(0, 3),
+            "assigned_transponder": f"{rng.randint(0, 7)}{rng.randint(0, 7)}{rng.randint(0, 7)}{rng.randint(0, 7)}",
+        }
+
+    def _new_pilot(self, airborne=False):
+        rng = self.rng
+        cid = self._new_cid()
+        fp = self._flight_plan() if rng.random() < 0.93 else None
+        short = fp["aircraft_short"] if fp else "C172"
+        airliner = any(t[0] == short and t[5] for t in _TYPES)
+        if airliner:
+            callsign = f"{rng.choice(_AIRLINES)}{rng.randint(1, 9999)}"
+        else:
+            callsign = f"N{rng.randint(1, 999)}{rng.choice('ABCDEFGHJK')}{rng.choice('ABCDEFGHJK')}"
+        dep = next((a for a in _AIRPORTS if fp and a[0] == fp["departure"]), rng.choice(_AIRPORTS))
+        arr = next((a for a in _AIRPORTS if fp and a[0] == fp["arrival"]), dep)
+        lat, lon = dep[1], dep[2]
+        if airborne:
+            # Somewhere along the route
+            frac = rng.random()
+            lat, lon = lat + (arr[1] - lat) * frac, lon + (arr[2] - lon) * frac
+        cruise = int(fp["altitude"]) if fp else 3000
+        logon = self.now - timedelta(minutes=rng.randint(1, 600) if airborne else 0)
+        return {
+            "cid": cid,
+            "name": self._name(cid),
+            "callsign": callsign,
+            "server": rng.choice(_SERVERS),
+            "pilot_rating": rng.choice((0, 0, 0, 1, 1, 3, 7, 15)),
+            "military_rating": 0,
+            "latitude": round(lat, 5),
+            "longitude": round(lon, 5),
+            "altitude": cruise if airborne else rng.randint(0, 800),
+            "groundspeed": (int(fp["cruise_tas"]) if fp else 100) if airborne else 0,
+            "transponder": fp["assigned_transponder"] if fp else "1200",
+            "heading": rng.randrange(360),
+            "qnh_i_hg": round(rng.uniform(29.6, 30.3), 2),
+            "qnh_mb": rng.randint(1003, 1026),
+            "flight_plan": fp,
+            "logon_time": _stamp(logon),
+            "last_updated": _stamp(self.now),
+            "_dest": (arr[1], arr[2]),
+        }
+
+    def _new_controller(self, atis=False):
+        rng = self.rng
+        cid = self._new_cid()
+        airport = _weighted(rng, _AIRPORTS, 3)
+        if atis:
+            fac, suffix, vis = 4, "ATIS", 0
+            callsign = f"{airport[0]}_ATIS"
+        else:
+            fac, suffix, vis = rng.choice(_FACILITIES)
+            prefix = airport[0][1:] if airport[0][0] == "K" else airport[0]
+            mid = f"_{rng.randint(1, 9)}" if rng.random() < 0.2 else ""
+            callsign = f"{prefix}{mid}_{suffix}"
+        code = rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+        if atis:
+            text = [
+                f"{airport[0]} ATIS INFO {code} {self.now:%H%M}Z",
+                f"{rng.randint(0, 35):02d}0{rng.randint(5, 25)}KT 10SM FEW{rng.randint(20, 80):03d} {rng.randint(5, 30)}/{rng.randint(-5, 15)} A{rng.randint(2960, 3030)}",
+                f"ILS RWY {rng.randint(1, 36)}{rng.choice(['L', 'R', ''])} APCH IN USE. DEPG RWY {rng.randint(1, 36)}.",
+                f"ADVS YOU HAVE INFO {code}.",
+            ]
+        else:
+            text = [
+                f"{airport[0]} {suffix} - Welcome!",
+                rng.choice((
+                    "Charts at chartfox.org", "Feedback: vatusa.net/feedback", "Please file a flight plan",
+                    "Text pilots welcome", "Event tonight - expect delays",
+                )),
+            ]
+        entry = {
+            "cid": cid,
+            "name": self._name(cid),
+            "callsign": callsign,
+            "frequency": f"1{rng.randint(18, 35)}.{rng.randrange(0, 1000, 5):03d}",
+            "facility": fac,
+            "rating": rng.choice((1, 2, 3, 3, 4, 5, 5, 7, 8, 10)) if suffix != "OBS" else 1,
+            "server": rng.choice(_SERVERS),
+            "visual_range": vis,
+            "text_atis": text,
+            "logon_time": _stamp(self.now - timedelta(minutes=rng.randint(1, 240))),
+            "last_updated": _stamp(self.now),
+        }
+        if atis:
+            entry["atis_code"] = code
+        return entry
+
+    def _new_prefile(self):
+        cid = self.rng.randint(800_000, self.highest_cid)
+        return {
+            "cid": cid,
+            "name": self._name(cid),
+            "callsign": f"{self.rng.choice(_AIRLINES)}{self.rng.randint(1, 9999)}",
+            "flight_plan": self._flight_plan(airliner=True),
+            "last_updated": _stamp(self.now),
+        }
+
+    # --- evolution ---
+
+    def _churn(self, clients, factory):
+        rng = self.rng
+        leaving = int(len(clients) * self.churn + rng.random())
+        for _ in range(min(leaving, len(clients))):
+            gone = clients.pop(rng.randrange(len(clients)))
+            self.online_cids.discard(gone["cid"])
+        target = len(clients) + leaving
+        while len(clients) < target:
+            clients.append(factory())
+
+    def step(self):
+        """Advance the network by one datafeed interval."""
+        self.now += timedelta(seconds=SNAPSHOT_INTERVAL)
+        self.cycle += 1
+        now = _stamp(self.now)
+        for pilot in self.pilots:
+            gs = pilot["groundspeed"]
+            if gs:
+                lat, lon, heading = _bearing_step(
+                    pilot["latitude"], pilot["longitude"], *pilot["_dest"], gs * SNAPSHOT_INTERVAL / 3600
+                )
+                pilot["latitude"], pilot["longitude"], pilot["heading"] = round(lat, 5), round(lon, 5), round(heading)
+            pilot["last_updated"] = now
+        for station in self.atis:
+            if self.rng.random() < 0.002:
+                code = chr((ord(station["atis_code"]) - ord("A") + 1) % 26 + ord("A"))
+                station["atis_code"] = code
+        self._churn(self.pilots, self._new_pilot)
+        self._churn(self.controllers, self._new_controller)
+        self._churn(self.atis, lambda: self._new_controller(atis=True))
+
+    def feed(self):
+        """Return the current state as a v3 datafeed dict."""
+        pilots = [{k: v for k, v in p.items() if k != "_dest"} for p in self.pilots]
+        stamp = _stamp(self.now)
+        return {
+            "general": {
+                "version": 3,
+                "reload": 1,
+                "update": self.now.strftime("%Y%m%d%H%M%S"),
+                "update_timestamp": stamp,
+                "connected_clients": len(self.pilots) + len(self.controllers) + len(self.atis),
+                "unique_users": len(self.online_cids),
+            },
+            "pilots": pilots,
+            "controllers": self.controllers,
+            "atis": self.atis,
+            "servers": [
+                {"ident": s, "hostname_or_ip": "127.0.0.1", "location": s, "name": s,
+                 "client_connections_allowed": True, "is_sweatbox": False}
+                for s in _SERVERS
+            ],
+            "prefiles": self.prefiles,
+            "facilities": [{"id": fac, "short": short, "long": short} for fac, short, _ in _FACILITIES],
+            "ratings": [{"id": i, "short": s, "long": s} for i, s in enumerate(("SUS", "OBS", "S1", "S2", "S3", "C1"))],
+            "pilot_ratings": [{"id": 0, "short_name": "NEW", "long_name": "Basic Member"}],
+            "military_ratings": [{"id": 0, "short_name": "M0", "long_name": "No Military Rating"}],
+        }
+
+    def snapshots(self, count):
+        """Yield `count` consecutive feeds, starting with the current state."""
+        for i in range(count):
+            if i:
+                self.step()
+            yield self.feed()
+
+
+def generate_feed(clients, cycle=0, seed=0, churn=0.005):
+    """Return one feed with `clients` connections as of `cycle` (deterministic per seed)."""
+    network = Network(clients, seed=seed, churn=churn)
+    for _ in range(cycle):
+        network.step()
+    return network.feed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--clients", type=int, help="Connections per snapshot")
+    size.add_argument("--scale", type=float, default=1.0, help=f"Multiple of a busy evening ({NETWORK_BASELINE} clients)")
+    parser.add_argument("--cycles", type=int, default=20, help="Number of consecutive snapshots")
+    parser.add_argument("--churn", type=float, default=0.005, help="Share of connections replaced per snapshot")
+    parser.add_argument("--a4-rate", type=float, default=0.02, help="Share of names that break CoC A4")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="feeds", help="Directory for NNNN.json snapshots")
+    parser.add_argument("--indent", type=int, default=None, help="Pretty-print JSON (the live feed is indented)")
+    args = parser.parse_args()
+
+    clients = args.clients or int(NETWORK_BASELINE * args.scale)
+    network = Network(clients, seed=args.seed, churn=args.churn, a4_rate=args.a4_rate)
+    os.makedirs(args.out, exist_ok=True)
+    for i, feed in enumerate(network.snapshots(args.cycles)):
+        path = os.path.join(args.out, f"{i:04d}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(feed, f, indent=args.indent)
+    print(f"Wrote {args.cycles} snapshots of ~{clients} clients to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,7 +30,14 @@ extensions = [
     "extensions.newcid_monitor_loop",
     "extensions.type_monitor",
     "extensions.type_monitor_loop",
-    "extensions.p56_monitor_loop"
+    "extensions.p56_monitor_loop",
+    "extensions.area_monitor",
+    "extensions.area_monitor_loop",
+    "extensions.archive_recorder",
+    "extensions.session_history",
+    "extensions.channel_routes",
+    "extensions.metrics_server",
+    "extensions.loop_lag"
 ]
 async def main():
     if not DISCORD_TOKEN:
@@ -33,3 +33,43 @@ facility = {
 
 # P56 Monitor API endpoint (local service on Pi)
 P56_API_URL = os.getenv("P56_API_URL", "http://127.0.0.1:8000/api/v1/p56/")
+# Where P56 events come from: `api` (the service above) or `local` (geofence the datafeed in-process)
+P56_SOURCE = os.getenv("P56_SOURCE", "api").lower()
+P56_ZONES_FILE = os.getenv("P56_ZONES_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "zones", "p56.json"))
+# Named areas (zones/*.json) that !within and !areamon can refer to
+ZONES_DIR = os.getenv("ZONES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "zones"))
+
+# Upstream endpoints. Point these at scripts/replay_server.py to run every loop offline.
+VATSIM_DATA_URL = os.getenv("VATSIM_DATA_URL", "https://data.vatsim.net/v3/vatsim-data.json")
+VATSIM_TRANSCEIVERS_URL = os.getenv("VATSIM_TRANSCEIVERS_URL", "https://data.vatsim.net/v3/transceivers-data.json")
+VATSIM_API_URL = os.getenv("VATSIM_API_URL", "https://api.vatsim.net")
+VATUSA_API_URL = os.getenv("VATUSA_API_URL", "https://api.vatusa.net")
+FAA_BASE_URL = os.getenv("FAA_BASE_URL", "https://www.fly.faa.gov")
+MAPBOX_API_URL = os.getenv("MAPBOX_API_URL", "https://api.mapbox.com")
+OPENCAGE_API_URL = os.getenv("OPENCAGE_API_URL", "https://api.opencagedata.com")
+
+# Local Prometheus /metrics endpoint (set METRICS_PORT=0 to disable)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+# FAA page parsing: BeautifulSoup backend (auto picks lxml when installed) and worker pool (thread or process)
+FAA_HTML_PARSER = os.getenv("FAA_HTML_PARSER", "auto")
+FAA_PARSE_POOL = os.getenv("FAA_PARSE_POOL", "thread")
+
+# Log the stack of anything that blocks the event loop for longer than this many seconds
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", "0.25"))
+
+# Feed loops run FEED_CYCLE_OFFSET seconds after each datafeed update (the feed refreshes every FEED_INTERVAL)
+FEED_INTERVAL = float(os.getenv("FEED_INTERVAL", "15"))
+FEED_CYCLE_OFFSET = float(os.getenv("FEED_CYCLE_OFFSET", "3"))
+# Longest backoff after repeated 429s from the datafeed, in seconds
+FEED_BACKOFF_MAX = float(os.getenv("FEED_BACKOFF_MAX", "300"))
+
+# JSON decoder for the datafeed: auto (fastest installed), orjson, msgspec or json
+JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+# Decode the datafeed straight into client records when msgspec is installed
+FEED_TYPED_DECODE = os.getenv("FEED_TYPED_DECODE", "1") != "0"
+
+# Compressed datafeed archive in data/archive/ (see utils/snapshot_archive.py); off by default, it costs disk
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "0") != "0"
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "7"))
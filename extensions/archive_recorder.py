@@ -0,0 +1,106 @@
+# extensions/archive_recorder.py
+
+import asyncio
+import re
+import time
+from discord.ext import commands, tasks
+from config import ADMIN_ID, ARCHIVE_ENABLED, ARCHIVE_RETENTION_DAYS
+from utils import fetch_vatsim_snapshot
+from utils.feed_scheduler import feed_cycle
+from utils import snapshot_archive
+from utils.snapshot_archive import ArchiveWriter, snapshot_time
+
+MAX_QUERY_DAYS = 31
+
+
+def _callsign_usage(pattern, start):
+    """Return {callsign: {cids}} for pilots whose callsign matches `pattern` (`*` wildcards) since `start`."""
+    regex = re.compile("^" + re.escape(pattern.upper()).replace(r"\*", ".*") + "$")
+    usage = {}
+    for _, section, cid, callsign in snapshot_archive.logons(start=start):
+        if section == "pilots" and regex.match(callsign.upper()):
+            usage.setdefault(callsign, set()).add(cid)
+    return usage
+
+
+class ArchiveRecorder(commands.Cog):
+    """Records every datafeed cycle to the compressed archive (ARCHIVE_ENABLED=1)."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.writer = ArchiveWriter()
+        self.last_stamp = None
+        self.last_prune = 0.0
+        if ARCHIVE_ENABLED:
+            self.archive_loop.start()
+
+    async def cog_unload(self):
+        self.archive_loop.cancel()
+        self.writer.close()
+
+    @tasks.loop()
+    @feed_cycle("archive")
+    async def archive_loop(self):
+        snapshot = await fetch_vatsim_snapshot()
+        if snapshot is None or snapshot.update_timestamp == self.last_stamp:
+            return
+        self.last_stamp = snapshot.update_timestamp
+        loop = asyncio.get_running_loop()
+        # Diffing, JSON and compression run in a worker thread; the writer is only used from this loop
+        await loop.run_in_executor(None, self.writer.append, snapshot, snapshot_time(snapshot))
+        if time.time() - self.last_prune > 3600:
+            self.last_prune = time.time()
+            removed = await loop.run_in_executor(None, snapshot_archive.prune, ARCHIVE_RETENTION_DAYS)
+            if removed:
+                print(f"[Archive] Removed {removed} segments older than {ARCHIVE_RETENTION_DAYS} days")
+
+    @archive_loop.before_loop
+    async def before_loop(self):
+        await self.bot.wait_until_ready()
+
+    @commands.group(name="archive", invoke_without_command=True, case_insensitive=True)
+    async def archive(self, ctx):
+        """Datafeed archive: `!archive status`, `!archive callsigns <PATTERN> [days]` (admin only)"""
+        await ctx.send("Usage: `!archive status`, `!archive callsigns <PATTERN> [days]`")
+
+    @archive.command(name="status")
+    async def status(self, ctx):
+        if ctx.author.id != ADMIN_ID:
+            await ctx.send("Unauthorized.")
+            return
+        count, total, first, last = await asyncio.get_running_loop().run_in_executor(None, snapshot_archive.stats)
+        state = "recording" if self.archive_loop.is_running() else "not recording (set ARCHIVE_ENABLED=1)"
+        if not count:
+            await ctx.send(f"Archive is empty; {state}.")
+            return
+        await ctx.send(
+            f"Archive: {count} segments, {total / 1_048_576:.1f} MiB, "
+            f"{first:%Y-%m-%d %H}Z to {last:%Y-%m-%d %H}Z; {state}. "
+            f"This session: {self.writer.frames} frames, {self.writer.bytes_written / 1024:.0f} KiB. "
+            f"Retention {ARCHIVE_RETENTION_DAYS} days."
+        )
+
+    @archive.command(name="callsigns")
+    async def callsigns(self, ctx, pattern: str, days: int = 7):
+        if ctx.author.id != ADMIN_ID:
+            await ctx.send("Unauthorized.")
+            return
+        days = max(1, min(days, MAX_QUERY_DAYS))
+        await ctx.send(f"Scanning the last {days} days of the archive for `{pattern.upper()}`...")
+        usage = await asyncio.get_running_loop().run_in_executor(
+            None, _callsign_usage, pattern, time.time() - days * 86400
+        )
+        if not usage:
+            await ctx.send(f"No pilots used `{pattern.upper()}` in the last {days} days.")
+            return
+        pilots = set().union(*usage.values())
+        lines = [f"{callsign}: {len(cids)} pilot(s)" for callsign, cids in sorted(usage.items())]
+        out = "\n".join(lines)
+        if len(out) > 1800:
+            out = out[:1800] + "\n..."
+        await ctx.send(
+            f"`{pattern.upper()}` in the last {days} days: {len(pilots)} pilots, {len(usage)} callsigns\n```\n{out}\n```"
+        )
+
+async def setup(bot):
+    await bot.add_cog(ArchiveRecorder(bot))
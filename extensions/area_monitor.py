@@ -0,0 +1,152 @@
+# extensions/area_monitor.py
+
+import discord
+from discord.ext import commands
+from utils import (
+    fetch_vatsim_snapshot,
+    load_area_monitor,
+    add_area_monitor,
+    remove_area_monitor,
+)
+from utils.datafeed_embed import build_area_list_embed
+from utils.geo import parse_point, resolve_point
+from utils.geofence import load_zone_dir
+from utils.spatial_index import pilots_in_area
+from config import ZONES_DIR
+
+DEFAULT_RADIUS_NM = 30
+MAX_RADIUS_NM = 500
+
+
+def split_radius(text, default=DEFAULT_RADIUS_NM):
+    """Split `<place> [radius]` into (place, radius_nm); the radius is the last word when numeric."""
+    parts = text.strip().rsplit(maxsplit=1)
+    if len(parts) == 2:
+        try:
+            return parts[0], float(parts[1])
+        except ValueError:
+            pass
+    return text.strip(), default
+
+
+def area_description(entry):
+    if "circle" in entry:
+        lat, lon = entry["circle"]["center"]
+        return f"{entry['circle']['radius_nm']:g} NM around {lat:.4f}, {lon:.4f}"
+    return f"Polygon of {len(entry.get('polygon', []))} points"
+
+
+class AreaMonitor(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name="near")
+    async def near(self, ctx, *, query: str):
+        """Pilots within a radius of a point: `!near <ICAO|place|lat,lon> [radius NM]`"""
+        place, radius = split_radius(query)
+        if not 0 < radius <= MAX_RADIUS_NM:
+            await ctx.send(f"Radius must be between 0 and {MAX_RADIUS_NM} NM.")
+            return
+        point = await resolve_point(place)
+        if point is None:
+            await ctx.send(f"Couldn't find `{place}`. Try `lat,lon`.")
+            return
+        snapshot = await fetch_vatsim_snapshot()
+        if snapshot is None:
+            await ctx.send("Could not fetch VATSIM data.")
+            return
+        matches = snapshot.pilot_index().near(point[0], point[1], radius)
+        await ctx.send(embed=build_area_list_embed(f"{len(matches)} pilots within {radius:g} NM of {place.upper()}", matches))
+
+    @commands.command(name="within")
+    async def within(self, ctx, *, area: str):
+        """Pilots inside a watched area or a zone from zones/: `!within <name>`"""
+        name = area.strip().upper()
+        entry = load_area_monitor().get(name)
+        snapshot = await fetch_vatsim_snapshot()
+        if snapshot is None:
+            await ctx.send("Could not fetch VATSIM data.")
+            return
+        index = snapshot.pilot_index()
+        if entry is not None:
+            matches = pilots_in_area(index, entry)
+        else:
+            zone = load_zone_dir(ZONES_DIR).get(name)
+            if zone is None:
+                await ctx.send(f"No area or zone named `{name}`. See `!areamon list`.")
+                return
+            matches = [(None, pilot) for pilot in index.within(zone)]
+        await ctx.send(embed=build_area_list_embed(f"{len(matches)} pilots inside {name}", matches))
+
+    @commands.group(
+        name="areamon",
+        invoke_without_command=True,
+        case_insensitive=True
+    )
+    async def areamon(self, ctx):
+        """Manage area watches (alerts when pilots enter a radius or polygon)"""
+        await ctx.send(
+            "Usage: `!areamon add <NAME> <ICAO|place|lat,lon> [radius NM]`, "
+            "`!areamon poly <NAME> <lat,lon> <lat,lon> <lat,lon> ...`, "
+            "`!areamon zone <ZONE>`, `!areamon remove <NAME>`, `!areamon list`"
+        )
+
+    @areamon.command(name="add")
+    async def add(self, ctx, name: str, *, query: str):
+        place, radius = split_radius(query)
+        if not 0 < radius <= MAX_RADIUS_NM:
+            await ctx.send(f"Radius must be between 0 and {MAX_RADIUS_NM} NM.")
+            return
+        point = await resolve_point(place)
+        if point is None:
+            await ctx.send(f"Couldn't find `{place}`. Try `lat,lon`.")
+            return
+        name = name.upper()
+        add_area_monitor(name, {"circle": {"center": list(point), "radius_nm": radius}})
+        await ctx.send(f"Watching `{name}`: {radius:g} NM around {point[0]:.4f}, {point[1]:.4f}.")
+
+    @areamon.command(name="poly")
+    async def poly(self, ctx, name: str, *points: str):
+        polygon = [parse_point(p) for p in points]
+        if len(polygon) < 3 or None in polygon:
+            await ctx.send("Give at least three `lat,lon` points, separated by spaces.")
+            return
+        name = name.upper()
+        add_area_monitor(name, {"polygon": [list(p) for p in polygon]})
+        await ctx.send(f"Watching `{name}`: polygon of {len(polygon)} points.")
+
+    @areamon.command(name="zone")
+    async def zone(self, ctx, *, zone_name: str):
+        zone_name = zone_name.strip().upper()
+        zone = load_zone_dir(ZONES_DIR).get(zone_name)
+        if zone is None:
+            available = ", ".join(sorted(load_zone_dir(ZONES_DIR))) or "none"
+            await ctx.send(f"No zone named `{zone_name}`. Available: {available}")
+            return
+        add_area_monitor(zone_name, {
+            "polygon": [list(p) for p in zone.polygon],
+            "floor_ft": zone.floor_ft,
+            "ceiling_ft": zone.ceiling_ft,
+        })
+        await ctx.send(f"Watching zone `{zone_name}`.")
+
+    @areamon.command(name="remove")
+    async def remove(self, ctx, name: str):
+        if remove_area_monitor(name.upper()):
+            await ctx.send(f"Stopped watching `{name.upper()}`.")
+        else:
+            await ctx.send(f"`{name.upper()}` is not being watched.")
+
+    @areamon.command(name="list")
+    async def list(self, ctx):
+        areas = load_area_monitor()
+        if not areas:
+            await ctx.send("No areas are currently being watched.")
+            return
+        embed = discord.Embed(title="Watched Areas", color=discord.Color.teal())
+        for name, entry in list(areas.items())[:25]:
+            embed.add_field(name=name, value=area_description(entry), inline=False)
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(AreaMonitor(bot))
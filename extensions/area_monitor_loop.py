@@ -0,0 +1,67 @@
+# extensions/area_monitor_loop.py
+
+import discord
+from discord.ext import commands, tasks
+from utils import load_area_monitor, fetch_vatsim_snapshot
+from utils.routing import send_routed
+from utils.metrics import LOOP_MATCH_SECONDS
+from utils.feed_scheduler import feed_cycle
+from utils.datafeed_embed import build_area_list_embed
+from utils.spatial_index import pilots_in_area
+
+class AreaMonitorLoop(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.inside = {}  # area name -> set of CIDs inside it last cycle
+        self.area_monitor_loop.start()
+
+    async def cog_unload(self):
+        self.area_monitor_loop.cancel()
+
+    @tasks.loop()
+    @feed_cycle("area")
+    async def area_monitor_loop(self):
+        areas = load_area_monitor()
+        if not areas:
+            self.inside.clear()
+            return
+        try:
+            snapshot = await fetch_vatsim_snapshot()
+            if snapshot is None:
+                return
+        except Exception as e:
+            print(f"Error fetching VATSIM data: {e}")
+            return
+
+        entered = {}
+        with LOOP_MATCH_SECONDS.time(loop="area"):
+            index = snapshot.pilot_index()
+            for name, entry in areas.items():
+                try:
+                    matches = pilots_in_area(index, entry)
+                except (KeyError, TypeError, ValueError) as e:
+                    print(f"[Area Monitor] Skipping malformed area {name}: {e}")
+                    continue
+                cids = {pilot.cid for _, pilot in matches}
+                previous = self.inside.get(name)
+                self.inside[name] = cids
+                # The first cycle for an area only seeds it, so a restart doesn't re-alert everyone inside
+                if previous is not None:
+                    new = [(distance, pilot) for distance, pilot in matches if pilot.cid not in previous]
+                    if new:
+                        entered[name] = new
+
+        for name in [name for name in self.inside if name not in areas]:
+            del self.inside[name]
+
+        for name, matches in entered.items():
+            title = (f"{matches[0][1].callsign} entered {name}" if len(matches) == 1
+                     else f"{len(matches)} pilots entered {name}")
+            await send_routed(self.bot, "area", embed=build_area_list_embed(title, matches, discord.Color.orange()))
+
+    @area_monitor_loop.before_loop
+    async def before_loop(self):
+        await self.bot.wait_until_ready()
+
+async def setup(bot):
+    await bot.add_cog(AreaMonitorLoop(bot))
@@ -0,0 +1,95 @@
+# extensions/channel_routes.py
+
+import re
+import discord
+from discord.ext import commands
+from typing import Optional
+from config import ADMIN_ID
+from utils.data_manager import add_channel_route, remove_channel_route
+from utils.routing import MONITORS, get_route_channel_ids, get_routes, reload_routes
+
+
+def _parse_channel_id(ctx, channel: Optional[str]):
+    """Accept a #mention or a raw id (works for channels in other guilds); default to ctx.channel."""
+    if not channel:
+        return ctx.channel.id
+    m = re.fullmatch(r"<#(\d+)>|(\d+)", channel.strip())
+    if not m:
+        return None
+    return int(m.group(1) or m.group(2))
+
+
+class ChannelRoutes(commands.Cog):
+    """Route each monitor's alerts to one or more channels (across guilds)."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.group(
+        name="route",
+        invoke_without_command=True,
+        case_insensitive=True
+    )
+    async def route(self, ctx):
+        """Manage monitor -> channel routing"""
+        await ctx.send(
+            "Usage: `!route add <monitor> [#channel|id]`, `!route remove <monitor> [#channel|id]`, `!route list`\n"
+            f"Monitors: {', '.join(MONITORS)}"
+        )
+
+    @route.command(name="add")
+    async def add(self, ctx, monitor: str, channel: Optional[str] = None):
+        if ctx.author.id != ADMIN_ID:
+            await ctx.send("Unauthorized.")
+            return
+        monitor = monitor.lower()
+        if monitor not in MONITORS:
+            await ctx.send(f"Unknown monitor `{monitor}`. Choose from: {', '.join(MONITORS)}")
+            return
+        channel_id = _parse_channel_id(ctx, channel)
+        if channel_id is None:
+            await ctx.send(f"Invalid channel: `{channel}`")
+            return
+        if self.bot.get_channel(channel_id) is None:
+            await ctx.send(f"I can't see channel `{channel_id}`.")
+            return
+        if add_channel_route(monitor, channel_id):
+            reload_routes()
+            await ctx.send(f"`{monitor}` alerts will now also go to <#{channel_id}>.")
+        else:
+            await ctx.send(f"`{monitor}` is already routed to <#{channel_id}>.")
+
+    @route.command(name="remove")
+    async def remove(self, ctx, monitor: str, channel: Optional[str] = None):
+        if ctx.author.id != ADMIN_ID:
+            await ctx.send("Unauthorized.")
+            return
+        monitor = monitor.lower()
+        channel_id = _parse_channel_id(ctx, channel)
+        if channel_id is None:
+            await ctx.send(f"Invalid channel: `{channel}`")
+            return
+        if remove_channel_route(monitor, channel_id):
+            reload_routes()
+            await ctx.send(f"Removed <#{channel_id}> from `{monitor}` routing.")
+        else:
+            await ctx.send(f"`{monitor}` is not routed to <#{channel_id}>.")
+
+    @route.command(name="list")
+    async def list(self, ctx):
+        routes = get_routes()
+        embed = discord.Embed(title="Monitor Channel Routes", color=discord.Color.blue())
+        for monitor in MONITORS:
+            channel_ids = get_route_channel_ids(monitor)
+            if not channel_ids:
+                value = "Not routed"
+            else:
+                value = "\n".join(f"<#{c}>" for c in channel_ids)
+                if monitor not in routes:
+                    value += "\n(default CHANNEL_ID)"
+            embed.add_field(name=monitor, value=value, inline=True)
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(ChannelRoutes(bot))
@@ -4,6 +4,7 @@ import discord
 from discord.ext import commands
 import aiohttp
 from utils import add_cid_to_monitor, remove_cid_from_monitor, get_cid_to_monitor
+from config import VATUSA_API_URL
 
 
 class Cidmon(commands.Cog):
@@ -41,7 +42,7 @@ class Cidmon(commands.Cog):
             if not name:
                 try:
                     async with aiohttp.ClientSession() as session:
-                        async with session.get(f"https://api.vatusa.net/v2/user/{cid}") as resp:
+                        async with session.get(f"{VATUSA_API_URL}/v2/user/{cid}") as resp:
                             if resp.status == 200:
                                 data = await resp.json()
                                 fname = data["data"].get("fname")
@@ -5,7 +5,7 @@ from discord.ext import commands
 from discord.utils import utcnow
 from typing import Optional
 import re
-from utils import fetch_vatsim_data, load_a1_monitor, save_a1_monitor, load_a9_monitor, save_a9_monitor
+from utils import fetch_vatsim_sections, load_a1_monitor, save_a1_monitor, load_a9_monitor, save_a9_monitor
 from utils.data_manager import load_fake_names, add_fake_name, remove_fake_name
 
 
@@ -59,7 +59,7 @@ class CocMonitor(commands.Cog):
         await ctx.send("Checking for CoC A4 name violations...")
         
         try:
-            data = await fetch_vatsim_data()
+            data = await fetch_vatsim_sections("pilots", "controllers")
             violations = await self.check_a4_violations(data)
             
             if violations:
@@ -217,12 +217,18 @@ class CocMonitor(commands.Cog):
             await ctx.send(f"P56 intrusion alerts are currently **{status}**.")
             return
         
+        # The monitor loop keeps the mute state in memory; update it along with the file
+        p56_loop = self.bot.get_cog("P56Monitor")
         action = action.lower()
         if action in ["mute", "off", "disable"]:
             save_p56_muted(True)
+            if p56_loop:
+                p56_loop.muted = True
             await ctx.send("P56 intrusion alerts are now **muted**. Use `!p56mon unmute` to re-enable.")
         elif action in ["unmute", "on", "enable"]:
             save_p56_muted(False)
+            if p56_loop:
+                p56_loop.muted = False
             await ctx.send("P56 intrusion alerts are now **unmuted**.")
         else:
             await ctx.send("Invalid option. Use `!p56mon mute`, `!p56mon unmute`, or `!p56mon status`.")
@@ -240,16 +246,21 @@ class CocMonitor(commands.Cog):
         
         await ctx.send("Fetching P56 intrusion logs...")
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(P56_API_URL, timeout=10) as resp:
-                    if resp.status != 200:
-                        await ctx.send(f"API returned error: {resp.status}")
-                        return
-                    data = await resp.json()
-        except Exception as e:
-            await ctx.send(f"Failed to fetch P56 data: {e}")
-            return
+        p56_loop = self.bot.get_cog("P56Monitor")
+        if p56_loop and p56_loop.geofence is not None:
+            # P56_SOURCE=local: the monitor geofences the datafeed itself
+            data = p56_loop.geofence.payload()
+        else:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(P56_API_URL, timeout=10) as resp:
+                        if resp.status != 200:
+                            await ctx.send(f"API returned error: {resp.status}")
+                            return
+                        data = await resp.json()
+            except Exception as e:
+                await ctx.send(f"Failed to fetch P56 data: {e}")
+                return
         
         events = data.get("history", {}).get("events", [])
         current_inside = data.get("history", {}).get("current_inside", {})
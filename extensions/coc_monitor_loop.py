@@ -4,9 +4,13 @@ import discord
 from discord.ext import commands, tasks
 from discord.utils import utcnow
 import re
-from utils import fetch_vatsim_data, build_status_embed, load_a1_monitor, load_a9_monitor
+from utils import fetch_vatsim_snapshot, build_status_embed, load_a1_monitor, load_a9_monitor
 from utils.data_manager import load_fake_names
-from config import CHANNEL_ID, atc_rating, pilot_rating
+from utils.routing import send_routed, get_route_channel_ids
+from utils.concurrency import gather_bounded
+from utils.metrics import LOOP_MATCH_SECONDS
+from utils.feed_scheduler import feed_cycle
+from config import atc_rating, pilot_rating
 from collections import defaultdict
 
 
@@ -30,27 +34,29 @@ class CocMonitorLoop(commands.Cog):
     async def cog_unload(self):
         self.coc_monitor_loop.cancel()
     
-    @tasks.loop(seconds=15)
+    @tasks.loop()
+    @feed_cycle("coc")
     async def coc_monitor_loop(self):
-        """Monitor for CoC A4 violations and keyword matches every 15 seconds"""
+        """Monitor for CoC A4 violations and keyword matches every feed cycle"""
         if not self.enabled:
             return
         
         try:
-            data = await fetch_vatsim_data()
-            if not isinstance(data, dict):
+            snapshot = await fetch_vatsim_snapshot()
+            if snapshot is None:
                 return
             
             # Check A4 violations
-            violations = await self.check_a4_violations(data)
+            with LOOP_MATCH_SECONDS.time(loop="a4"):
+                violations = await self.check_a4_violations(snapshot)
             if violations:
                 await self.send_violation_alerts(violations)
             
             # Check A1 keyword matches
-            await self.check_keyword_matches(data, load_a1_monitor(), self.a1_status_cache, "A1")
+            await self.check_keyword_matches(snapshot, load_a1_monitor(), self.a1_status_cache, "A1")
             
             # Check A9 keyword matches
-            await self.check_keyword_matches(data, load_a9_monitor(), self.a9_status_cache, "A9")
+            await self.check_keyword_matches(snapshot, load_a9_monitor(), self.a9_status_cache, "A9")
         
         except Exception as e:
             print(f"Error in CoC monitor loop: {e}")
@@ -59,7 +65,7 @@ class CocMonitorLoop(commands.Cog):
     async def before_loop(self):
         await self.bot.wait_until_ready()
     
-    async def check_a4_violations(self, data):
+    async def check_a4_violations(self, snapshot):
         """
         Check for VATSIM CoC A4(b) name convention violations
         
@@ -74,13 +80,13 @@ class CocMonitorLoop(commands.Cog):
         fake_names = load_fake_names()
         
         # Check all pilots
-        for pilot in data.get("pilots", []):
+        for pilot in snapshot.pilots:
             result = self._check_user_name(pilot, "Pilot", fake_names)
             if result:
                 violations.append(result)
         
         # Check all controllers
-        for controller in data.get("controllers", []):
+        for controller in snapshot.controllers:
             result = self._check_user_name(controller, "Controller", fake_names)
             if result:
                 violations.append(result)
@@ -173,8 +179,7 @@ class CocMonitorLoop(commands.Cog):
         if self.a4_muted:
             return
         
-        channel = self.bot.get_channel(CHANNEL_ID)
-        if not channel:
+        if not get_route_channel_ids("coc"):
             return
         
         for v in violations:
@@ -217,29 +222,20 @@ class CocMonitorLoop(commands.Cog):
                 
                 embed.set_footer(text="This is a suspected violation and may be a false positive. Manual review recommended.")
                 
-                await channel.send(embed=embed)
+                await send_routed(self.bot, "coc", embed=embed)
         
         # Clean up alerted_users set - remove users no longer online
         current_user_keys = {f"{v['cid']}:{v['callsign']}" for v in violations}
         self.alerted_users = self.alerted_users.intersection(current_user_keys)
 
-    async def check_keyword_matches(self, data, keywords, status_cache, monitor_name):
+    async def check_keyword_matches(self, snapshot, keywords, status_cache, monitor_name):
         """Check for keyword matches in ATIS, remarks, and routes"""
         if not keywords:
             return
         
-        pilots = data.get("pilots", [])
-        controllers = data.get("controllers", [])
-        
         current_matches = defaultdict(list)
         
-        # Add _source to clients
-        for client in pilots:
-            client["_source"] = "pilot"
-        for client in controllers:
-            client["_source"] = "controller"
-        
-        all_clients = pilots + controllers
+        all_clients = snapshot.clients()
         
         for client in all_clients:
             source = client.get("_source", "unknown")
@@ -273,10 +269,10 @@ class CocMonitorLoop(commands.Cog):
                 if re.search(pattern, searchable_text):
                     current_matches[keyword].append(client)
         
-        channel = self.bot.get_channel(CHANNEL_ID)
-        if not channel:
+        if not get_route_channel_ids("coc"):
             return
         
+        alerts = []
         for keyword, matched_clients in current_matches.items():
             new_fingerprints = []
             
@@ -301,20 +297,15 @@ class CocMonitorLoop(commands.Cog):
                 
                 old_fps = status_cache.get(keyword, [])
                 if fingerprint not in old_fps:
-                    embed, file = await build_status_embed(
-                        client_data=client_data,
-                        display_name=f"{monitor_name} Match: {keyword}",
-                        rating=rating,
-                        is_atc=is_atc,
-                        fingerprint=fingerprint
-                    )
-                    if file:
-                        await channel.send(embed=embed, file=file)
-                    else:
-                        await channel.send(embed=embed)
+                    alerts.append(self._send_keyword_alert(
+                        client_data, f"{monitor_name} Match: {keyword}", rating, is_atc, fingerprint
+                    ))
             
             status_cache[keyword] = new_fingerprints
         
+        # Render and post all new matches for this cycle concurrently
+        await gather_bounded(alerts, label=f"{monitor_name} keyword alerts")
+        
         # Check for disconnections
         for keyword in list(status_cache.keys()):
             if keyword not in current_matches and status_cache[keyword]:
@@ -323,9 +314,21 @@ class CocMonitorLoop(commands.Cog):
                     description=f"No clients currently match keyword: {keyword}",
                     color=discord.Color.red()
                 )
-                await channel.send(embed=embed)
+                await send_routed(self.bot, "coc", embed=embed)
                 status_cache[keyword] = []
 
 
+    async def _send_keyword_alert(self, client_data, display_name, rating, is_atc, fingerprint):
+        """Render and post one keyword match alert"""
+        embed, file = await build_status_embed(
+            client_data=client_data,
+            display_name=display_name,
+            rating=rating,
+            is_atc=is_atc,
+            fingerprint=fingerprint
+        )
+        await send_routed(self.bot, "coc", embed=embed, file=file)
+
+
 async def setup(bot):
     await bot.add_cog(CocMonitorLoop(bot))
@@ -10,8 +10,9 @@ import json
 from typing import Optional
 import discord
 from discord.ext import commands, tasks
-from config import ADMIN_ID, CHANNEL_ID
+from config import ADMIN_ID
 from utils.data_manager import load_all, save_all
+from utils.routing import send_routed, get_route_channel_ids
 import aiohttp
 from utils.data_manager import load_json
 from utils import load_banned_words, load_triggers, get_cid_to_monitor
@@ -45,8 +46,7 @@ class Core(commands.Cog):
 
         # Forward non-command DMs only
         if isinstance(message.channel, discord.DMChannel) and not message.content.startswith("!"):
-            channel = self.bot.get_channel(CHANNEL_ID)
-            if channel:
+            if get_route_channel_ids("dm"):
                 embed = discord.Embed(
                     description=f"From: {message.author.mention}\n\n{message.content}",
                     timestamp=utcnow(),
@@ -54,11 +54,8 @@ class Core(commands.Cog):
                 )
                 embed.set_author(name=str(message.author), icon_url=message.author.display_avatar.url)
 
-                if message.attachments:
-                    files = [await attachment.to_file() for attachment in message.attachments]
-                    await channel.send(embed=embed, files=files)
-                else:
-                    await channel.send(embed=embed)
+                files = [await attachment.to_file() for attachment in message.attachments]
+                await send_routed(self.bot, "dm", embed=embed, files=files)
 
     @commands.command(name="dm")
     async def dm_command(self, ctx, user_or_name: Optional[str] = None, *, content: Optional[str] = None):
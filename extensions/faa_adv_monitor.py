@@ -2,24 +2,29 @@ import os
 import json
 import hashlib
 import asyncio
-from urllib.parse import urljoin
+from collections import OrderedDict
 from datetime import datetime
 
 import aiohttp
-from bs4 import BeautifulSoup
 from typing import Optional
 import discord
 from discord.ext import commands, tasks
 
-from config import CHANNEL_ID
 from utils.data_manager import load_faa_muted, save_faa_muted
+from utils.routing import send_routed, get_route_channel_ids
+from utils.faa_parse import run_parser, parse_advisory_page, html_to_text
+from utils.concurrency import gather_bounded
+from config import FAA_BASE_URL
 
 
 ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(ROOT_DIR, "data")
 SEEN_FILE = os.path.join(DATA_DIR, "seen_faa.json")
-BASE_URL = "https://www.fly.faa.gov"
-LIST_URL = "https://www.fly.faa.gov/adv/adv_spt"
+BASE_URL = FAA_BASE_URL
+LIST_URL = f"{FAA_BASE_URL}/adv/adv_spt"
+# Advisory pages downloaded at once per poll, and parsed pages kept by content hash
+DETAIL_CONCURRENCY = 4
+DETAIL_CACHE_SIZE = 64
 
 
 def _load_seen():
@@ -52,6 +57,7 @@ class FAAAdvMonitor(commands.Cog):
         except Exception:
             self.muted = True
         self.session = aiohttp.ClientSession()
+        self.detail_cache = OrderedDict()  # sha256 of page body -> (sections, text)
         self.faa_loop.start()
 
     async def cog_unload(self):
@@ -77,18 +83,17 @@ class FAAAdvMonitor(commands.Cog):
             print(f"FAA monitor: error fetching list page: {e}")
             return
 
-        soup = BeautifulSoup(text, "html.parser")
-
-        # Try to find anchors first
-        anchors = [a for a in soup.find_all("a", href=True) if "/adv/" in a["href"]]
+        # Parse in the worker pool so the event loop keeps running meanwhile
+        try:
+            anchors, body_text = await run_parser(parse_advisory_page, text, BASE_URL)
+        except Exception as e:
+            print(f"FAA monitor: error parsing list page: {e}")
+            return
 
         if anchors:
             # Process anchors as before
             new_items = []
-            for a in anchors:
-                href = a["href"].strip()
-                title = (a.get_text() or "").strip()
-                full_url = urljoin(BASE_URL, href)
+            for full_url, title in anchors:
                 digest = hashlib.sha256(f"{full_url}|{title}".encode("utf-8")).hexdigest()
                 if digest in self.seen:
                     continue
@@ -100,28 +105,32 @@ class FAAAdvMonitor(commands.Cog):
 
             _save_seen(self.seen)
 
-            channel = self.bot.get_channel(CHANNEL_ID)
-            if not channel:
+            if not get_route_channel_ids("faa"):
                 print("FAA monitor: target channel not found")
                 return
 
-            for item in new_items:
+            # Download every new advisory's text together rather than one after another
+            details = await gather_bounded(
+                [self._fetch_detail(item["url"]) for item in new_items],
+                limit=DETAIL_CONCURRENCY,
+                label="FAA advisory details",
+            )
+
+            for item, detail in zip(new_items, details):
                 embed = discord.Embed(
                     title="FAA: New advisory / special publication",
                     description=item["title"],
                     color=discord.Color.blue(),
                     timestamp=datetime.utcnow()
                 )
+                if isinstance(detail, tuple):
+                    self._add_summary_fields(embed, *detail)
                 embed.add_field(name="Link", value=item["url"], inline=False)
                 embed.set_footer(text="Source: fly.faa.gov")
 
-                try:
-                    await channel.send(embed=embed)
-                except Exception as e:
-                    print(f"FAA monitor: failed to send embed: {e}")
+                await send_routed(self.bot, "faa", embed=embed)
         else:
             # Fallback to raw text parsing
-            body_text = soup.get_text(separator="\n")
             sections = self._parse_faa_text(body_text)
             full_digest = hashlib.sha256(body_text.encode("utf-8")).hexdigest()
             if full_digest in self.seen:
@@ -129,17 +138,13 @@ class FAAAdvMonitor(commands.Cog):
             self.seen.add(full_digest)
             _save_seen(self.seen)
 
-            channel = self.bot.get_channel(CHANNEL_ID)
-            if not channel:
+            if not get_route_channel_ids("faa"):
                 print("FAA monitor: target channel not found")
                 return
 
             embeds = self._create_embeds_from_sections(sections)
             for embed in embeds:
-                try:
-                    await channel.send(embed=embed)
-                except Exception as e:
-                    print(f"FAA monitor: failed to send embed: {e}")
+                await send_routed(self.bot, "faa", embed=embed)
 
     @commands.command(name="faaadv")
     async def faaadv(self, ctx, mode: Optional[str] = None, limit: int = 5):
@@ -182,8 +187,12 @@ class FAAAdvMonitor(commands.Cog):
             await ctx.send(f"FAA monitor: error fetching list page: {e}")
             return
 
-        soup = BeautifulSoup(text, "html.parser")
-        body_text = soup.get_text(separator="\n")
+        try:
+            body_text = await run_parser(html_to_text, text)
+        except Exception as e:
+            print(f"FAA monitor: error parsing list page: {e}")
+            await ctx.send(f"FAA monitor: error parsing list page: {e}")
+            return
         sections = self._parse_faa_text(body_text)
         full_digest = hashlib.sha256(body_text.encode("utf-8")).hexdigest()
 
@@ -218,6 +227,44 @@ class FAAAdvMonitor(commands.Cog):
     
     
 
+    async def _fetch_detail(self, url):
+        """Return (sections, text) for one advisory page (None if it fails to parse), parsing each distinct page body once."""
+        async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"unexpected status {resp.status} for {url}")
+            html = await resp.text()
+
+        digest = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        cached = self.detail_cache.get(digest)
+        if cached is not None:
+            self.detail_cache.move_to_end(digest)
+            return cached
+
+        try:
+            text = await run_parser(html_to_text, html)
+        except Exception as e:
+            # Posted without a summary
+            print(f"FAA monitor: error parsing {url}: {e}")
+            return None
+        detail = (self._parse_faa_text(text), text)
+        self.detail_cache[digest] = detail
+        if len(self.detail_cache) > DETAIL_CACHE_SIZE:
+            self.detail_cache.popitem(last=False)
+        return detail
+
+    def _add_summary_fields(self, embed, sections, text, max_fields=6):
+        """Add a short summary of an advisory's text to its embed."""
+        if sections:
+            for header, content in sections[:max_fields]:
+                value = content[:300] + ("..." if len(content) > 300 else "")
+                embed.add_field(name=header.rstrip(":")[:256], value=value, inline=False)
+            return
+        # Not an operations plan: show the start of the advisory text instead
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        summary = "\n".join(lines)[:1000]
+        if summary:
+            embed.add_field(name="Summary", value=summary, inline=False)
+
     def _parse_faa_text(self, text):
         # Known section headers
         headers = [
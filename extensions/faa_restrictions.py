@@ -1,9 +1,12 @@
+import time
 import aiohttp
 import textwrap
-import re
-from bs4 import BeautifulSoup
 import discord
 from discord.ext import commands, tasks
+from config import FAA_BASE_URL
+from utils.faa_parse import run_parser, parse_restrictions, parse_restriction_rows, format_restriction
+from utils.restrictions_table import RestrictionsTable, body_digest
+from utils.data_manager import load_faa_restrictions_state, save_faa_restrictions_state
 
 
 class FAARestrictions(commands.Cog):
@@ -11,17 +14,42 @@ class FAARestrictions(commands.Cog):
 
     Commands:
       - `!faares [REQUESTING] [PROVIDING]` : one-shot fetch
-      - `!faaresmon [REQUESTING] [PROVIDING]` : start monitor (or `!faaresmon STOP` to stop)
+      - `!faaresmon [REQUESTING] [PROVIDING]` : add a monitor in this channel (`!faaresmon LIST`, `!faaresmon STOP`)
+
+    Every monitor is served from one ALL/ALL fetch per minute; each channel
+    gets the part of the diff for its facility pair. Monitors and the last
+    table are saved to `data/faa_restrictions.json` and resumed on startup.
     """
 
     def __init__(self, bot):
         self.bot = bot
         self.session = aiohttp.ClientSession()
 
-        # monitor state
-        self._faa_monitor_filters = ("ALL", "ALL")
-        self._faa_monitor_seen = set()
-        self._faa_monitor_channel = None
+        # monitor state: (channel_id, requesting, providing) per monitor, one shared ALL/ALL table
+        self._faa_monitors = set()
+        self._faa_monitor_table = RestrictionsTable()
+        self._resume_monitors()
+
+    def _resume_monitors(self):
+        """Restart saved monitors, diffing the first poll against the saved table instead of re-baselining."""
+        try:
+            monitors, rows, digest = load_faa_restrictions_state()
+        except Exception as e:
+            print(f"FAA monitor: could not load saved state: {e}")
+            return
+        if not monitors:
+            return
+        self._faa_monitors = monitors
+        self._faa_monitor_table = RestrictionsTable(rows, digest, fresh=False)
+        self._faa_monitor_loop.start()
+        print(f"FAA monitor: resumed {len(monitors)} restrictions monitor(s)")
+
+    def _save_monitors(self):
+        table = self._faa_monitor_table
+        try:
+            save_faa_restrictions_state(self._faa_monitors, table.rows.values(), table.digest)
+        except Exception as e:
+            print(f"FAA monitor: could not save state: {e}")
 
     async def cog_unload(self):
         try:
@@ -34,100 +62,24 @@ class FAARestrictions(commands.Cog):
         except Exception:
             pass
 
-    async def _get_parsed_rows(self, req: str, prov: str):
-        """Fetch FAA restrictions page and return list of (key, daytime, compact)."""
-        query_url = f"https://www.fly.faa.gov/restrictions/restrictions?reqFac={req}&provFac={prov}"
+    async def _fetch_page(self, req: str, prov: str):
+        """Fetch the FAA restrictions page for a facility pair and return its HTML."""
+        query_url = f"{FAA_BASE_URL}/restrictions/restrictions?reqFac={req}&provFac={prov}"
 
         async with self.session.get(query_url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
             if resp.status != 200:
                 raise RuntimeError(f"unexpected status {resp.status}")
-            text = await resp.text()
-
-        soup = BeautifulSoup(text, "html.parser")
-
-        # Find the table that contains the restriction headers
-        target_table = None
-        for table in soup.find_all("table"):
-            headers = [th.get_text(strip=True).upper() for th in table.find_all("th")]
-            if set(["REQUESTING", "PROVIDING", "RESTRICTION", "START TIME", "STOP TIME"]).issubset(set(headers)):
-                target_table = table
-                break
-
-        rows = []
-        if target_table:
-            for tr in target_table.find_all("tr"):
-                tds = tr.find_all("td")
-                if len(tds) >= 5:
-                    r = [td.get_text(" ", strip=True) for td in tds[:5]]
-                    rows.append(r)
-        else:
-            # Fallback: look for tr with 5 tds anywhere
-            for tr in soup.find_all("tr"):
-                tds = tr.find_all("td")
-                if len(tds) >= 5:
-                    r = [td.get_text(" ", strip=True) for td in tds[:5]]
-                    rows.append(r)
-
-        parsed_rows = []
-        for r_row in rows:
-            try:
-                r_req, r_prov, r_restr, r_start, r_stop = r_row[:5]
-            except Exception:
-                continue
-            if req != "ALL" and r_req.upper() != req:
-                continue
-            if prov != "ALL" and r_prov.upper() != prov:
-                continue
-
-            # parse start/stop time to extract day and HHMM
-            start_hm = ""
-            stop_hm = ""
-            daynum = ""
-            try:
-                from datetime import datetime as _dt
-
-                sdt = _dt.strptime(r_start, "%m/%d/%Y %H%M")
-                edt = _dt.strptime(r_stop, "%m/%d/%Y %H%M")
-                start_hm = sdt.strftime("%H%M")
-                stop_hm = edt.strftime("%H%M")
-                daynum = str(sdt.day)
-            except Exception:
-                parts = r_start.split()
-                if len(parts) >= 2:
-                    daynum = parts[0].split("/")[-1]
-                    start_hm = parts[1]
-                else:
-                    daynum = "?"
-                    start_hm = r_start
-
-            daytime = f"{daynum}/{start_hm}"
-
-            compact = r_restr or ""
-            has_time = bool(re.search(r"\b\d{3,4}-\d{3,4}\b", compact))
+            return await resp.text()
 
-            prov_tokens = re.split(r"[,/\s]+", (r_prov or ""))
-            has_provider = False
-            for tok in prov_tokens:
-                if not tok:
-                    continue
-                pattern_word = rf"\b{re.escape(tok)}\b"
-                pattern_colon = rf"{re.escape(tok)}:"
-                if re.search(pattern_word, compact) or re.search(pattern_colon, compact):
-                    has_provider = True
-                    break
-
-            parts = [compact]
-            if start_hm and stop_hm and not has_time:
-                parts.append(f"{start_hm}-{stop_hm}")
-            if r_prov and not has_provider:
-                parts.append(r_prov)
-
-            compact = " ".join(p for p in parts if p).strip()
-
-            key = f"{r_req}|{r_prov}|{r_restr}|{r_start}|{r_stop}"
-            parsed_rows.append((key, daytime, compact))
-
-        return parsed_rows
+    async def _get_parsed_rows(self, req: str, prov: str):
+        """Fetch FAA restrictions page and return list of (key, daytime, compact)."""
+        table = self._faa_monitor_table
+        if self._faa_monitors and time.monotonic() - table.updated_at < 60:
+            # The monitor fetched the whole table within the last minute; answer from it
+            return [format_restriction(row) for row in table.select(req, prov)]
+        text = await self._fetch_page(req, prov)
+        # Parsing the full table takes long enough on a Pi to stall the bot, so it runs in the worker pool
+        return await run_parser(parse_restrictions, text, req, prov)
 
     @commands.command(name="faares")
     async def faares(self, ctx, *args):
@@ -186,22 +138,43 @@ class FAARestrictions(commands.Cog):
 
     @tasks.loop(seconds=60)
     async def _faa_monitor_loop(self):
-        req, prov = self._faa_monitor_filters
+        if not self._faa_monitors:
+            return
         try:
-            parsed = await self._get_parsed_rows(req, prov)
+            text = await self._fetch_page("ALL", "ALL")
         except Exception as e:
             print(f"FAA monitor fetch error: {e}")
             return
 
-        channel = self.bot.get_channel(self._faa_monitor_channel) if self._faa_monitor_channel else None
+        # Same page as last minute: nothing to parse or report
+        digest = body_digest(text)
+        if self._faa_monitor_table.unchanged(digest):
+            return
+        try:
+            rows = await run_parser(parse_restriction_rows, text)
+        except Exception as e:
+            print(f"FAA monitor parse error: {e}")
+            return
+        diff = self._faa_monitor_table.apply(rows, digest)
+        self._save_monitors()
+        if not (diff.added or diff.removed or diff.modified):
+            return
+
+        for channel_id, req, prov in sorted(self._faa_monitors):
+            channel = self.bot.get_channel(channel_id)
+            if channel:
+                await self._post_diff(channel, diff.filter(req, prov))
 
+    async def _post_diff(self, channel, diff):
+        # `diff` highlighting: green for new, red for cancelled; an amendment is the old row then the new one
         new_lines = []
-        for key, daytime, compact in parsed:
-            if key in self._faa_monitor_seen:
-                continue
-            self._faa_monitor_seen.add(key)
-            left = f"{daytime:<{max(len(daytime),7)}}"
-            new_lines.append(f"{left}{' ' * 4}{compact}")
+        for row in diff.added:
+            new_lines.append(self._monitor_line("+", row))
+        for old, row in diff.modified:
+            new_lines.append(self._monitor_line("-", old))
+            new_lines.append(self._monitor_line("+", row, "AMENDED"))
+        for row in diff.removed:
+            new_lines.append(self._monitor_line("-", row, "CANCELLED"))
 
         if not new_lines:
             return
@@ -221,32 +194,63 @@ class FAARestrictions(commands.Cog):
             if chunk:
                 yield "\n".join(chunk)
 
-        if channel:
-            for part in _chunks_from_lines(new_lines, limit=1900):
-                try:
-                    await channel.send(f"```{part}```")
-                except Exception as e:
-                    print(f"FAA monitor send error: {e}")
+        for part in _chunks_from_lines(new_lines, limit=1900):
+            try:
+                await channel.send(f"```diff\n{part}```")
+            except Exception as e:
+                print(f"FAA monitor send error: {e}")
+
+    @_faa_monitor_loop.before_loop
+    async def _before_monitor_loop(self):
+        await self.bot.wait_until_ready()
+
+    @staticmethod
+    def _monitor_line(marker, row, note=None):
+        _key, daytime, compact = format_restriction(row)
+        left = f"{daytime:<{max(len(daytime),7)}}"
+        line = f"{marker} {left}{' ' * 4}{compact}"
+        return f"{line} ({note})" if note else line
 
     @commands.command(name="faaresmon")
     async def faaresmon(self, ctx, *args):
-        """Start/stop a per-minute FAA restrictions monitor.
+        """Add/remove per-minute FAA restrictions monitors for this channel.
 
         Usage:
-          `!faaresmon` -> start monitor ALL/ALL
-          `!faaresmon ZDC PCT` -> start monitor requesting ZDC, providing PCT
-          `!faaresmon STOP` -> stop monitor
+          `!faaresmon` -> monitor ALL/ALL in this channel
+          `!faaresmon ZDC PCT` -> monitor requesting ZDC, providing PCT in this channel
+          `!faaresmon LIST` -> show every running monitor
+          `!faaresmon STOP` -> stop this channel's monitors (`!faaresmon STOP ZDC PCT` for one pair)
         """
+        action = args[0].upper() if args else ""
+
+        if action == "LIST":
+            if not self._faa_monitors:
+                await ctx.send("No FAA restrictions monitors are running.")
+                return
+            lines = [f"<#{channel_id}>: Requesting={req} Providing={prov}"
+                     for channel_id, req, prov in sorted(self._faa_monitors)]
+            await ctx.send("FAA restrictions monitors:\n" + "\n".join(lines))
+            return
+
         # stop case
-        if len(args) == 1 and args[0].upper() in ("STOP", "OFF", "END", "CANCEL"):
-            if getattr(self, "_faa_monitor_loop", None) and self._faa_monitor_loop.is_running():
+        if action in ("STOP", "OFF", "END", "CANCEL"):
+            pair = None
+            if len(args) >= 2:
+                pair = (args[1].upper(), args[2].upper() if len(args) >= 3 else "ALL")
+            stopping = {
+                m for m in self._faa_monitors
+                if m[0] == ctx.channel.id and (pair is None or m[1:] == pair)
+            }
+            if not stopping:
+                await ctx.send("No FAA restrictions monitor is running in this channel.")
+                return
+            self._faa_monitors -= stopping
+            if not self._faa_monitors and self._faa_monitor_loop.is_running():
                 self._faa_monitor_loop.cancel()
-                self._faa_monitor_seen.clear()
-                self._faa_monitor_filters = ("ALL", "ALL")
-                self._faa_monitor_channel = None
-                await ctx.send("FAA restrictions monitor stopped.")
-            else:
-                await ctx.send("No FAA restrictions monitor is running.")
+                self._faa_monitor_table = RestrictionsTable()
+            self._save_monitors()
+            pairs = ", ".join(f"{req}/{prov}" for _c, req, prov in sorted(stopping))
+            await ctx.send(f"FAA restrictions monitor stopped ({pairs}).")
             return
 
         req = "ALL"
@@ -257,20 +261,24 @@ class FAARestrictions(commands.Cog):
             req = args[0].upper()
             prov = args[1].upper()
 
-        if getattr(self, "_faa_monitor_loop", None) and self._faa_monitor_loop.is_running():
-            await ctx.send("A FAA restrictions monitor is already running. Stop it first with `!faaresmon STOP`.")
+        monitor = (ctx.channel.id, req, prov)
+        if monitor in self._faa_monitors:
+            await ctx.send(f"This channel already monitors Requesting={req} Providing={prov}.")
             return
 
-        try:
-            parsed = await self._get_parsed_rows(req, prov)
-        except Exception as e:
-            await ctx.send(f"Failed to start monitor: {e}")
-            return
-
-        self._faa_monitor_seen = {key for key, _, _ in parsed}
-        self._faa_monitor_filters = (req, prov)
-        self._faa_monitor_channel = ctx.channel.id
-        self._faa_monitor_loop.start()
+        if not self._faa_monitor_loop.is_running():
+            try:
+                text = await self._fetch_page("ALL", "ALL")
+                rows = await run_parser(parse_restriction_rows, text)
+            except Exception as e:
+                await ctx.send(f"Failed to start monitor: {e}")
+                return
+            # Baseline: only changes after this point are posted
+            self._faa_monitor_table = RestrictionsTable(rows, body_digest(text))
+            self._faa_monitor_loop.start()
+
+        self._faa_monitors.add(monitor)
+        self._save_monitors()
         await ctx.send(f"FAA restrictions monitor started for Requesting={req} Providing={prov}. Checking every minute.")
 
 
@@ -0,0 +1,54 @@
+# extensions/loop_lag.py
+
+from discord.ext import commands
+from config import ADMIN_ID, LOOP_LAG_THRESHOLD
+from utils.loop_lag import LoopLagWatchdog, LOG_PATH
+from utils.metrics import LOOP_LAG_SECONDS
+
+
+class LoopLag(commands.Cog):
+    """Watch for blocking calls that stall the event loop and report the worst offenders."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.watchdog = LoopLagWatchdog(threshold=LOOP_LAG_THRESHOLD)
+
+    async def cog_load(self):
+        self.watchdog.start()
+
+    async def cog_unload(self):
+        self.watchdog.stop()
+
+    @commands.command(name="lag")
+    async def lag(self, ctx, count: int = 10):
+        """Show event-loop lag and the calls that blocked it (admin only)."""
+        if ctx.author.id != ADMIN_ID:
+            await ctx.send("Unauthorized.")
+            return
+
+        stats = LOOP_LAG_SECONDS.stats()
+        lines = [
+            f"Lag: last {stats['last'] * 1000:.0f}ms, avg {stats['avg'] * 1000:.1f}ms, "
+            f"max {self.watchdog.max_lag * 1000:.0f}ms (threshold {self.watchdog.threshold * 1000:.0f}ms)",
+            "",
+        ]
+        offenders = self.watchdog.offenders()[:max(1, min(count, 25))]
+        if not offenders:
+            lines.append("No stalls recorded.")
+        else:
+            lines.append(f"{'TOTAL':>7} {'WORST':>6} {'N':>4}  WHERE")
+            for cog, command, location, n, total, worst in offenders:
+                who = cog + (f" !{command}" if command else "")
+                lines.append(f"{total:6.2f}s {worst:5.2f}s {n:4d}  {who} @ {location}")
+            last = self.watchdog.recent(1)[0]
+            lines.append("")
+            lines.append(f"Last stall {last['at']} ({last['seconds']:.2f}s), full stacks in {LOG_PATH}")
+
+        out = "\n".join(lines)
+        if len(out) > 1900:
+            out = out[:1900] + "\n..."
+        await ctx.send(f"```\n{out}\n```")
+
+
+async def setup(bot):
+    await bot.add_cog(LoopLag(bot))
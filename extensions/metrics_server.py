@@ -0,0 +1,44 @@
+# extensions/metrics_server.py
+
+from aiohttp import web
+from discord.ext import commands
+from config import METRICS_HOST, METRICS_PORT
+from utils.metrics import render
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer(commands.Cog):
+    """Serve the bot's loop/feed/Discord metrics on a local Prometheus `/metrics` endpoint."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.runner = None
+
+    async def cog_load(self):
+        if not METRICS_PORT:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self.metrics)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        try:
+            await web.TCPSite(self.runner, METRICS_HOST, METRICS_PORT).start()
+            print(f"[Metrics] Serving http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+        except OSError as e:
+            # A busy port should not stop the bot from starting
+            print(f"[Metrics] Could not bind {METRICS_HOST}:{METRICS_PORT}: {e}")
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def cog_unload(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def metrics(self, request):
+        return web.Response(body=render().encode(), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
+
+async def setup(bot):
+    await bot.add_cog(MetricsServer(bot))
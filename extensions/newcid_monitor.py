@@ -4,8 +4,9 @@
 import discord
 from discord.ext import commands
 from discord.utils import utcnow
-from datetime import timezone
 from typing import Optional
+from utils.time_utils import format_utc_relative
+from config import VATSIM_API_URL
 
 
 class NewCidMonitor(commands.Cog):
@@ -45,9 +46,8 @@ class NewCidMonitor(commands.Cog):
 
                 # Fetch registration date and last rating change
                 import aiohttp
-                from dateutil import parser as dateparser
                 
-                url = f"https://api.vatsim.net/api/ratings/{highest_cid}/"
+                url = f"{VATSIM_API_URL}/api/ratings/{highest_cid}/"
                 async with aiohttp.ClientSession() as session:
                     async with session.get(url) as resp:
                         if resp.status == 200:
@@ -56,38 +56,10 @@ class NewCidMonitor(commands.Cog):
                             last_change = data.get("lastratingchange", "N/A")
                             
                             # Format registration date with Discord timestamp
-                            if reg_date != "N/A":
-                                try:
-                                    reg_dt = dateparser.parse(reg_date)
-                                    # Ensure UTC timezone
-                                    if reg_dt.tzinfo is None:
-                                        reg_dt = reg_dt.replace(tzinfo=timezone.utc)
-                                    else:
-                                        reg_dt = reg_dt.astimezone(timezone.utc)
-                                    reg_str = reg_dt.strftime("%Y-%m-%dT%H:%MZ")
-                                    reg_timestamp = int(reg_dt.timestamp())
-                                    reg_formatted = f"{reg_str}\n<t:{reg_timestamp}:R>"
-                                except:
-                                    reg_formatted = reg_date
-                            else:
-                                reg_formatted = "N/A"
+                            reg_formatted = format_utc_relative(reg_date, fmt="%Y-%m-%dT%H:%MZ")
                             
                             # Format last rating change with Discord timestamp
-                            if last_change != "N/A":
-                                try:
-                                    change_dt = dateparser.parse(last_change)
-                                    # Ensure UTC timezone
-                                    if change_dt.tzinfo is None:
-                                        change_dt = change_dt.replace(tzinfo=timezone.utc)
-                                    else:
-                                        change_dt = change_dt.astimezone(timezone.utc)
-                                    change_str = change_dt.strftime("%Y-%m-%dT%H:%MZ")
-                                    change_timestamp = int(change_dt.timestamp())
-                                    change_formatted = f"{change_str}\n<t:{change_timestamp}:R>"
-                                except:
-                                    change_formatted = last_change
-                            else:
-                                change_formatted = "N/A"
+                            change_formatted = format_utc_relative(last_change, fmt="%Y-%m-%dT%H:%MZ")
                             
                             embed.add_field(
                                 name="Registration Date",
@@ -3,9 +3,11 @@
 import discord
 from discord.ext import commands, tasks
 from discord.utils import utcnow
-from datetime import timezone
-from utils import fetch_vatsim_data, build_status_embed
-from config import CHANNEL_ID, atc_rating, pilot_rating
+from utils import fetch_vatsim_snapshot, fetch_online_cids, build_status_embed
+from utils.time_utils import format_utc_relative
+from utils.routing import send_routed, get_route_channel_ids
+from utils.feed_scheduler import feed_cycle
+from config import atc_rating, pilot_rating, VATSIM_API_URL
 import json
 import os
 
@@ -43,37 +45,31 @@ class NewCidMonitorLoop(commands.Cog):
         except Exception as e:
             print(f"Error saving highest CID: {e}")
     
-    @tasks.loop(seconds=15)
+    @tasks.loop()
+    @feed_cycle("newcid")
     async def newcid_monitor_loop(self):
-        """Monitor for new highest CIDs every 15 seconds"""
+        """Monitor for new highest CIDs every feed cycle"""
         try:
-            data = await fetch_vatsim_data()
-            if not isinstance(data, dict):
-                return
-            pilots = data.get("pilots", [])
-            controllers = data.get("controllers", [])
-            atis = data.get("atis", [])
-
-            # Add source type to all clients
-            for client in pilots:
-                client["_source"] = "pilot"
-            for client in controllers:
-                client["_source"] = "controller"
-            for client in atis:
-                client["_source"] = "atis"
-
-            all_clients = pilots + controllers + atis
+            # Only CIDs are needed to spot a new highest, so skip decoding the feed
+            cids = await fetch_online_cids()
 
             # Find the highest CID currently online
-            if not all_clients:
+            if not cids:
                 return
 
-            current_highest = max(int(client.get("cid", 0)) for client in all_clients)
+            current_highest = max(cids)
             
             # Check if we found a new highest CID
             if current_highest > self.highest_cid:
+                snapshot = await fetch_vatsim_snapshot()
+                if snapshot is None:
+                    return
+
                 # Find the client(s) with this CID
+                all_clients = snapshot.pilots + snapshot.controllers + snapshot.atis
                 new_cid_clients = [c for c in all_clients if int(c.get("cid", 0)) == current_highest]
+                if not new_cid_clients:
+                    return
                 
                 # Update our records
                 old_highest = self.highest_cid
@@ -94,8 +90,7 @@ class NewCidMonitorLoop(commands.Cog):
     
     async def send_new_cid_alerts(self, clients, old_highest):
         """Send alerts for new highest CID detected"""
-        channel = self.bot.get_channel(CHANNEL_ID)
-        if not channel:
+        if not get_route_channel_ids("newcid"):
             return
         
         for client_data in clients:
@@ -168,9 +163,8 @@ class NewCidMonitorLoop(commands.Cog):
 
             # Fetch registration date and last rating change from VATSIM API
             import aiohttp
-            from dateutil import parser as dateparser
             
-            url = f"https://api.vatsim.net/api/ratings/{cid}/"
+            url = f"{VATSIM_API_URL}/api/ratings/{cid}/"
             async with aiohttp.ClientSession() as session:
                 async with session.get(url) as resp:
                     if resp.status == 200:
@@ -179,38 +173,10 @@ class NewCidMonitorLoop(commands.Cog):
                         last_change = data.get("lastratingchange", "N/A")
                         
                         # Format registration date with Discord timestamp
-                        if reg_date != "N/A":
-                            try:
-                                reg_dt = dateparser.parse(reg_date)
-                                # Ensure UTC timezone
-                                if reg_dt.tzinfo is None:
-                                    reg_dt = reg_dt.replace(tzinfo=timezone.utc)
-                                else:
-                                    reg_dt = reg_dt.astimezone(timezone.utc)
-                                reg_str = reg_dt.strftime("%Y-%m-%dT%H:%MZ")
-                                reg_timestamp = int(reg_dt.timestamp())
-                                reg_formatted = f"{reg_str}\n<t:{reg_timestamp}:R>"
-                            except:
-                                reg_formatted = reg_date
-                        else:
-                            reg_formatted = "N/A"
+                        reg_formatted = format_utc_relative(reg_date, fmt="%Y-%m-%dT%H:%MZ")
                         
                         # Format last rating change with Discord timestamp
-                        if last_change != "N/A":
-                            try:
-                                change_dt = dateparser.parse(last_change)
-                                # Ensure UTC timezone
-                                if change_dt.tzinfo is None:
-                                    change_dt = change_dt.replace(tzinfo=timezone.utc)
-                                else:
-                                    change_dt = change_dt.astimezone(timezone.utc)
-                                change_str = change_dt.strftime("%Y-%m-%dT%H:%MZ")
-                                change_timestamp = int(change_dt.timestamp())
-                                change_formatted = f"{change_str}\n<t:{change_timestamp}:R>"
-                            except:
-                                change_formatted = last_change
-                        else:
-                            change_formatted = "N/A"
+                        change_formatted = format_utc_relative(last_change, fmt="%Y-%m-%dT%H:%MZ")
                         
                         embed.add_field(
                             name="Registration Date",
@@ -237,10 +203,7 @@ class NewCidMonitorLoop(commands.Cog):
             embed.set_footer(text=f"New highest CID on the network")
 
             # Send the message
-            if file:
-                await channel.send(embed=embed, file=file)
-            else:
-                await channel.send(embed=embed)
+            await send_routed(self.bot, "newcid", embed=embed, file=file)
 
 
 async def setup(bot):
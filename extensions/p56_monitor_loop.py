@@ -4,62 +4,117 @@ import discord
 from discord.ext import commands, tasks
 import aiohttp
 from datetime import datetime, timezone
-from utils.data_manager import load_p56_muted, load_p56_seen_events, save_p56_seen_events
-from config import CHANNEL_ID, P56_API_URL
+from utils.data_manager import load_p56_muted, load_p56_seen_events, save_p56_seen_events, load_p56_cursor
+from utils.routing import send_routed, get_route_channel_ids
+from utils.metrics import instrument_loop
+from utils.geofence import GeofenceEngine, load_zones
+from utils import fetch_vatsim_snapshot
+from config import P56_API_URL, P56_SOURCE, P56_ZONES_FILE
+
+# Events recorded up to this many seconds before the cursor are still fetched, in case they arrive late
+CURSOR_SLACK = 120
+
+
+def _event_time(event_id):
+    """Return the recorded_at suffix of a seen-event id (`identifier_recordedat`)."""
+    try:
+        return float(event_id.rsplit("_", 1)[1])
+    except (IndexError, ValueError):
+        return None
 
 
 class P56Monitor(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.seen_events = load_p56_seen_events()
+        # Cached here and updated by `!p56mon`, so the loop doesn't read the file every poll
+        self.muted = load_p56_muted()
+        self.cursor = load_p56_cursor()
+        if self.cursor is None:
+            times = [t for t in map(_event_time, self.seen_events) if t is not None]
+            self.cursor = max(times) if times else None
+        self.geofence = None
+        if P56_SOURCE == "local":
+            try:
+                self.geofence = GeofenceEngine(load_zones(P56_ZONES_FILE))
+                # Geofence every feed update rather than every other one
+                self.p56_monitor_loop.change_interval(seconds=15)
+                print(f"[P56 Monitor] Local geofence with {len(self.geofence.zones)} zone(s) from {P56_ZONES_FILE}")
+            except Exception as e:
+                print(f"[P56 Monitor] Failed to load zones, falling back to the API: {e}")
         self.p56_monitor_loop.start()
 
     async def cog_unload(self):
         self.p56_monitor_loop.cancel()
 
     @tasks.loop(seconds=30)
+    # Overruns are measured against the interval in use (15s with the local geofence)
+    @instrument_loop("p56", lambda self: self.p56_monitor_loop.seconds)
     async def p56_monitor_loop(self):
         """Poll P56 API and send alerts for new intrusions"""
-        if load_p56_muted():
-            return
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(P56_API_URL, timeout=10) as resp:
-                    if resp.status != 200:
-                        print(f"[P56 Monitor] API returned {resp.status}")
-                        return
-                    data = await resp.json()
-        except Exception as e:
-            print(f"[P56 Monitor] Failed to fetch API: {e}")
-            return
+        # Only ask for events after the cursor; the slack catches events recorded slightly out of order
+        since = self.cursor - CURSOR_SLACK if self.cursor else None
+        if self.geofence is not None:
+            # The local geofence tracks every cycle, muted or not, so `!p56` and its history stay current
+            data = await self.fetch_local(since)
+            if data is None or self.muted:
+                return
+        else:
+            if self.muted:
+                return
+            params = {"since": int(since)} if since else None
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(P56_API_URL, params=params, timeout=10) as resp:
+                        if resp.status != 200:
+                            print(f"[P56 Monitor] API returned {resp.status}")
+                            return
+                        data = await resp.json()
+            except Exception as e:
+                print(f"[P56 Monitor] Failed to fetch API: {e}")
+                return
 
-        channel = self.bot.get_channel(CHANNEL_ID)
-        if not channel:
+        if not get_route_channel_ids("p56"):
             return
 
         # Check for events (completed/exited intrusions)
         events = data.get("history", {}).get("events", [])
         new_events = []
+        cursor = self.cursor or 0
         for event in events:
             recorded = event.get("recorded_at")
             if not recorded:
                 continue
+            # The API may ignore `since` and return the full history; filter it here then
+            if since and recorded < since:
+                continue
             event_id = f"{event.get('identifier', 'unknown')}_{recorded}"
             if event_id not in self.seen_events:
                 new_events.append(event)
                 self.seen_events.add(event_id)
+            cursor = max(cursor, recorded)
 
         # Send alerts for new events (most recent first, limit to avoid spam)
         for event in reversed(new_events[-5:]):
             embed = self.build_p56_embed(event, from_events=True)
-            try:
-                await channel.send(embed=embed)
-            except Exception as e:
-                print(f"[P56 Monitor] Failed to send alert: {e}")
-
-        if new_events:
-            save_p56_seen_events(self.seen_events)
+            await send_routed(self.bot, "p56", embed=embed)
+
+        if new_events or cursor != (self.cursor or 0):
+            self.cursor = cursor
+            # Ids older than the slack window can never be returned again, so stop tracking them
+            self.seen_events = {
+                event_id for event_id in self.seen_events
+                if (_event_time(event_id) or cursor) >= cursor - CURSOR_SLACK
+            }
+            save_p56_seen_events(self.seen_events, self.cursor)
+
+    async def fetch_local(self, since=None):
+        """Run the datafeed through the local geofence; returns the P56 API's response shape."""
+        snapshot = await fetch_vatsim_snapshot()
+        if snapshot is None:
+            return None
+        self.geofence.update(snapshot.pilots)
+        return self.geofence.payload(since)
 
     def build_p56_embed(self, event, from_events=False):
         """Build embed for a P56 intrusion event"""
@@ -0,0 +1,116 @@
+# extensions/session_history.py
+
+import asyncio
+import time
+from datetime import datetime, timezone
+import discord
+from discord.ext import commands, tasks
+from utils import fetch_vatsim_snapshot
+from utils.feed_scheduler import feed_cycle
+from utils.session_index import SessionIndex
+from utils.snapshot_archive import snapshot_time
+
+MAX_SESSIONS = 25
+
+
+def _format_epoch(ts):
+    dt = datetime.fromtimestamp(ts, timezone.utc)
+    return f"{dt:%Y-%m-%d %H:%MZ} (<t:{int(ts)}:R>)"
+
+
+def _format_duration(seconds):
+    minutes = int(seconds // 60)
+    return f"{minutes // 60}h{minutes % 60:02d}m"
+
+
+def _session_line(row, now):
+    cid, callsign, kind, server, logon, logoff = row
+    end = logoff if logoff is not None else now
+    state = "online now" if logoff is None else f"until {datetime.fromtimestamp(logoff, timezone.utc):%H:%MZ}"
+    return (
+        f"**{callsign}** ({kind}, CID {cid}) {_format_epoch(logon)}, "
+        f"{_format_duration(end - logon)}, {state} · {server or 'N/A'}"
+    )
+
+
+class SessionHistory(commands.Cog):
+    """Keeps a session log from datafeed logon/logoff transitions and answers history queries from it."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.index = SessionIndex()
+        self.last_stamp = None
+        self.session_loop.start()
+
+    async def cog_unload(self):
+        self.session_loop.cancel()
+        self.index.close()
+
+    @tasks.loop()
+    @feed_cycle("sessions")
+    async def session_loop(self):
+        snapshot = await fetch_vatsim_snapshot()
+        if snapshot is None or snapshot.update_timestamp == self.last_stamp:
+            return
+        self.last_stamp = snapshot.update_timestamp
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.index.update, snapshot, snapshot_time(snapshot)
+        )
+
+    @session_loop.before_loop
+    async def before_loop(self):
+        await self.bot.wait_until_ready()
+
+    async def _lookup(self, query, limit):
+        """Sessions for a CID (all digits) or a callsign (`*` wildcards allowed), newest first."""
+        loop = asyncio.get_running_loop()
+        if query.isdigit():
+            return await loop.run_in_executor(None, self.index.by_cid, int(query), limit)
+        return await loop.run_in_executor(None, self.index.by_callsign, query, limit)
+
+    async def recent_activity(self, cid, days=30):
+        """Return ({type: hours} over the last `days` days, latest session row or None) for `!stats`."""
+        def query():
+            now = time.time()
+            last = self.index.by_cid(cid, 1)
+            return self.index.hours(cid, now - days * 86400, now), last[0] if last else None
+
+        return await asyncio.get_running_loop().run_in_executor(None, query)
+
+    @commands.command(name="lastseen")
+    async def lastseen(self, ctx, query: str):
+        """When a CID or callsign was last connected: `!lastseen <CID|CALLSIGN>`"""
+        rows = await self._lookup(query, 1)
+        if not rows:
+            await ctx.send(f"No sessions recorded for `{query.upper()}`.")
+            return
+        cid, callsign, kind, server, logon, logoff = rows[0]
+        if logoff is None:
+            description = f"Online now as **{callsign}** ({kind}) since {_format_epoch(logon)}"
+        else:
+            description = (
+                f"Last seen {_format_epoch(logoff)} as **{callsign}** ({kind}, CID {cid})\n"
+                f"Session: {_format_epoch(logon)}, {_format_duration(logoff - logon)} on {server or 'N/A'}"
+            )
+        embed = discord.Embed(title=f"Last seen: {query.upper()}", description=description, color=discord.Color.blue())
+        await ctx.send(embed=embed)
+
+    @commands.command(name="sessions")
+    async def sessions(self, ctx, query: str, limit: int = 10):
+        """Recent sessions for a CID or callsign: `!sessions <CID|CALLSIGN> [limit]`"""
+        limit = max(1, min(limit, MAX_SESSIONS))
+        rows = await self._lookup(query, limit)
+        if not rows:
+            await ctx.send(f"No sessions recorded for `{query.upper()}`.")
+            return
+        now = time.time()
+        embed = discord.Embed(
+            title=f"Sessions: {query.upper()}",
+            description="\n".join(_session_line(row, now) for row in rows),
+            color=discord.Color.blue(),
+        )
+        embed.set_footer(text=f"Latest {len(rows)} sessions recorded by the bot")
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(SessionHistory(bot))
@@ -1,6 +1,6 @@
 """Cog to show system resource usage (CPU, memory, disk, network, uptime, top processes).
 
-Command: !sys (alias: !piusage)
+Commands: !sys (alias: !piusage), !profile <seconds> (admin-only sampling profiler)
 
 This cog prefers psutil. If psutil is not installed the command will return a helpful message.
 
@@ -10,12 +10,19 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import io
 import shutil
 import os
 
 import discord
 from discord.ext import commands
 
+from config import ADMIN_ID
+from utils.metrics import summary_lines
+from utils.profiler import SamplingProfiler
+
+PROFILE_MAX_SECONDS = 120
+
 try:
     import psutil
 except Exception:  # pragma: no cover - we want to fail gracefully at runtime
@@ -35,6 +42,7 @@ class SystemStats(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.profiling = False
 
     async def _gather_stats(self) -> dict:
         if psutil is None:
@@ -145,10 +153,54 @@ class SystemStats(commands.Cog):
             name = p.get("name") or "?"
             lines.append(f"{pid:6d} {memperc:6.1f} { _bytes_to_human(rss):>8}  {name}")
 
+        lines.append("")
+        lines.append("Bot metrics:")
+        lines.extend(summary_lines())
+
         out = "\n".join(lines)
         # send in a code block for monospaced alignment
         await ctx.send(f"```\n{out}\n```")
 
+    @commands.command(name="profile")
+    async def profile(self, ctx: commands.Context, seconds: int = 15):
+        """Sample the event loop for N seconds and attach a collapsed-stack profile (admin only).
+
+        The attachment opens in speedscope.app or flamegraph.pl; the message
+        shows which extension loops and commands the time went to.
+        """
+        if ctx.author.id != ADMIN_ID:
+            await ctx.send("Unauthorized.")
+            return
+        if self.profiling:
+            await ctx.send("A profile is already running.")
+            return
+        seconds = max(1, min(seconds, PROFILE_MAX_SECONDS))
+
+        self.profiling = True
+        profiler = SamplingProfiler()
+        try:
+            await ctx.send(f"Profiling the event loop for {seconds}s...")
+            profiler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                await asyncio.to_thread(profiler.stop)
+        finally:
+            self.profiling = False
+
+        if not profiler.samples:
+            await ctx.send("No samples collected.")
+            return
+
+        lines = [f"{profiler.samples} samples over {profiler.elapsed:.1f}s", ""]
+        lines.append(f"{'SHARE':>6}  WHERE")
+        for label, count in profiler.by_extension()[:15]:
+            lines.append(f"{count / profiler.samples * 100:5.1f}%  {label}")
+        out = "\n".join(lines)
+        stamp = datetime.datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        file = discord.File(io.BytesIO(profiler.collapsed().encode()), filename=f"profile-{stamp}.collapsed.txt")
+        await ctx.send(f"```\n{out}\n```", file=file)
+
 
 async def setup(bot: commands.Bot):
     cog = SystemStats(bot)
@@ -2,8 +2,13 @@
 
 import discord
 from discord.ext import commands, tasks
-from utils import load_type_monitor, fetch_vatsim_data, build_status_embed
-from config import pilot_rating, CHANNEL_ID
+from utils import load_type_monitor, fetch_vatsim_snapshot, build_status_embed
+from utils.routing import send_routed, edit_routed
+from utils.concurrency import gather_bounded
+from utils.metrics import LOOP_MATCH_SECONDS
+from utils.feed_scheduler import feed_cycle
+from utils.track_history import tracks
+from config import pilot_rating
 from collections import defaultdict
 import re
 
@@ -11,7 +16,7 @@ class TypeMonitorLoop(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.status_cache = {}  # pattern -> list of fingerprints
-        self.message_cache = {}  # pattern -> discord.Message
+        self.message_cache = {}  # pattern -> list of discord.Message (one per routed channel)
         self.type_monitor_loop.start()
 
     async def cog_unload(self):
@@ -25,85 +30,33 @@ class TypeMonitorLoop(commands.Cog):
         regex_pattern = "^" + re.escape(pattern).replace(r"\*", ".*") + "$"
         return re.match(regex_pattern, aircraft_short.upper()) is not None
 
-    @tasks.loop(seconds=15)
+    @tasks.loop()
+    @feed_cycle("type")
     async def type_monitor_loop(self):
         type_rules = load_type_monitor()
         try:
-            data = await fetch_vatsim_data()
-            if not isinstance(data, dict):
+            snapshot = await fetch_vatsim_snapshot()
+            if snapshot is None:
                 return
-            pilots = data.get("pilots", [])
+            pilots = snapshot.pilots
         except Exception as e:
             print(f"Error fetching VATSIM data: {e}")
             return
 
         current_matches = defaultdict(list)
 
-        for client in pilots:
-            fp = client.get("flight_plan")
-            aircraft_short = fp.get("aircraft_short") if fp else None
-            for pattern in type_rules:
-                if self.match_type(pattern, aircraft_short):
-                    current_matches[pattern].append(client)
+        with LOOP_MATCH_SECONDS.time(loop="type"):
+            for client in pilots:
+                fp = client.flight_plan
+                aircraft_short = fp.aircraft_short if fp else None
+                for pattern in type_rules:
+                    if self.match_type(pattern, aircraft_short):
+                        current_matches[pattern].append(client)
 
-        for pattern, matched_clients in current_matches.items():
-            new_fingerprints = []
-            client_data = matched_clients[0]
-            aircraft_short = client_data.get("flight_plan", {}).get("aircraft_short", "N/A")
-            rating_id = client_data.get("pilot_rating", -1)
-            rating = pilot_rating.get(rating_id, f"Unknown ({rating_id})")
-            server = client_data.get("server", "N/A")
-            start_time = client_data.get("logon_time")
-
-            fingerprint = {
-                "aircraft_short": aircraft_short,
-                "rating": rating,
-                "server": server,
-                "start_time": start_time,
-                "flight_plan": client_data.get("flight_plan"),
-            }
-            new_fingerprints.append(fingerprint)
-
-            old_fps = self.status_cache.get(pattern, [])
-            channel = self.bot.get_channel(CHANNEL_ID)
-            # If new connection (not in cache), send a new message
-            if not old_fps:
-                embed, file = await build_status_embed(
-                    client_data=client_data,
-                    display_name=pattern,
-                    rating=rating,
-                    is_atc=False,
-                    fingerprint=fingerprint
-                )
-                if channel:
-                    try:
-                        if file:
-                            sent = await channel.send(embed=embed, file=file)
-                        else:
-                            sent = await channel.send(embed=embed)
-                        self.message_cache[pattern] = sent
-                    except Exception as e:
-                        print(f"Error sending new message for {pattern}: {e}")
-            # If fingerprint changed but still same connection, edit the message
-            elif fingerprint != old_fps[0]:
-                embed, file = await build_status_embed(
-                    client_data=client_data,
-                    display_name=pattern,
-                    rating=rating,
-                    is_atc=False,
-                    fingerprint=fingerprint
-                )
-                last_msg = self.message_cache.get(pattern)
-                if channel and last_msg:
-                    try:
-                        if file:
-                            await last_msg.edit(embed=embed, attachments=[file])
-                        else:
-                            await last_msg.edit(embed=embed, attachments=[])
-                    except Exception as e:
-                        print(f"Error editing message for {pattern}: {e}")
-
-            self.status_cache[pattern] = new_fingerprints
+        await gather_bounded(
+            [self._update_pattern(pattern, matched) for pattern, matched in current_matches.items()],
+            label="type_monitor_loop",
+        )
 
         # Check for disconnections
         for pattern in list(self.status_cache.keys()):
@@ -113,15 +66,59 @@ class TypeMonitorLoop(commands.Cog):
                     description=f"No pilots currently match {pattern}",
                     color=discord.Color.red()
                 )
-                channel = self.bot.get_channel(CHANNEL_ID)
-                if channel:
-                    try:
-                        await channel.send(embed=embed)
-                    except Exception as e:
-                        print(f"Error sending offline message for {pattern}: {e}")
+                await send_routed(self.bot, "type", embed=embed)
                 self.status_cache[pattern] = []
                 self.message_cache.pop(pattern, None)
 
+    async def _update_pattern(self, pattern, matched_clients):
+        """Post or edit the status message for one aircraft type pattern."""
+        new_fingerprints = []
+        client_data = matched_clients[0]
+        aircraft_short = client_data.flight_plan.get("aircraft_short", "N/A")
+        rating_id = client_data.get("pilot_rating", -1)
+        rating = pilot_rating.get(rating_id, f"Unknown ({rating_id})")
+        server = client_data.get("server", "N/A")
+        start_time = client_data.get("logon_time")
+        tracks.record(client_data)
+
+        fingerprint = {
+            "aircraft_short": aircraft_short,
+            "rating": rating,
+            "server": server,
+            "start_time": start_time,
+            # Shared, immutable FlightPlanRecord (compared by value, not copied)
+            "flight_plan": client_data.flight_plan,
+        }
+        new_fingerprints.append(fingerprint)
+
+        old_fps = self.status_cache.get(pattern, [])
+        # If new connection (not in cache), send a new message
+        if not old_fps:
+            embed, file = await build_status_embed(
+                client_data=client_data,
+                display_name=pattern,
+                rating=rating,
+                is_atc=False,
+                fingerprint=fingerprint
+            )
+            sent = await send_routed(self.bot, "type", embed=embed, file=file)
+            if sent:
+                self.message_cache[pattern] = sent
+        # If fingerprint changed but still same connection, edit the message
+        elif fingerprint != old_fps[0]:
+            embed, file = await build_status_embed(
+                client_data=client_data,
+                display_name=pattern,
+                rating=rating,
+                is_atc=False,
+                fingerprint=fingerprint
+            )
+            last_msgs = self.message_cache.get(pattern)
+            if last_msgs:
+                await edit_routed(last_msgs, embed, file)
+
+        self.status_cache[pattern] = new_fingerprints
+
     @type_monitor_loop.before_loop
     async def before_loop(self):
         await self.bot.wait_until_ready()
@@ -8,16 +8,17 @@ import requests
 import asyncio
 import re
 from dateutil import parser
-from datetime import timezone
 from typing import Optional
 from discord.ext import commands
 from discord.utils import utcnow
 from utils import generate_map_image
-from utils import fetch_vatsim_data, build_status_embed, format_date, format_time
+from utils import fetch_vatsim_sections, build_status_embed, format_date, format_time
+from utils.time_utils import format_utc_relative
 from config import ROLE_ID, atc_rating, pilot_rating, military_rating, facility, VATUSA_API_KEY
+from config import VATSIM_DATA_URL, VATSIM_API_URL, VATUSA_API_URL
 from utils.vatsim_datafeed import fetch_transceivers_data, get_frequencies_for_callsign
 
-vatsim_url = 'https://data.vatsim.net/v3/vatsim-data.json'
+vatsim_url = VATSIM_DATA_URL
 
 
 # def format_date(iso_string):
@@ -46,7 +47,7 @@ async def fetch_user_name(cid, session=None):
         close_session = True
 
     try:
-        url = f"https://api.vatusa.net/v2/user/{cid}"
+        url = f"{VATUSA_API_URL}/v2/user/{cid}"
         timeout = aiohttp.ClientTimeout(total=20)
         async with session.get(url, timeout=timeout) as response:
             if response.status == 200:
@@ -103,7 +104,7 @@ class Vatsim(commands.Cog):
         self.bot = bot
 
     async def fetch_facility_details(self, session, facility_id):
-        url = f"https://api.vatusa.net/v2/facility/{facility_id}"
+        url = f"{VATUSA_API_URL}/v2/facility/{facility_id}"
         async with session.get(url) as response:
             if response.status == 200:
                 return await response.json()
@@ -113,7 +114,7 @@ class Vatsim(commands.Cog):
     @commands.command()
     async def cid(self, ctx, cid: int):
         """Get VATSIM user info by CID"""
-        url = f"https://api.vatsim.net/api/ratings/{cid}/"
+        url = f"{VATSIM_API_URL}/api/ratings/{cid}/"
         response = requests.get(url)
         print(f"API response: {response.status_code}")
 
@@ -145,17 +146,7 @@ class Vatsim(commands.Cog):
         def get_field_value(key, value):
             # Add Discord relative timestamp for reg_date, susp_date, and lastratingchange
             if key in ("reg_date", "susp_date", "lastratingchange") and value:
-                try:
-                    dt = parser.isoparse(value)
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    else:
-                        dt = dt.astimezone(timezone.utc)
-                    zulu_str = dt.strftime("%Y-%m-%d %H:%MZ")
-                    discord_ts = int(dt.timestamp())
-                    return f"{zulu_str}\n<t:{discord_ts}:R>"
-                except Exception:
-                    return str(value)
+                return format_utc_relative(value)
             if key == "rating":
                 return atc_rating.get(int(value), str(value))
             if key == "pilotrating":
@@ -188,7 +179,7 @@ class Vatsim(commands.Cog):
         await ctx.send(embed=embed)
 
         # Now try VATUSA
-        vatusa_url = f"https://api.vatusa.net/user/{cid}?apikey={VATUSA_API_KEY}"
+        vatusa_url = f"{VATUSA_API_URL}/user/{cid}?apikey={VATUSA_API_KEY}"
         vatusa_response = requests.get(vatusa_url)
 
         try:
@@ -205,7 +196,7 @@ class Vatsim(commands.Cog):
     async def usa(self, ctx, cid: int):
         """Get VATUSA user info by CID"""
         # 'cid' is already an int from the command signature
-        url = f"https://api.vatusa.net/user/{cid}?apikey={VATUSA_API_KEY}"
+        url = f"{VATUSA_API_URL}/user/{cid}?apikey={VATUSA_API_KEY}"
 
         response = requests.get(url)
         if response.status_code != 200:
@@ -297,7 +288,7 @@ class Vatsim(commands.Cog):
         """Search VATSIM users by last name"""
         author_id = ctx.author.id
         users_per_page = 25
-        url = f"https://api.vatusa.net/v2/user/filterlname/{lastname}"
+        url = f"{VATUSA_API_URL}/v2/user/filterlname/{lastname}"
 
         if len(lastname) < 4:
             await ctx.send("Please provide at least **4 letters** for partial last name search.")
@@ -378,7 +369,7 @@ class Vatsim(commands.Cog):
         """List online VATSIM supervisors"""
 
         try:
-            data = await fetch_vatsim_data()
+            data = await fetch_vatsim_sections("controllers")
         except Exception as e:
             await ctx.send("Failed to fetch VATSIM data.")
             print(f"Error in sup command: {e}")
@@ -398,7 +389,7 @@ class Vatsim(commands.Cog):
                 # Try to get real name from VATUSA
                 try:
                     async with aiohttp.ClientSession() as session:
-                        async with session.get(f"https://api.vatusa.net/v2/user/{cid}") as resp:
+                        async with session.get(f"{VATUSA_API_URL}/v2/user/{cid}") as resp:
                             if resp.status == 200:
                                 user_data = await resp.json()
                                 fname = user_data["data"].get("fname")
@@ -420,7 +411,7 @@ class Vatsim(commands.Cog):
     @commands.command()
     async def status(self, ctx, cid: int):
         """Check online status of a VATSIM user"""
-        datafeed_url = "https://data.vatsim.net/v3/vatsim-data.json"
+        datafeed_url = VATSIM_DATA_URL
 
         async with aiohttp.ClientSession() as session:
             async with session.get(datafeed_url) as response:
@@ -476,7 +467,7 @@ class Vatsim(commands.Cog):
     @commands.command()
     async def stats(self, ctx, cid: int):
         """Get VATSIM statistics for a user"""
-        url = f"https://api.vatsim.net/v2/members/{cid}/stats"
+        url = f"{VATSIM_API_URL}/v2/members/{cid}/stats"
         response = requests.get(url)
 
         if response.status_code != 200:
@@ -488,7 +479,7 @@ class Vatsim(commands.Cog):
         # Get real name from VATUSA API
         real_name = "N/A"
         try:
-            usa_resp = requests.get(f"https://api.vatusa.net/user/{cid}")
+            usa_resp = requests.get(f"{VATUSA_API_URL}/user/{cid}")
             if usa_resp.status_code == 200:
                 usa_data = usa_resp.json().get("data", {})
                 real_name = f"{usa_data.get('fname', '')} {usa_data.get('lname', '')}".strip()
@@ -519,6 +510,16 @@ class Vatsim(commands.Cog):
         embed.add_field(name="Controller Hours", value=format_column(left), inline=True)
         embed.add_field(name="\u200b", value=format_column(right), inline=True)
 
+        # Recent activity from the bot's own session log (extensions/session_history.py)
+        history = self.bot.get_cog("SessionHistory")
+        if history is not None:
+            recent, last = await history.recent_activity(cid)
+            lines = [f"{kind.upper()}: {hours:.1f}h" for kind, hours in sorted(recent.items())] or ["No sessions recorded"]
+            if last:
+                _, callsign, _, _, logon, logoff = last
+                lines.append(f"Online now as {callsign}" if logoff is None else f"Last seen <t:{int(logoff)}:R> as {callsign}")
+            embed.add_field(name="Last 30 Days (recorded)", value="\n".join(lines), inline=False)
+
         await ctx.send(embed=embed)
 
     @commands.command(name="callsign")
@@ -527,7 +528,7 @@ class Vatsim(commands.Cog):
         callsign = callsign.upper()
 
         try:
-            data = await fetch_vatsim_data()
+            data = await fetch_vatsim_sections("pilots", "controllers", "atis")
             if not isinstance(data, dict):
                 await ctx.send("Failed to fetch VATSIM data.")
                 return
@@ -610,7 +611,7 @@ class Vatsim(commands.Cog):
     async def faclist(self, ctx):
         """Get list of all VATUSA facilities"""
         async with aiohttp.ClientSession() as session:
-            url = "https://api.vatusa.net/v2/facility/"
+            url = f"{VATUSA_API_URL}/v2/facility/"
             async with session.get(url) as response:
                 if response.status != 200:
                     text = await response.text()
@@ -699,7 +700,7 @@ class Vatsim(commands.Cog):
         status_msg = await ctx.send(f"Fetching info for {facility_id}…")
 
         async with aiohttp.ClientSession() as session:
-            url = f"https://api.vatusa.net/v2/facility/{facility_id}"
+            url = f"{VATUSA_API_URL}/v2/facility/{facility_id}"
             async with session.get(url) as response:
                 if response.status != 200:
                     await status_msg.edit(content=f"Failed to retrieve data for facility {facility_id}.")
@@ -771,7 +772,7 @@ class Vatsim(commands.Cog):
         status_msg = await ctx.send(f"Fetching {roster_type} roster for {facility_id}…")
 
         async with aiohttp.ClientSession() as session:
-            url = f"https://api.vatusa.net/v2/facility/{facility_id}/roster/{roster_type}"
+            url = f"{VATUSA_API_URL}/v2/facility/{facility_id}/roster/{roster_type}"
             async with session.get(url) as response:
                 if response.status != 200:
                     await status_msg.edit(content=f"Failed to retrieve roster for {facility_id}.")
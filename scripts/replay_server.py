@@ -0,0 +1,222 @@
+"""Local stand-in for the VATSIM, VATUSA, Mapbox, OpenCage, FAA and P56 endpoints.
+
+Replays recorded datafeed snapshots in order (one per --interval seconds) so
+logons and logoffs happen as they did when recorded, and serves canned FAA
+HTML, P56 JSON and small stubs for the other APIs.
+
+Usage:
+    python scripts/replay_server.py [--port 8080] [--feeds fixtures/datafeed] [--interval 15] [--no-loop]
+    python scripts/replay_server.py --archive data/archive --start 2024-05-01T18:00Z --end 2024-05-01T20:00Z
+
+Then start the bot with every upstream pointed at it, e.g. in `.env`:
+
+    VATSIM_DATA_URL=http://127.0.0.1:8080/v3/vatsim-data.json
+    VATSIM_TRANSCEIVERS_URL=http://127.0.0.1:8080/v3/transceivers-data.json
+    VATSIM_API_URL=http://127.0.0.1:8080
+    VATUSA_API_URL=http://127.0.0.1:8080
+    FAA_BASE_URL=http://127.0.0.1:8080
+    MAPBOX_API_URL=http://127.0.0.1:8080
+    OPENCAGE_API_URL=http://127.0.0.1:8080
+    P56_API_URL=http://127.0.0.1:8080/api/v1/p56/
+
+`GET /_replay/next` advances to the next snapshot immediately and
+`GET /_replay/status` shows which one is being served.
+"""
+import argparse
+import base64
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+from aiohttp import web
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT_DIR, "fixtures")
+
+# 1x1 transparent PNG returned for Mapbox static images
+TINY_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+class FeedReplay:
+    """Serves recorded feed files in sequence, advancing every `interval` seconds."""
+
+    def __init__(self, paths, interval, loop=True):
+        if not paths:
+            raise SystemExit("No datafeed snapshots found")
+        self.paths = paths
+        self.interval = interval
+        self.loop = loop
+        self.started = time.monotonic()
+        self.offset = 0  # manual advances via /_replay/next
+        self._cache = {}
+
+    def index(self):
+        step = int((time.monotonic() - self.started) / self.interval) + self.offset
+        if self.loop:
+            return step % len(self.paths)
+        return min(step, len(self.paths) - 1)
+
+    def current(self):
+        path = self.paths[self.index()]
+        if path not in self._cache:
+            with open(path, "rb") as f:
+                self._cache[path] = f.read()
+        return self._cache[path]
+
+
+def _read_fixture(*parts):
+    with open(os.path.join(FIXTURES_DIR, *parts), "rb") as f:
+        return f.read()
+
+
+def build_app(replay):
+    routes = web.RouteTableDef()
+
+    # --- VATSIM datafeed and API ---
+    @routes.get("/v3/vatsim-data.json")
+    async def datafeed(request):
+        return web.Response(body=replay.current(), content_type="application/json")
+
+    @routes.get("/v3/transceivers-data.json")
+    async def transceivers(request):
+        data = json.loads(replay.current())
+        entries = [
+            {"callsign": c["callsign"], "transceivers": [
+                {"id": 0, "frequency": int(round(float(c["frequency"]) * 1_000_000))}
+            ]}
+            for c in data.get("controllers", []) + data.get("atis", [])
+        ]
+        return web.json_response(entries)
+
+    @routes.get("/api/ratings/{cid}/")
+    async def ratings(request):
+        cid = int(request.match_info["cid"])
+        return web.json_response({
+            "id": cid, "rating": 1, "pilotrating": 0, "susp_date": None,
+            "reg_date": "2024-05-01T11:55:00", "region_id": "AMAS", "division_id": "USA",
+            "subdivision_id": None, "lastratingchange": None,
+        })
+
+    @routes.get("/v2/members/{cid}/stats")
+    async def member_stats(request):
+        return web.json_response({
+            "id": int(request.match_info["cid"]), "atc": 12.5, "pilot": 40.0,
+            "s1": 12.5, "s2": 0, "s3": 0, "c1": 0, "c2": 0, "c3": 0, "i1": 0, "i2": 0, "i3": 0, "sup": 0, "adm": 0,
+        })
+
+    # --- VATUSA ---
+    @routes.get("/v2/user/{cid:\\d+}")
+    async def vatusa_user(request):
+        cid = int(request.match_info["cid"])
+        return web.json_response({"data": {
+            "cid": cid, "fname": "Replay", "lname": f"User{cid}", "facility": "ZDC",
+            "rating": 1, "rating_short": "OBS", "created_at": "2024-05-01T11:55:00+00:00",
+        }})
+
+    @routes.get("/v2/{tail:.*}")
+    async def vatusa_other(request):
+        return web.json_response({"data": []})
+
+    # --- Mapbox / OpenCage ---
+    @routes.get("/styles/v1/mapbox/{tail:.*}")
+    async def mapbox(request):
+        return web.Response(body=TINY_PNG, content_type="image/png")
+
+    @routes.get("/geocode/v1/json")
+    async def opencage(request):
+        return web.json_response({"results": [{
+            "components": {"city": "Washington", "state": "District of Columbia", "country": "United States"},
+            "geometry": {"lat": 38.8512, "lng": -77.0402},
+        }]})
+
+    # --- FAA ---
+    @routes.get("/adv/adv_spt")
+    async def faa_list(request):
+        return web.Response(body=_read_fixture("faa", "adv_spt.html"), content_type="text/html")
+
+    @routes.get("/adv/{tail:.*}")
+    async def faa_detail(request):
+        return web.Response(body=_read_fixture("faa", "adv_detail.html"), content_type="text/html")
+
+    @routes.get("/restrictions/restrictions")
+    async def faa_restrictions(request):
+        return web.Response(body=_read_fixture("faa", "restrictions.html"), content_type="text/html")
+
+    # --- P56 ---
+    @routes.get("/api/v1/p56/")
+    async def p56(request):
+        data = json.loads(_read_fixture("p56", "p56.json"))
+        since = request.query.get("since")
+        if since:
+            history = data.get("history", {})
+            history["events"] = [e for e in history.get("events", []) if e.get("recorded_at", 0) >= float(since)]
+        return web.json_response(data)
+
+    # --- Replay control ---
+    @routes.get("/_replay/next")
+    async def replay_next(request):
+        replay.offset += 1
+        return await replay_status(request)
+
+    @routes.get("/_replay/status")
+    async def replay_status(request):
+        index = replay.index()
+        return web.json_response({
+            "index": index, "count": len(replay.paths),
+            "file": os.path.relpath(replay.paths[index], ROOT_DIR),
+        })
+
+    app = web.Application()
+    app.add_routes(routes)
+    return app
+
+
+def export_archive_window(directory, start, end):
+    """Expand an archive window into a temporary directory of feed files and return its path."""
+    sys.path.insert(0, ROOT_DIR)
+    from utils.snapshot_archive import export
+    from utils.time_utils import parse_iso_utc
+
+    def _epoch(value):
+        if not value:
+            return None
+        try:
+            return parse_iso_utc(value).timestamp()
+        except (ValueError, OverflowError):
+            raise SystemExit(f"Could not parse time {value!r}")
+
+    out_dir = tempfile.mkdtemp(prefix="replay-archive-")
+    count = export(_epoch(start), _epoch(end), out_dir, directory=directory)
+    print(f"Exported {count} archived snapshots to {out_dir}")
+    return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--feeds", default=os.path.join(FIXTURES_DIR, "datafeed"),
+                        help="Directory of recorded vatsim-data.json snapshots, replayed in filename order")
+    parser.add_argument("--interval", type=float, default=15, help="Seconds each snapshot is served")
+    parser.add_argument("--no-loop", action="store_true", help="Stay on the last snapshot instead of wrapping")
+    parser.add_argument("--archive", metavar="DIR",
+                        help="Replay a window of the bot's snapshot archive (data/archive) instead of --feeds")
+    parser.add_argument("--start", help="Archive window start, ISO 8601 UTC (default: beginning of the archive)")
+    parser.add_argument("--end", help="Archive window end, ISO 8601 UTC (default: end of the archive)")
+    args = parser.parse_args()
+
+    if args.archive:
+        args.feeds = export_archive_window(args.archive, args.start, args.end)
+    paths = sorted(glob.glob(os.path.join(args.feeds, "*.json")))
+    replay = FeedReplay(paths, args.interval, loop=not args.no_loop)
+    print(f"Replaying {len(paths)} snapshots from {args.feeds} every {args.interval:g}s")
+    web.run_app(build_app(replay), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
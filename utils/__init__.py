@@ -21,9 +21,12 @@ from .data_manager import (
     save_a1_monitor,
     load_a9_monitor,
     save_a9_monitor,
+    load_area_monitor,
+    add_area_monitor,
+    remove_area_monitor,
 )
 
-from .vatsim_datafeed import fetch_vatsim_data, fetch_user_name, fetch_transceivers_data, get_frequencies_for_callsign
+from .vatsim_datafeed import fetch_vatsim_data, fetch_vatsim_snapshot, fetch_vatsim_sections, fetch_online_cids, fetch_user_name, fetch_transceivers_data, get_frequencies_for_callsign
 
 from .datafeed_embed import build_status_embed
 
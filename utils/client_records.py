@@ -0,0 +1,194 @@
+"""Compact, slotted records for datafeed clients.
+
+The monitor loops used to hold (and mutate) the decoded JSON dicts for every
+client. These records keep only the fields the monitors and embeds read,
+intern the highly repetitive strings (callsigns, servers, airports, types),
+and expose a dict-like `get()` so existing embed/fingerprint code keeps working.
+"""
+import sys
+
+from utils.spatial_index import PilotIndex
+
+_intern = sys.intern
+
+
+def _istr(value):
+    return _intern(value) if isinstance(value, str) else value
+
+
+class _Record:
+    __slots__ = ()
+    _slot_names = ()  # all slots including inherited ones, in feed order
+    _fields = frozenset()
+    _interned = ()
+
+    @classmethod
+    def _build(cls, get):
+        self = object.__new__(cls)
+        for name in cls._slot_names:
+            setattr(self, name, get(name))
+        for name in cls._interned:
+            setattr(self, name, _istr(getattr(self, name)))
+        self._post_init()
+        return self
+
+    @classmethod
+    def from_feed(cls, entry):
+        """Build a record from one decoded feed entry (a dict)."""
+        return cls._build(entry.get)
+
+    @classmethod
+    def from_struct(cls, obj):
+        """Build a record from a schema-typed object (see utils.json_decode)."""
+        return cls._build(lambda name: getattr(obj, name, None))
+
+    def _post_init(self):
+        pass
+
+    def get(self, key, default=None):
+        """Dict-style access; missing and null fields both return `default`."""
+        if key in self._fields:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        return default
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._slot_names)
+
+    __hash__ = None
+
+    def to_dict(self):
+        out = {}
+        for name in self._slot_names:
+            value = getattr(self, name)
+            if isinstance(value, _Record):
+                value = value.to_dict()
+            elif isinstance(value, tuple):
+                value = list(value)
+            out[name] = value
+        return out
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {getattr(self, 'callsign', '')} {getattr(self, 'cid', '')}>"
+
+
+class FlightPlanRecord(_Record):
+    __slots__ = (
+        "flight_rules", "aircraft", "aircraft_faa", "aircraft_short", "departure", "arrival",
+        "alternate", "cruise_tas", "altitude", "deptime", "enroute_time", "fuel_time",
+        "remarks", "route", "assigned_transponder",
+    )
+    _slot_names = __slots__
+    _fields = frozenset(__slots__)
+    _interned = ("flight_rules", "aircraft_short", "aircraft_faa", "departure", "arrival", "alternate")
+
+
+class PilotRecord(_Record):
+    __slots__ = (
+        "cid", "name", "callsign", "server", "pilot_rating", "military_rating",
+        "latitude", "longitude", "altitude", "groundspeed", "transponder", "heading",
+        "qnh_i_hg", "qnh_mb", "flight_plan", "logon_time", "last_updated",
+    )
+    _slot_names = __slots__
+    _source = "pilot"
+    _fields = frozenset(__slots__) | {"_source"}
+    _interned = ("callsign", "server")
+
+    def _post_init(self):
+        fp = self.flight_plan
+        if isinstance(fp, dict):
+            self.flight_plan = FlightPlanRecord.from_feed(fp)
+        elif fp is not None:
+            self.flight_plan = FlightPlanRecord.from_struct(fp)
+
+
+class ControllerRecord(_Record):
+    __slots__ = (
+        "cid", "name", "callsign", "frequency", "facility", "rating", "server",
+        "visual_range", "text_atis", "logon_time", "last_updated",
+    )
+    _slot_names = __slots__
+    _source = "controller"
+    _fields = frozenset(__slots__) | {"_source"}
+    _interned = ("callsign", "server", "frequency")
+
+    def _post_init(self):
+        if self.text_atis is not None:
+            self.text_atis = tuple(self.text_atis)
+
+
+class AtisRecord(ControllerRecord):
+    __slots__ = ("atis_code",)
+    _slot_names = ControllerRecord.__slots__ + __slots__
+    _source = "atis"
+    _fields = frozenset(_slot_names) | {"_source"}
+
+
+class FeedSnapshot:
+    """One datafeed cycle as compact records, indexed by CID and position on demand."""
+
+    __slots__ = ("update_timestamp", "pilots", "controllers", "atis", "_by_cid", "_pilot_index")
+
+    def __init__(self, update_timestamp, pilots, controllers, atis):
+        self.update_timestamp = update_timestamp
+        self.pilots = pilots
+        self.controllers = controllers
+        self.atis = atis
+        self._by_cid = None
+        self._pilot_index = None
+
+    @classmethod
+    def from_feed(cls, data):
+        general = data.get("general") or {}
+        return cls(
+            general.get("update_timestamp"),
+            [PilotRecord.from_feed(p) for p in data.get("pilots") or []],
+            [ControllerRecord.from_feed(c) for c in data.get("controllers") or []],
+            [AtisRecord.from_feed(a) for a in data.get("atis") or []],
+        )
+
+    @classmethod
+    def from_struct(cls, feed):
+        """Build a snapshot from a schema-typed feed object (see utils.json_decode)."""
+        general = feed.general
+        return cls(
+            general.update_timestamp if general is not None else None,
+            [PilotRecord.from_struct(p) for p in feed.pilots or ()],
+            [ControllerRecord.from_struct(c) for c in feed.controllers or ()],
+            [AtisRecord.from_struct(a) for a in feed.atis or ()],
+        )
+
+    def clients(self):
+        """Pilots followed by controllers (ATIS excluded), as the monitors expect."""
+        return self.pilots + self.controllers
+
+    def get_clients(self, cid):
+        """Return every pilot/controller connection for a CID (pilots first)."""
+        if self._by_cid is None:
+            by_cid = {}
+            for client in self.pilots:
+                by_cid.setdefault(int(client.cid), []).append(client)
+            for client in self.controllers:
+                by_cid.setdefault(int(client.cid), []).append(client)
+            self._by_cid = by_cid
+        try:
+            return self._by_cid.get(int(cid), [])
+        except (TypeError, ValueError):
+            return []
+
+    def pilot_index(self):
+        """Return the spatial index over this snapshot's pilots (built on first use)."""
+        if self._pilot_index is None:
+            self._pilot_index = PilotIndex(self.pilots)
+        return self._pilot_index
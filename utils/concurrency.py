@@ -0,0 +1,29 @@
+import asyncio
+from utils.metrics import QUEUE_DEPTH
+
+# How many client embeds a monitor loop renders/sends at once
+RENDER_CONCURRENCY = 4
+
+
+async def gather_bounded(coros, limit=RENDER_CONCURRENCY, label="task"):
+    """Run coroutines concurrently, at most `limit` at a time.
+
+    Exceptions are logged and returned in place of results so one failing
+    client does not cancel the rest of the cycle.
+    """
+    semaphore = asyncio.Semaphore(limit)
+    coros = list(coros)
+    QUEUE_DEPTH.inc(len(coros), label=label)
+
+    async def run(coro):
+        try:
+            async with semaphore:
+                return await coro
+        finally:
+            QUEUE_DEPTH.dec(label=label)
+
+    results = await asyncio.gather(*(run(c) for c in coros), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"[{label}] {type(result).__name__}: {result}")
+    return results
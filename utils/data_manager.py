@@ -196,11 +196,17 @@ def load_p56_seen_events():
     data = load_json('p56_monitor.json')
     return set(data.get('seen_events', []))
 
-def save_p56_seen_events(seen_events):
+def save_p56_seen_events(seen_events, cursor=None):
     data = load_json('p56_monitor.json')
     data['seen_events'] = list(seen_events)
+    if cursor is not None:
+        data['cursor'] = cursor
     save_json('p56_monitor.json', data)
 
+def load_p56_cursor():
+    """Load the newest `recorded_at` already processed (None before the first poll)"""
+    return load_json('p56_monitor.json').get('cursor')
+
 
 # === FAA Adv Monitor mute state ===
 def load_faa_muted():
@@ -213,6 +219,21 @@ def save_faa_muted(muted):
     save_json('faa_monitor.json', data)
 
 
+# === FAA Restrictions monitors ===
+def load_faa_restrictions_state():
+    """Return (monitors, rows, digest): the running monitors and the last table they saw."""
+    data = load_json('faa_restrictions.json')
+    monitors = {(int(m[0]), m[1], m[2]) for m in data.get('monitors', [])}
+    return monitors, data.get('rows', []), data.get('digest')
+
+def save_faa_restrictions_state(monitors, rows, digest):
+    save_json('faa_restrictions.json', {
+        'monitors': [list(m) for m in sorted(monitors)],
+        'rows': [list(r) for r in rows],
+        'digest': digest,
+    })
+
+
 # === A4 Monitor mute state (CoC) ===
 def load_a4_muted():
     data = load_json('a4_monitor.json')
@@ -222,3 +243,62 @@ def save_a4_muted(muted):
     data = load_json('a4_monitor.json')
     data['muted'] = bool(muted)
     save_json('a4_monitor.json', data)
+
+
+# === Area Monitor ===
+def load_area_monitor():
+    """Watched areas as {NAME: zone entry}, where an entry is the zones/*.json format
+    (`{"name", "circle": {"center", "radius_nm"}}` or `{"name", "polygon"}`)."""
+    data = load_json('area_monitor.json')
+    return data if isinstance(data, dict) else {}
+
+def save_area_monitor(areas):
+    save_json('area_monitor.json', areas)
+
+def add_area_monitor(name, entry):
+    areas = load_area_monitor()
+    areas[name] = dict(entry, name=name)
+    save_area_monitor(areas)
+
+def remove_area_monitor(name):
+    areas = load_area_monitor()
+    if name not in areas:
+        return False
+    del areas[name]
+    save_area_monitor(areas)
+    return True
+
+
+# === Channel Routes (monitor -> channel ids) ===
+def load_channel_routes():
+    data = load_json('channel_routes.json')
+    if not isinstance(data, dict):
+        return {}
+    routes = {}
+    for monitor, channel_ids in data.items():
+        if isinstance(channel_ids, list):
+            routes[monitor] = [int(c) for c in channel_ids]
+    return routes
+
+def save_channel_routes(routes):
+    save_json('channel_routes.json', routes)
+
+def add_channel_route(monitor, channel_id):
+    routes = load_channel_routes()
+    channel_ids = routes.setdefault(monitor, [])
+    if int(channel_id) in channel_ids:
+        return False
+    channel_ids.append(int(channel_id))
+    save_channel_routes(routes)
+    return True
+
+def remove_channel_route(monitor, channel_id):
+    routes = load_channel_routes()
+    channel_ids = routes.get(monitor, [])
+    if int(channel_id) not in channel_ids:
+        return False
+    channel_ids.remove(int(channel_id))
+    if not channel_ids:
+        routes.pop(monitor, None)
+    save_channel_routes(routes)
+    return True
@@ -1,23 +1,99 @@
+import asyncio
+import copy
 import discord
-from dateutil import parser
-from datetime import timezone
-from utils import fetch_user_name, fetch_vatsim_data
+from io import BytesIO
+from utils import fetch_user_name, fetch_vatsim_snapshot
+from utils.time_utils import format_utc_relative
+from utils.vatsim_datafeed import get_feed_timestamp
+from utils.fingerprint import generate_fingerprint
 from utils.geo import reverse_geocode
-from utils.mapbox_static import generate_map_image
+from utils.mapbox_static import generate_map_image, compute_zoom_between_two_points
+from utils.metrics import EMBED_RENDER_SECONDS, CACHE_REQUESTS
+from utils.track_history import tracks
 from config import facility
 
+# Per-cycle render cache: the same client matched by several monitors is rendered once per snapshot.
+# key -> task resolving to (embed body without title/footer, (filename, map bytes) or None)
+_render_cache = {}
+_render_cache_stamp = {"stamp": None}
+RENDER_CACHE_MAX = 256
+
+
+def _render_key(client_data, snapshot_stamp, rating, is_atc):
+    fp = generate_fingerprint(client_data)
+    return (
+        client_data.get("cid"),
+        client_data.get("callsign"),
+        snapshot_stamp,
+        rating,
+        is_atc,
+        tuple(sorted(fp.items())),
+    )
+
 
 async def build_status_embed(client_data, display_name, rating, is_atc=False, fingerprint=None):
-    callsign = client_data.get("callsign", "N/A")
-    server = client_data.get("server", "N/A")
     title = (
         f"{display_name} is online as ATC" if is_atc
         else f"{display_name} is online as {fingerprint['status']}" if fingerprint and "status" in fingerprint
         else f"{display_name} is online"
     )
 
+    try:
+        snapshot = await fetch_vatsim_snapshot()
+    except Exception as e:
+        print(f"[build_status_embed] Failed to fetch datafeed: {e}")
+        snapshot = None
+
+    snapshot_stamp = get_feed_timestamp(snapshot)
+    if snapshot_stamp != _render_cache_stamp["stamp"]:
+        # New snapshot: everything cached for the previous cycle is stale
+        _render_cache.clear()
+        _render_cache_stamp["stamp"] = snapshot_stamp
+
+    key = _render_key(client_data, snapshot_stamp, rating, is_atc) if snapshot_stamp else None
+    if key is None:
+        CACHE_REQUESTS.inc(cache="render", result="miss")
+        with EMBED_RENDER_SECONDS.time():
+            body, map_payload = await _render_status_body(client_data, rating, is_atc, snapshot)
+    else:
+        # Cache the task, not the result, so concurrent renders of the same client share one render
+        task = _render_cache.get(key)
+        if task is None:
+            CACHE_REQUESTS.inc(cache="render", result="miss")
+            if len(_render_cache) >= RENDER_CACHE_MAX:
+                _render_cache.clear()
+            task = asyncio.ensure_future(_timed_render(client_data, rating, is_atc, snapshot))
+            _render_cache[key] = task
+        else:
+            CACHE_REQUESTS.inc(cache="render", result="hit")
+        body, map_payload = await asyncio.shield(task)
+    # Embed.copy() shares the fields list with the cached body, and callers add fields to the result
+    embed = discord.Embed.from_dict(copy.deepcopy(body.to_dict()))
+    embed.title = title
+
+    file = None
+    if map_payload:
+        filename, data = map_payload
+        file = discord.File(BytesIO(data), filename=filename)
+
+    _set_update_footer(embed, fingerprint)
+    return embed, file
+
+
+async def _timed_render(client_data, rating, is_atc, snapshot):
+    with EMBED_RENDER_SECONDS.time():
+        return await _render_status_body(client_data, rating, is_atc, snapshot)
+
+
+async def _render_status_body(client_data, rating, is_atc, snapshot):
+    """Build the expensive, monitor-independent part of a status embed.
+
+    Returns (embed, map payload); the caller adds the title and footer.
+    """
+    callsign = client_data.get("callsign", "N/A")
+    server = client_data.get("server", "N/A")
+
     embed = discord.Embed(
-        title=title,
         color=discord.Color.green() if is_atc else discord.Color.blue()
     )
 
@@ -38,52 +114,15 @@ async def build_status_embed(client_data, display_name, rating, is_atc=False, fi
         atis_text = "\n".join(atis) if atis else "N/A"
         embed.add_field(name="Text ATIS", value=atis_text, inline=False)
 
-        try:
-            logon_time = parser.isoparse(client_data.get("logon_time"))
-            # Ensure UTC timezone
-            if logon_time.tzinfo is None:
-                logon_time = logon_time.replace(tzinfo=timezone.utc)
-            else:
-                logon_time = logon_time.astimezone(timezone.utc)
-            logon_str = logon_time.strftime("%Y-%m-%d %H:%MZ")
-            logon_timestamp = int(logon_time.timestamp())
-            logon_formatted = f"{logon_str}\n<t:{logon_timestamp}:R>"
-        except Exception:
-            logon_formatted = client_data.get("logon_time", "N/A")
-
-        try:
-            updated_time = parser.isoparse(client_data.get("last_updated"))
-            # Ensure UTC timezone
-            if updated_time.tzinfo is None:
-                updated_time = updated_time.replace(tzinfo=timezone.utc)
-            else:
-                updated_time = updated_time.astimezone(timezone.utc)
-            updated_str = updated_time.strftime("%Y-%m-%d %H:%MZ")
-            updated_timestamp = int(updated_time.timestamp())
-            updated_formatted = f"{updated_str}\n<t:{updated_timestamp}:R>"
-        except Exception:
-            updated_formatted = client_data.get("last_updated", "N/A")
+        logon_formatted = format_utc_relative(client_data.get("logon_time"))
+        updated_formatted = format_utc_relative(client_data.get("last_updated"))
 
         embed.add_field(name="Logon Time", value=logon_formatted, inline=True)
         embed.add_field(name="Last Updated", value=updated_formatted, inline=True)
 
     else:
         fp = client_data.get("flight_plan")
-        start_time = client_data.get("logon_time", None)
-        formatted_start = "N/A"
-        if start_time:
-            try:
-                start_dt = parser.isoparse(start_time)
-                # Ensure UTC timezone
-                if start_dt.tzinfo is None:
-                    start_dt = start_dt.replace(tzinfo=timezone.utc)
-                else:
-                    start_dt = start_dt.astimezone(timezone.utc)
-                start_str = start_dt.strftime("%Y-%m-%d %H:%MZ")
-                start_timestamp = int(start_dt.timestamp())
-                formatted_start = f"{start_str}\n<t:{start_timestamp}:R>"
-            except ValueError:
-                formatted_start = start_time
+        formatted_start = format_utc_relative(client_data.get("logon_time"))
         embed.add_field(name="Start Time", value=formatted_start, inline=True)
 
         if fp:
@@ -127,17 +166,19 @@ async def build_status_embed(client_data, display_name, rating, is_atc=False, fi
         else:
             embed.add_field(name="Flight Plan", value="No flight plan filed", inline=False)
 
-    # Initialize file variable
-    file = None
+    # Initialize map payload
+    map_payload = None
 
     # 🗺 Add map if lat/lon exists
     try:
-        vatsim_data = await fetch_vatsim_data()
-        if isinstance(vatsim_data, dict):
-            all_clients = vatsim_data.get("controllers", []) + vatsim_data.get("pilots", [])
-            live_entry = next((x for x in all_clients if x.get("cid") == client_data.get("cid")), None)
-        else:
-            live_entry = None
+        live_entry = None
+        if snapshot is not None:
+            # Prefer the connection with the same callsign when a CID is online twice
+            connections = snapshot.get_clients(client_data.get("cid"))
+            live_entry = next(
+                (x for x in connections if x.callsign == client_data.get("callsign")),
+                connections[0] if connections else None
+            )
 
         if live_entry:
             lat = live_entry.get("latitude")
@@ -159,7 +200,21 @@ async def build_status_embed(client_data, display_name, rating, is_atc=False, fi
                 qnh_display = ""
             
             if lat is not None and lon is not None:
-                location = await reverse_geocode(lat, lon)
+                # Draw the flown track when the monitors have been recording this connection
+                path = [] if is_atc else tracks.path(live_entry.get("cid"), live_entry.get("logon_time"))
+                if len(path) >= 2:
+                    zoom = min(compute_zoom_between_two_points(path[0], (lat, lon)), 7)
+                else:
+                    path, zoom = None, 7
+                # Geocode and map are independent network calls; run them together
+                location, map_img = await asyncio.gather(
+                    reverse_geocode(lat, lon),
+                    generate_map_image(lat, lon, pins=[(lat, lon)], path_coords=path, zoom=zoom),
+                    return_exceptions=True,
+                )
+                if isinstance(location, Exception):
+                    print(f"[build_status_embed] Reverse geocode failed: {location}")
+                    location = "Unknown location"
                 position_info = (
                     f"{lat:.5f}, {lon:.5f}\n{location}\n"
                     f"Alt: {current_alt} ft | GS: {groundspeed} kts | HDG: {heading}°"
@@ -168,15 +223,20 @@ async def build_status_embed(client_data, display_name, rating, is_atc=False, fi
                     position_info += f" | {qnh_display}"
                 embed.add_field(name="Position", value=position_info, inline=False)
 
-                map_img = await generate_map_image(lat, lon, pins=[(lat, lon)], zoom=7)
-                if map_img:
-                    file = discord.File(map_img, filename="position_map.png")
+                if isinstance(map_img, Exception):
+                    print(f"[build_status_embed] Map generation failed: {map_img}")
+                elif hasattr(map_img, "read"):
+                    map_payload = ("position_map.png", map_img.read())
                     embed.set_image(url="attachment://position_map.png")
 
     except Exception as e:
         print(f"[build_status_embed] Failed to attach map: {e}")
 
-    # Footer: Last updated and what changed, if provided
+    return embed, map_payload
+
+
+def _set_update_footer(embed, fingerprint):
+    """Footer: Last updated and what changed, if provided"""
     try:
         if isinstance(fingerprint, dict):
             updated_at = fingerprint.get("updated_at")
@@ -218,4 +278,26 @@ async def build_status_embed(client_data, display_name, rating, is_atc=False, fi
     except Exception as e:
         print(f"[build_status_embed] Failed to set footer: {e}")
 
-    return embed, file
\ No newline at end of file
+
+def pilot_summary_line(pilot, distance=None):
+    """One-line pilot summary for area lists: callsign, distance, type and route, altitude, speed."""
+    fp = pilot.get("flight_plan")
+    parts = [f"**{pilot.get('callsign', 'N/A')}**"]
+    if distance is not None:
+        parts.append(f"{distance:.1f} NM")
+    if fp:
+        route = f"{fp.get('departure') or '????'}→{fp.get('arrival') or '????'}"
+        parts.append(f"{fp.get('aircraft_short') or 'N/A'} {route}")
+    altitude = pilot.get("altitude") or 0
+    parts.append(f"FL{altitude // 100:03d}" if altitude >= 18000 else f"{altitude} ft")
+    parts.append(f"{pilot.get('groundspeed') or 0} kt")
+    return " · ".join(parts)
+
+
+def build_area_list_embed(title, matches, color=discord.Color.teal(), limit=25):
+    """Embed listing [(distance_nm or None, pilot)] matches of an area query, one line each."""
+    lines = [pilot_summary_line(pilot, distance) for distance, pilot in matches[:limit]]
+    embed = discord.Embed(title=title, description="\n".join(lines) or "No pilots.", color=color)
+    if len(matches) > limit:
+        embed.set_footer(text=f"Showing {limit} of {len(matches)} pilots")
+    return embed
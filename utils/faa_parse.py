@@ -0,0 +1,165 @@
+"""HTML parsing for the FAA scrapers, run off the event loop.
+
+The parsers here are plain functions of the page text so they can run in a
+worker thread or process (`run_parser`). BeautifulSoup uses lxml when it is
+installed, which is several times faster than the stdlib html.parser on the
+restrictions table; FAA_HTML_PARSER forces one or the other.
+"""
+import asyncio
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from config import FAA_HTML_PARSER, FAA_PARSE_POOL
+
+try:
+    import lxml  # noqa: F401  (only needed as a BeautifulSoup backend)
+except ImportError:
+    lxml = None
+
+
+def select_html_parser(name="auto"):
+    """Return the BeautifulSoup parser name to use: `lxml` when available, else `html.parser`."""
+    if name in ("", "auto"):
+        return "lxml" if lxml is not None else "html.parser"
+    if name == "lxml" and lxml is None:
+        print("[FAA Parse] lxml is not installed; using html.parser")
+        return "html.parser"
+    return name
+
+
+HTML_PARSER = select_html_parser(FAA_HTML_PARSER)
+
+RESTRICTION_HEADERS = {"REQUESTING", "PROVIDING", "RESTRICTION", "START TIME", "STOP TIME"}
+
+_executor = None
+
+
+def _get_executor():
+    # Created on first use; a process pool costs a Python interpreter per worker on the Pi
+    global _executor
+    if _executor is None:
+        if FAA_PARSE_POOL == "process":
+            _executor = ProcessPoolExecutor(max_workers=1)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="faa-parse")
+    return _executor
+
+
+async def run_parser(func, *args):
+    """Run one of the parsers below in the worker pool and return its result."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), func, *args)
+
+
+def parse_advisory_page(text, base_url, want_text=False):
+    """Parse the adv_spt list page.
+
+    Returns (links, body_text): `links` is a list of (url, title) for every
+    advisory anchor. `body_text` is the page text (newline separated) when
+    there are no anchors or `want_text` is set, otherwise None.
+    """
+    soup = BeautifulSoup(text, HTML_PARSER)
+    links = []
+    for a in soup.find_all("a", href=True):
+        if "/adv/" not in a["href"]:
+            continue
+        title = (a.get_text() or "").strip()
+        links.append((urljoin(base_url, a["href"].strip()), title))
+    body_text = soup.get_text(separator="\n") if want_text or not links else None
+    return links, body_text
+
+
+def html_to_text(text):
+    """Return a page's visible text, one block per line."""
+    return BeautifulSoup(text, HTML_PARSER).get_text(separator="\n")
+
+
+def parse_restriction_table(text):
+    """Return the restrictions table as [requesting, providing, restriction, start, stop] rows."""
+    soup = BeautifulSoup(text, HTML_PARSER)
+
+    # Find the table that contains the restriction headers
+    target = None
+    for table in soup.find_all("table"):
+        headers = {th.get_text(strip=True).upper() for th in table.find_all("th")}
+        if RESTRICTION_HEADERS.issubset(headers):
+            target = table
+            break
+
+    rows = []
+    # Fallback: look for tr with 5 tds anywhere
+    for tr in (target if target is not None else soup).find_all("tr"):
+        tds = tr.find_all("td")
+        if len(tds) >= 5:
+            rows.append([td.get_text(" ", strip=True) for td in tds[:5]])
+    return rows
+
+
+def format_restriction(row):
+    """Return (key, daytime, compact) for one table row.
+
+    `daytime` is `D/HHMM` of the start time and `compact` is the restriction
+    text with the time window and provider appended when it doesn't already
+    mention them.
+    """
+    r_req, r_prov, r_restr, r_start, r_stop = row[:5]
+
+    # parse start/stop time to extract day and HHMM
+    start_hm = ""
+    stop_hm = ""
+    try:
+        sdt = datetime.strptime(r_start, "%m/%d/%Y %H%M")
+        edt = datetime.strptime(r_stop, "%m/%d/%Y %H%M")
+        start_hm = sdt.strftime("%H%M")
+        stop_hm = edt.strftime("%H%M")
+        daynum = str(sdt.day)
+    except Exception:
+        parts = r_start.split()
+        if len(parts) >= 2:
+            daynum = parts[0].split("/")[-1]
+            start_hm = parts[1]
+        else:
+            daynum = "?"
+            start_hm = r_start
+
+    daytime = f"{daynum}/{start_hm}"
+
+    compact = r_restr or ""
+    has_time = bool(re.search(r"\b\d{3,4}-\d{3,4}\b", compact))
+
+    has_provider = False
+    for tok in re.split(r"[,/\s]+", (r_prov or "")):
+        if not tok:
+            continue
+        if re.search(rf"\b{re.escape(tok)}\b", compact) or re.search(rf"{re.escape(tok)}:", compact):
+            has_provider = True
+            break
+
+    parts = [compact]
+    if start_hm and stop_hm and not has_time:
+        parts.append(f"{start_hm}-{stop_hm}")
+    if r_prov and not has_provider:
+        parts.append(r_prov)
+
+    compact = " ".join(p for p in parts if p).strip()
+
+    key = f"{r_req}|{r_prov}|{r_restr}|{r_start}|{r_stop}"
+    return key, daytime, compact
+
+
+def restriction_matches(row, req="ALL", prov="ALL"):
+    """True when a raw row's requesting/providing facilities match the filters (`ALL` matches any)."""
+    return (req == "ALL" or row[0].upper() == req) and (prov == "ALL" or row[1].upper() == prov)
+
+
+def parse_restriction_rows(text, req="ALL", prov="ALL"):
+    """Parse the restrictions page into raw rows matching the facility filters."""
+    return [row for row in parse_restriction_table(text) if restriction_matches(row, req, prov)]
+
+
+def parse_restrictions(text, req="ALL", prov="ALL"):
+    """Parse the restrictions page into (key, daytime, compact) rows matching the facility filters."""
+    return [format_restriction(row) for row in parse_restriction_rows(text, req, prov)]
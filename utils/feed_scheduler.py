@@ -0,0 +1,125 @@
+"""Feed-aligned scheduling for the datafeed monitor loops.
+
+VATSIM refreshes the datafeed about every 15 seconds. Rather than each loop
+ticking on its own 15s timer, every loop waits for the same slot, FEED_CYCLE_OFFSET
+seconds after the feed's last `update_timestamp`, so one download serves them all
+and they see fresh data.
+
+A loop that overruns its slot does not queue up the cycles it missed: it runs
+once on the newest data and the missed slots are counted as dropped. A 429 from
+VATSIM puts the feed into exponential backoff with jitter, and cached data is
+served until the backoff ends.
+"""
+import asyncio
+import functools
+import math
+import random
+import time
+
+from config import FEED_INTERVAL, FEED_CYCLE_OFFSET, FEED_BACKOFF_MAX
+from utils.metrics import LOOP_DROPPED, FEED_BACKOFF, instrument_loop
+from utils.time_utils import parse_iso_utc
+
+# First backoff after a 429; doubles per consecutive 429 up to FEED_BACKOFF_MAX
+BACKOFF_BASE = 15
+
+
+class FeedScheduler:
+    """Shared clock for the feed loops, anchored to the feed's update_timestamp."""
+
+    def __init__(self, interval=FEED_INTERVAL, offset=FEED_CYCLE_OFFSET):
+        self.interval = interval
+        self.offset = offset
+        self.anchor = None  # epoch seconds of the newest update_timestamp seen
+        self.last_slot = {}  # loop name -> epoch seconds of the slot it last ran
+        self.rate_limited = 0  # consecutive 429s
+        self.backoff_until = 0.0  # monotonic
+
+    def observe(self, update_timestamp):
+        """Re-anchor the slots on a freshly fetched feed's update_timestamp."""
+        if not update_timestamp:
+            return
+        try:
+            self.anchor = parse_iso_utc(update_timestamp).timestamp()
+        except (ValueError, OverflowError):
+            pass
+
+    def next_slot(self, after):
+        """Return the first slot strictly later than `after` (epoch seconds)."""
+        base = (self.anchor or 0.0) + self.offset
+        steps = math.floor((after - base) / self.interval) + 1
+        return base + steps * self.interval
+
+    def plan(self, name, now=None):
+        """Return (delay, dropped) for the next cycle of `name` and claim its slot.
+
+        `delay` is how long to sleep before running; `dropped` is how many slots
+        passed while the previous cycle was still running.
+        """
+        now = time.time() if now is None else now
+        last = self.last_slot.get(name)
+        if last is None:
+            # First cycle runs straight away
+            self.last_slot[name] = now
+            return 0.0, 0
+        # Half an interval of slack so a re-anchor cannot run the same slot twice
+        due = self.next_slot(last + self.interval / 2)
+        if due > now:
+            self.last_slot[name] = due
+            return due - now, 0
+        # Overran: run once now on the newest data instead of replaying every missed slot
+        dropped = int((now - due) // self.interval)
+        self.last_slot[name] = due + dropped * self.interval
+        return 0.0, dropped
+
+    async def wait(self, name):
+        """Sleep until `name`'s next slot, logging any cycles it had to drop."""
+        delay, dropped = self.plan(name)
+        if dropped:
+            LOOP_DROPPED.inc(dropped, loop=name)
+            print(f"[Scheduler] {name} overran its cycle; dropped {dropped} cycle(s)")
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def note_rate_limited(self, retry_after=None):
+        """Back off after a 429: exponential with jitter, never shorter than Retry-After."""
+        self.rate_limited += 1
+        delay = min(FEED_BACKOFF_MAX, BACKOFF_BASE * 2 ** (self.rate_limited - 1))
+        # Jitter so several instances behind one IP don't retry in lockstep
+        delay = random.uniform(delay / 2, delay)
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        self.backoff_until = time.monotonic() + delay
+        FEED_BACKOFF.set(delay)
+        print(f"[Scheduler] VATSIM rate limited; backing off {delay:.0f}s")
+
+    def note_success(self):
+        if self.rate_limited:
+            self.rate_limited = 0
+            FEED_BACKOFF.set(0)
+
+    def backoff_remaining(self):
+        return max(0.0, self.backoff_until - time.monotonic())
+
+
+scheduler = FeedScheduler()
+
+
+def feed_cycle(name):
+    """Decorator for a feed loop body run under `@tasks.loop()`.
+
+    Waits for the loop's next feed-aligned slot, then runs the body with the
+    usual loop metrics (see utils.metrics.instrument_loop).
+    """
+    def decorator(func):
+        timed = instrument_loop(name, scheduler.interval)(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            await scheduler.wait(name)
+            return await timed(*args, **kwargs)
+        return wrapper
+    return decorator
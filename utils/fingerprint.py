@@ -8,7 +8,7 @@ def generate_fingerprint(client_data):
     }
 
     if source == "pilot":
-        fp = client_data.get("flight_plan", {})
+        fp = client_data.get("flight_plan") or {}
         aircraft = fp.get("aircraft_short") or fp.get("aircraft")
         base.update({
             "transponder": client_data.get("transponder"),
@@ -25,7 +25,7 @@ def generate_fingerprint(client_data):
             "frequency": client_data.get("frequency"),
             "facility": client_data.get("facility"),
             "visual_range": client_data.get("visual_range"),
-            "text_atis": "\n".join(client_data.get("text_atis", []))
+            "text_atis": "\n".join(client_data.get("text_atis") or [])
         })
 
     return base
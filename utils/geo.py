@@ -1,5 +1,7 @@
+import asyncio
 import aiohttp
 import os
+from config import OPENCAGE_API_URL
 
 # Set your OpenCage API key here or from environment variable
 OPENCAGE_KEY = os.getenv("OPENCAGE_KEY")
@@ -8,7 +10,7 @@ async def reverse_geocode(lat: float, lon: float) -> str:
     """
     Returns a general location name (city/state/country or ocean) from coordinates.
     """
-    url = f"https://api.opencagedata.com/geocode/v1/json?q={lat}+{lon}&key={OPENCAGE_KEY}&no_annotations=0&language=en"
+    url = f"{OPENCAGE_API_URL}/geocode/v1/json?q={lat}+{lon}&key={OPENCAGE_KEY}&no_annotations=0&language=en"
 
     async with aiohttp.ClientSession() as session:
         async with session.get(url) as resp:
@@ -36,3 +38,54 @@ async def reverse_geocode(lat: float, lon: float) -> str:
         return country
     else:
         return "Unknown location"
+
+
+async def forward_geocode(query: str):
+    """
+    Returns (lat, lon) for a place name or airport code, or None if it can't be resolved.
+    """
+    params = {"q": query, "key": OPENCAGE_KEY or "", "limit": 1, "no_annotations": 1}
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            f"{OPENCAGE_API_URL}/geocode/v1/json", params=params, timeout=aiohttp.ClientTimeout(total=10)
+        ) as resp:
+            if resp.status != 200:
+                return None
+            data = await resp.json()
+
+    results = data.get("results") or []
+    geometry = results[0].get("geometry") if results else None
+    if not geometry:
+        return None
+    return geometry["lat"], geometry["lng"]
+
+
+def parse_point(text: str):
+    """
+    Parses `lat,lon` (e.g. `38.85,-77.04`) into floats, or returns None.
+    """
+    parts = text.replace(" ", "").split(",")
+    if len(parts) != 2:
+        return None
+    try:
+        lat, lon = float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+async def resolve_point(text: str):
+    """
+    Returns (lat, lon) for `lat,lon` text, otherwise geocodes it (airport code or place name).
+    Returns None when it can't be resolved, including when the geocoder is unreachable.
+    """
+    point = parse_point(text)
+    if point is not None:
+        return point
+    try:
+        return await forward_geocode(text)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        print(f"Geocoding `{text}` failed: {e}")
+        return None
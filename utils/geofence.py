@@ -0,0 +1,219 @@
+"""In-process geofencing of datafeed pilots against polygon zones.
+
+Zones are loaded from a JSON file (see zones/p56.json). Each snapshot, pilots
+are checked against the union bounding box of all zones first, then against
+each zone's own box, and only then with a ray-casting point-in-polygon test,
+so a feed of thousands of pilots costs one comparison per pilot away from the
+zones.
+
+`GeofenceEngine` tracks who is inside which zone between snapshots and emits
+entry and exit events shaped like the P56 service's `history.events`, so
+`P56Monitor.build_p56_embed` renders them unchanged.
+"""
+import collections
+import json
+import math
+import os
+import time
+
+# Pilots this close (degrees) to a zone keep a short track so entry events carry pre-positions
+TRACK_MARGIN = 0.25
+PRE_POSITIONS = 3
+# Completed events kept for `history.events`
+HISTORY_SIZE = 200
+
+
+def circle_polygon(lat, lon, radius_nm, points=32):
+    """Approximate a circle of `radius_nm` around (lat, lon) as a polygon."""
+    dlat = radius_nm / 60.0
+    dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+    return [
+        (lat + dlat * math.sin(2 * math.pi * i / points), lon + dlon * math.cos(2 * math.pi * i / points))
+        for i in range(points)
+    ]
+
+
+def point_in_polygon(lat, lon, polygon):
+    """Ray-casting test; `polygon` is a list of (lat, lon) vertices."""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lon_i = polygon[i]
+        lat_j, lon_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat):
+            cross = lon_i + (lat - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+            if lon < cross:
+                inside = not inside
+        j = i
+    return inside
+
+
+class Zone:
+    __slots__ = ("name", "polygon", "floor_ft", "ceiling_ft", "bbox")
+
+    def __init__(self, name, polygon, floor_ft=None, ceiling_ft=None):
+        self.name = name
+        self.polygon = [(float(lat), float(lon)) for lat, lon in polygon]
+        self.floor_ft = floor_ft
+        self.ceiling_ft = ceiling_ft
+        lats = [p[0] for p in self.polygon]
+        lons = [p[1] for p in self.polygon]
+        self.bbox = (min(lats), min(lons), max(lats), max(lons))
+
+    @classmethod
+    def from_config(cls, entry):
+        if "circle" in entry:
+            circle = entry["circle"]
+            lat, lon = circle["center"]
+            polygon = circle_polygon(float(lat), float(lon), float(circle["radius_nm"]))
+        else:
+            polygon = entry["polygon"]
+        return cls(entry["name"], polygon, entry.get("floor_ft"), entry.get("ceiling_ft"))
+
+    def contains(self, lat, lon, altitude=None):
+        min_lat, min_lon, max_lat, max_lon = self.bbox
+        if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+            return False
+        if altitude is not None:
+            if self.floor_ft is not None and altitude < self.floor_ft:
+                return False
+            if self.ceiling_ft is not None and altitude > self.ceiling_ft:
+                return False
+        return point_in_polygon(lat, lon, self.polygon)
+
+
+def load_zones(path):
+    """Load zones from a JSON file of `{"zones": [{"name", "polygon" | "circle", ...}]}`."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [Zone.from_config(entry) for entry in data.get("zones", [])]
+
+
+def load_zone_dir(directory):
+    """Load every zones/*.json file in `directory` as {NAME: Zone} (names upper-cased)."""
+    zones = {}
+    if not os.path.isdir(directory):
+        return zones
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".json"):
+            for zone in load_zones(os.path.join(directory, filename)):
+                zones[zone.name.upper()] = zone
+    return zones
+
+
+def _union_bbox(zones, margin=0.0):
+    if not zones:
+        return None
+    return (
+        min(z.bbox[0] for z in zones) - margin, min(z.bbox[1] for z in zones) - margin,
+        max(z.bbox[2] for z in zones) + margin, max(z.bbox[3] for z in zones) + margin,
+    )
+
+
+def _fp_dict(fp):
+    if fp is None:
+        return None
+    return fp.to_dict() if hasattr(fp, "to_dict") else dict(fp)
+
+
+class GeofenceEngine:
+    """Tracks pilots entering and leaving zones across datafeed snapshots."""
+
+    def __init__(self, zones):
+        self.zones = list(zones)
+        self.bbox = _union_bbox(self.zones)
+        self.track_bbox = _union_bbox(self.zones, TRACK_MARGIN)
+        self.inside = {}  # cid -> open intrusion (event dict being built)
+        self.tracks = {}  # cid -> deque of recent positions near the zones
+        self.history = collections.deque(maxlen=HISTORY_SIZE)
+
+    def _zones_at(self, lat, lon, altitude):
+        min_lat, min_lon, max_lat, max_lon = self.bbox
+        if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+            return []
+        return [z.name for z in self.zones if z.contains(lat, lon, altitude)]
+
+    def update(self, pilots, now=None):
+        """Process one snapshot's pilots and return the entry/exit events it produced."""
+        if not self.zones:
+            return []
+        now = time.time() if now is None else now
+        t_min_lat, t_min_lon, t_max_lat, t_max_lon = self.track_bbox
+        events = []
+        near = set()
+
+        for pilot in pilots:
+            try:
+                # PilotRecord attributes; plain feed dicts take the slower path
+                lat = pilot.latitude
+                lon = pilot.longitude
+            except AttributeError:
+                lat = pilot.get("latitude")
+                lon = pilot.get("longitude")
+            # Cheap reject for the (vast) majority of pilots nowhere near a zone
+            if lat is None or lon is None or not (t_min_lat <= lat <= t_max_lat and t_min_lon <= lon <= t_max_lon):
+                continue
+            cid = pilot.get("cid")
+            near.add(cid)
+            position = {"lat": lat, "lon": lon, "alt": pilot.get("altitude"), "ts": now}
+            zones = self._zones_at(lat, lon, pilot.get("altitude"))
+            open_event = self.inside.get(cid)
+
+            if zones and open_event is None:
+                track = self.tracks.get(cid) or ()
+                open_event = {
+                    "identifier": f"{pilot.get('callsign', 'unknown')}-{cid}",
+                    "cid": cid,
+                    "callsign": pilot.get("callsign", "N/A"),
+                    "name": pilot.get("name", "Unknown"),
+                    "zones": zones,
+                    "recorded_at": now,
+                    "exit_detected_at": None,
+                    "flight_plan": _fp_dict(pilot.get("flight_plan")),
+                    "pre_positions": list(track),
+                    "intrusion_positions": [position],
+                    "post_positions": [],
+                }
+                self.inside[cid] = open_event
+                events.append(dict(open_event, intrusion_positions=[position]))
+            elif zones:
+                open_event["intrusion_positions"].append(position)
+                open_event["zones"] = sorted(set(open_event["zones"]) | set(zones))
+            elif open_event is not None:
+                events.append(self._close(cid, now, position))
+
+            self.tracks.setdefault(cid, collections.deque(maxlen=PRE_POSITIONS)).append(position)
+
+        # Disconnected or left the tracking area while inside: close the intrusion
+        for cid in [cid for cid in self.inside if cid not in near]:
+            events.append(self._close(cid, now, None))
+        for cid in [cid for cid in self.tracks if cid not in near]:
+            del self.tracks[cid]
+
+        self.history.extend(events)
+        return events
+
+    def _close(self, cid, now, position):
+        event = self.inside.pop(cid)
+        return dict(
+            event,
+            recorded_at=now,
+            exit_detected_at=now,
+            post_positions=[position] if position else [],
+        )
+
+    def payload(self, since=None):
+        """Return state in the P56 service's response shape (`history.events` / `history.current_inside`)."""
+        events = [e for e in self.history if since is None or e["recorded_at"] >= since]
+        current = {
+            str(cid): {
+                "inside": True,
+                "callsign": e["callsign"],
+                "name": e["name"],
+                "last_seen": e["intrusion_positions"][-1]["ts"],
+                "flight_plan": e["flight_plan"],
+                "latest_position": e["intrusion_positions"][-1],
+            }
+            for cid, e in self.inside.items()
+        }
+        return {"history": {"events": events, "current_inside": current}}
@@ -0,0 +1,215 @@
+"""Pluggable JSON decoding for the large feeds the bot polls.
+
+Uses orjson or msgspec when installed and falls back to the stdlib `json`
+module. Set JSON_BACKEND to force one (`orjson`, `msgspec`, `json`); the
+default `auto` picks the fastest available.
+
+With msgspec installed the datafeed can also be decoded straight into the
+record schema (FEED_TYPED_DECODE): unknown fields are skipped by the decoder
+instead of being materialised as dicts and thrown away.
+
+Consumers that only need some top-level sections can use `decode_sections`,
+which locates each section in the raw bytes and decodes just those slices.
+"""
+import json
+import re
+from typing import Any, List, Optional
+
+from config import JSON_BACKEND, FEED_TYPED_DECODE
+from utils.client_records import (
+    FeedSnapshot, PilotRecord, FlightPlanRecord, ControllerRecord, AtisRecord,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+DECODERS = {"json": json.loads}
+if msgspec is not None:
+    DECODERS["msgspec"] = msgspec.json.decode
+if orjson is not None:
+    DECODERS["orjson"] = orjson.loads
+
+# Preferred order for JSON_BACKEND=auto
+_AUTO_ORDER = ("orjson", "msgspec", "json")
+
+
+def select_backend(name="auto"):
+    """Return the name of the decoder to use for `name` (falls back to stdlib)."""
+    name = (name or "auto").lower()
+    if name in DECODERS:
+        return name
+    if name != "auto":
+        print(f"[json_decode] Backend '{name}' not available, using auto")
+    for candidate in _AUTO_ORDER:
+        if candidate in DECODERS:
+            return candidate
+    return "json"
+
+
+BACKEND = select_backend(JSON_BACKEND)
+_loads = DECODERS[BACKEND]
+
+
+def loads(data):
+    """Decode JSON from bytes or str with the selected backend."""
+    return _loads(data)
+
+
+def _build_feed_schema():
+    """msgspec Structs mirroring the record slots; everything else in the feed is skipped."""
+    def struct(name, fields, overrides=None):
+        overrides = overrides or {}
+        return msgspec.defstruct(
+            name,
+            [(field, overrides.get(field, Any), None) for field in fields],
+        )
+
+    flight_plan = struct("FlightPlanStruct", FlightPlanRecord._slot_names)
+    pilot = struct("PilotStruct", PilotRecord._slot_names, {"flight_plan": Optional[flight_plan]})
+    atis_fields = {"text_atis": Optional[List[str]]}
+    controller = struct("ControllerStruct", ControllerRecord._slot_names, atis_fields)
+    atis = struct("AtisStruct", AtisRecord._slot_names, atis_fields)
+    general = struct("GeneralStruct", ("update_timestamp",))
+    feed = msgspec.defstruct("FeedStruct", [
+        ("general", Optional[general], None),
+        ("pilots", List[pilot], []),
+        ("controllers", List[controller], []),
+        ("atis", List[atis], []),
+    ])
+    return msgspec.json.Decoder(feed)
+
+
+_feed_decoder = _build_feed_schema() if msgspec is not None and FEED_TYPED_DECODE else None
+
+
+def decode_feed_snapshot(raw, typed=None):
+    """Decode raw datafeed bytes into a FeedSnapshot.
+
+    Uses the msgspec schema when available (and `typed` is not False),
+    otherwise decodes just the client sections with the selected backend and
+    converts them.
+    """
+    if typed is None:
+        typed = _feed_decoder is not None
+    if typed and _feed_decoder is not None:
+        return FeedSnapshot.from_struct(_feed_decoder.decode(raw))
+    data = decode_sections(raw, SNAPSHOT_SECTIONS)
+    if data is None:
+        return None
+    return FeedSnapshot.from_feed(data)
+
+
+# Top-level keys of the v3 datafeed, used to slice sections out of the raw body
+FEED_SECTIONS = (
+    "general", "pilots", "controllers", "atis", "servers", "prefiles",
+    "facilities", "ratings", "pilot_ratings", "military_ratings",
+)
+# Sections that make up a FeedSnapshot
+SNAPSHOT_SECTIONS = ("general", "pilots", "controllers", "atis")
+# Sections whose entries are connected clients
+CLIENT_SECTIONS = ("pilots", "controllers", "atis")
+
+_WHITESPACE = b" \t\r\n"
+_CID_RE = re.compile(rb'"cid"\s*:\s*(\d+)')
+_UPDATE_TIMESTAMP_RE = re.compile(rb'"update_timestamp"\s*:\s*"([^"]*)"')
+
+
+def _locate_sections(raw):
+    """Map each top-level feed key to the (start, end) byte span of its value.
+
+    Keys are searched in the feed's usual order so the body is scanned about
+    once. A quoted key can't occur inside a string value without escaping; if a
+    nested object happens to reuse a key name, the spans around it are not
+    valid JSON on their own and `decode_sections` falls back to a full decode.
+    Returns None when the body doesn't look like the datafeed.
+    """
+    if not isinstance(raw, (bytes, bytearray)):
+        return None
+    found = []
+    pos = 0
+    for key in FEED_SECTIONS:
+        needle = b'"' + key.encode() + b'"'
+        at = raw.find(needle, pos)
+        if at == -1:
+            at = raw.find(needle)
+            if at == -1:
+                continue
+        colon = at + len(needle)
+        while colon < len(raw) and raw[colon] in _WHITESPACE:
+            colon += 1
+        if colon >= len(raw) or raw[colon] != ord(":"):
+            return None
+        found.append((at, colon + 1, key))
+        pos = colon + 1
+    if not found:
+        return None
+
+    found.sort()
+    close = raw.rfind(b"}")
+    spans = {}
+    for i, (_, start, key) in enumerate(found):
+        if i + 1 < len(found):
+            # Stop at the separator before the next key
+            end = raw.rfind(b",", start, found[i + 1][0])
+        else:
+            end = close
+        if end < start:
+            return None
+        spans[key] = (start, end)
+    return spans
+
+
+def _decode_slice(raw, start, end):
+    if BACKEND == "json":
+        return _loads(raw[start:end])
+    return _loads(memoryview(raw)[start:end])
+
+
+def decode_sections(raw, sections):
+    """Decode only the requested top-level sections of the datafeed.
+
+    Returns a dict with just those keys. Falls back to a full decode when a
+    slice isn't valid JSON (unexpected layout or unknown top-level keys).
+    """
+    spans = _locate_sections(raw)
+    if spans is not None:
+        try:
+            return {key: _decode_slice(raw, *spans[key]) for key in sections if key in spans}
+        except ValueError:
+            # A slice that isn't valid JSON means the layout wasn't what we expected
+            pass
+    data = loads(raw)
+    if not isinstance(data, dict):
+        return None
+    return {key: data[key] for key in sections if key in data}
+
+
+def extract_cids(raw, sections=CLIENT_SECTIONS):
+    """Return the CIDs in the given sections without decoding them."""
+    spans = _locate_sections(raw)
+    if spans is None:
+        data = decode_sections(raw, sections) or {}
+        return [int(c["cid"]) for key in sections for c in data.get(key) or [] if c.get("cid") is not None]
+    cids = []
+    for key in sections:
+        if key in spans:
+            start, end = spans[key]
+            cids.extend(int(m) for m in _CID_RE.findall(raw, start, end))
+    return cids
+
+
+def extract_update_timestamp(raw):
+    """Return `general.update_timestamp` from the raw body without decoding it (None if absent)."""
+    if not isinstance(raw, (bytes, bytearray)):
+        return None
+    # `general` comes first in the feed, so this stops within the first few hundred bytes
+    m = _UPDATE_TIMESTAMP_RE.search(raw)
+    return m.group(1).decode() if m else None
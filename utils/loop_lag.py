@@ -0,0 +1,173 @@
+"""Event-loop lag watchdog.
+
+A heartbeat task on the event loop wakes every HEARTBEAT seconds and records how
+late it woke (the loop's lag). A separate thread watches the heartbeat; when it
+has been silent for longer than the threshold, something is blocking the loop,
+so the thread grabs the loop thread's stack at that moment. Once the loop comes
+back the stall's total duration is recorded along with the blocking frame, the
+cog and, when a command handler is on the stack, the command.
+
+Stalls are appended to a rotating log in data/logs/ and kept in memory for `!lag`.
+"""
+import asyncio
+import collections
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from utils.data_manager import DATA_DIR
+from utils.metrics import LOOP_LAG_SECONDS, LOOP_STALLS
+
+HEARTBEAT = 0.1
+LOG_PATH = os.path.join(DATA_DIR, "logs", "loop_lag.log")
+# Directories whose frames count as "our" code when naming the blocking call
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_REPO_DIRS = tuple(os.path.join(_REPO_ROOT, d) + os.sep for d in ("extensions", "utils"))
+
+
+def _get_logger():
+    logger = logging.getLogger("loop_lag")
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(LOG_PATH, maxBytes=1_000_000, backupCount=3)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def _describe(frame):
+    """Return (cog, command, location, stack_lines) for the loop thread's current frame."""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()  # outermost first
+
+    cog = command = location = None
+    for f in frames:
+        module = f.f_globals.get("__name__", "")
+        if cog is None and module.startswith("extensions."):
+            cog = module[len("extensions."):]
+        if command is None:
+            ctx = f.f_locals.get("ctx")
+            cmd = getattr(ctx, "command", None)
+            if cmd is not None:
+                command = getattr(cmd, "qualified_name", None)
+        if f.f_code.co_filename.startswith(_REPO_DIRS):
+            # Innermost repo frame: the line that made the blocking call
+            location = f"{module}.{f.f_code.co_name}:{f.f_lineno}"
+
+    stack_lines = [
+        f"{f.f_globals.get('__name__', '?')}.{f.f_code.co_name} ({os.path.basename(f.f_code.co_filename)}:{f.f_lineno})"
+        for f in frames
+    ]
+    if location is None and frames:
+        f = frames[-1]
+        location = f"{f.f_globals.get('__name__', '?')}.{f.f_code.co_name}:{f.f_lineno}"
+    return cog or "other", command, location or "unknown", stack_lines
+
+
+class LoopLagWatchdog:
+    """Measures event-loop lag and records the stack of anything that blocks it."""
+
+    def __init__(self, threshold=0.25, history=50):
+        self.threshold = threshold
+        self.stalls = collections.deque(maxlen=history)
+        self.max_lag = 0.0
+        self._last_beat = time.monotonic()
+        self._loop_thread = None
+        self._task = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._pending = None  # stall captured by the watchdog thread, finished once the loop beats again
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._thread.start()
+
+    def recent(self, count=5):
+        with self._lock:
+            return list(self.stalls)[-count:]
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    async def _heartbeat(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(HEARTBEAT)
+            now = time.monotonic()
+            lag = max(0.0, now - before - HEARTBEAT)
+            LOOP_LAG_SECONDS.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            with self._lock:
+                self._last_beat = now
+
+    def _watch(self):
+        # Runs off the event loop so capturing and logging a stall never adds to it
+        while not self._stop.wait(HEARTBEAT / 2):
+            with self._lock:
+                last_beat = self._last_beat
+                pending = self._pending
+            if pending is not None:
+                if last_beat > pending["beat"]:
+                    self._pending = None
+                    self._finish(pending, last_beat - pending["beat"] - HEARTBEAT)
+                continue
+            if time.monotonic() - last_beat < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            cog, command, location, stack = _describe(frame)
+            del frame
+            self._pending = {
+                "beat": last_beat,
+                "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "cog": cog, "command": command, "location": location, "stack": stack,
+            }
+
+    def _finish(self, stall, duration):
+        del stall["beat"]
+        stall["seconds"] = round(duration, 3)
+        with self._lock:
+            self.stalls.append(stall)
+        LOOP_STALLS.inc(cog=stall["cog"])
+        who = stall["cog"] + (f" (!{stall['command']})" if stall["command"] else "")
+        print(f"[Loop Lag] Event loop blocked {duration:.2f}s by {who} at {stall['location']}")
+        try:
+            logger = _get_logger()
+            logger.info(f"{stall['at']} blocked {duration:.3f}s cog={stall['cog']} "
+                        f"command={stall['command'] or '-'} at {stall['location']}")
+            for line in stall["stack"]:
+                logger.info(f"    {line}")
+        except OSError as e:
+            print(f"[Loop Lag] Could not write {LOG_PATH}: {e}")
+
+    def offenders(self):
+        """Return [(cog, command, location, count, total_s, worst_s)] from the kept stalls, worst total first."""
+        with self._lock:
+            stalls = list(self.stalls)
+        grouped = {}
+        for stall in stalls:
+            key = (stall["cog"], stall["command"], stall["location"])
+            count, total, worst = grouped.get(key, (0, 0.0, 0.0))
+            grouped[key] = (count + 1, total + stall["seconds"], max(worst, stall["seconds"]))
+        rows = [(*key, *vals) for key, vals in grouped.items()]
+        rows.sort(key=lambda r: r[4], reverse=True)
+        return rows
@@ -1,10 +1,11 @@
 import aiohttp
 from io import BytesIO
-from config import MAPBOX
+from urllib.parse import quote
+from config import MAPBOX, MAPBOX_API_URL
 import polyline
 import math
 
-BASE_URL = "https://api.mapbox.com/styles/v1/mapbox/streets-v12/static"
+BASE_URL = f"{MAPBOX_API_URL}/styles/v1/mapbox/streets-v12/static"
 
 
 def compute_zoom(points, width=600, height=400, padding_km=25, min_zoom=4, max_zoom=15):
@@ -52,7 +53,8 @@ async def generate_map_image(center_lat, center_lon, pins=None, path_coords=None
 
     # Add path if available
     if path_coords and len(path_coords) >= 2:
-        encoded = polyline.encode(path_coords, precision=5)
+        # Polylines can contain `?`, `\` and friends, which must be escaped in the URL path
+        encoded = quote(polyline.encode(path_coords, precision=5), safe="")
         layers.append(f"path-3+0000ff-0.9({encoded})")
 
     # Add pins
@@ -0,0 +1,220 @@
+"""In-process metrics for the monitor loops, rendered in Prometheus text format.
+
+Counters, gauges and histograms live in one registry; `render()` produces the
+`/metrics` body served by extensions/metrics_server.py and `summary_lines()`
+gives the short digest shown by `!sys`.
+"""
+import functools
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0)
+
+_registry = []
+
+
+def _label_key(labelnames, labels):
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, key, extra=None):
+    pairs = list(zip(labelnames, key))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        _registry.append(self)
+
+    def samples(self):
+        for key, value in sorted(self._values.items()):
+            yield self.name, key, None, value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, extra, value in self.samples():
+            lines.append(f"{name}{_format_labels(self.labelnames, key, extra)} {value:g}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self._values[_label_key(self.labelnames, labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels):
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0, "last": 0.0}
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state["counts"][i] += 1
+        state["sum"] += value
+        state["count"] += 1
+        state["last"] = value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of a `with` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def stats(self, **labels):
+        """Return {count, sum, last, avg} for one label set (zeros if never observed)."""
+        state = self._values.get(_label_key(self.labelnames, labels))
+        if not state:
+            return {"count": 0, "sum": 0.0, "last": 0.0, "avg": 0.0}
+        return {"count": state["count"], "sum": state["sum"], "last": state["last"],
+                "avg": state["sum"] / state["count"]}
+
+    def samples(self):
+        for key, state in sorted(self._values.items()):
+            for bound, count in zip(self.buckets, state["counts"]):
+                yield f"{self.name}_bucket", key, ("le", f"{bound:g}"), count
+            yield f"{self.name}_bucket", key, ("le", "+Inf"), state["count"]
+            yield f"{self.name}_sum", key, None, state["sum"]
+            yield f"{self.name}_count", key, None, state["count"]
+
+
+# --- metrics used across the bot ---
+
+FEED_FETCH_SECONDS = Histogram("vatsim_feed_fetch_seconds", "Time to download the VATSIM datafeed")
+FEED_PARSE_SECONDS = Histogram("vatsim_feed_parse_seconds", "Time to decode the datafeed", ("kind",))
+FEED_ERRORS = Counter("vatsim_feed_errors_total", "Datafeed fetch or decode failures", ("stage",))
+HTTP_429 = Counter("http_429_total", "HTTP 429 responses received", ("source",))
+LOOP_SECONDS = Histogram("monitor_loop_seconds", "Total time of one monitor loop iteration", ("loop",))
+LOOP_MATCH_SECONDS = Histogram("monitor_match_seconds", "Time spent matching/diffing the snapshot", ("loop",))
+LOOP_OVERRUNS = Counter("monitor_loop_overruns_total", "Iterations that took longer than the loop interval", ("loop",))
+LOOP_ERRORS = Counter("monitor_loop_errors_total", "Iterations that raised", ("loop",))
+LOOP_DROPPED = Counter("monitor_cycles_dropped_total", "Feed cycles skipped because the previous one overran", ("loop",))
+FEED_BACKOFF = Gauge("vatsim_feed_backoff_seconds", "Current 429 backoff before the feed is fetched again")
+EMBED_RENDER_SECONDS = Histogram("embed_render_seconds", "Time to build a status embed (incl. geocode/map)")
+DISCORD_SEND_SECONDS = Histogram("discord_send_seconds", "Latency of Discord message sends/edits", ("op",))
+DISCORD_SEND_ERRORS = Counter("discord_send_errors_total", "Failed Discord sends/edits", ("op",))
+QUEUE_DEPTH = Gauge("render_queue_depth", "Bounded tasks submitted but not yet finished", ("label",))
+LOOP_LAG_SECONDS = Histogram("event_loop_lag_seconds", "How late the event loop woke a 100ms heartbeat",
+                             buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+LOOP_STALLS = Counter("event_loop_stalls_total", "Times the event loop was blocked past the lag threshold", ("cog",))
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by result", ("cache", "result"))
+
+
+def render():
+    """Return every metric in Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def instrument_loop(name, interval):
+    """Decorator for a loop body: records duration, errors and overruns of `interval` seconds.
+
+    `interval` may also be a callable taking the cog, for loops whose interval
+    is changed at runtime. Place it under `@tasks.loop(...)` so it wraps the
+    coroutine the loop calls.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                LOOP_ERRORS.inc(loop=name)
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                LOOP_SECONDS.observe(elapsed, loop=name)
+                limit = interval(*args[:1]) if callable(interval) else interval
+                if elapsed > limit:
+                    LOOP_OVERRUNS.inc(loop=name)
+        return wrapper
+    return decorator
+
+
+def _hit_rate(cache):
+    hits = CACHE_REQUESTS.get(cache=cache, result="hit")
+    total = hits + CACHE_REQUESTS.get(cache=cache, result="miss")
+    return f"{hits / total * 100:.0f}%" if total else "n/a"
+
+
+def summary_lines():
+    """Short human-readable digest for `!sys`."""
+    lines = []
+    loops = sorted({key[0] for key in LOOP_SECONDS._values})
+    if loops:
+        lines.append(f"{'Loop':<12}{'last':>8}{'avg':>8}{'runs':>7}{'over':>6}{'drop':>6}{'err':>5}")
+        for loop in loops:
+            s = LOOP_SECONDS.stats(loop=loop)
+            lines.append(
+                f"{loop:<12}{s['last']:>7.2f}s{s['avg']:>7.2f}s{s['count']:>7}"
+                f"{LOOP_OVERRUNS.get(loop=loop):>6}{LOOP_DROPPED.get(loop=loop):>6}{LOOP_ERRORS.get(loop=loop):>5}"
+            )
+    fetch = FEED_FETCH_SECONDS.stats()
+    parse = FEED_PARSE_SECONDS.stats(kind="snapshot")
+    render_stats = EMBED_RENDER_SECONDS.stats()
+    send = DISCORD_SEND_SECONDS.stats(op="send")
+    lines.append(
+        f"Feed: fetch {fetch['avg'] * 1000:.0f}ms avg, parse {parse['avg'] * 1000:.0f}ms avg "
+        f"({fetch['count']} fetches, {sum(FEED_ERRORS._values.values())} errors)"
+    )
+    lines.append(
+        f"Embeds: render {render_stats['avg'] * 1000:.0f}ms avg, send {send['avg'] * 1000:.0f}ms avg "
+        f"({send['count']} sent, {sum(DISCORD_SEND_ERRORS._values.values())} failed)"
+    )
+    lines.append(
+        f"Cache hit rate: feed {_hit_rate('feed')}, render {_hit_rate('render')}; "
+        f"429s: VATSIM {HTTP_429.get(source='vatsim')}, Discord {HTTP_429.get(source='discord')}"
+    )
+    depth = sum(QUEUE_DEPTH._values.values())
+    if depth:
+        lines.append(f"Render queue depth: {depth}")
+    return lines
@@ -0,0 +1,88 @@
+"""Low-overhead sampling profiler for the bot's event loop.
+
+A background thread samples the event-loop thread's Python stack every few
+milliseconds with `sys._current_frames()` and counts identical stacks. The
+result is written in collapsed-stack format (`root;child;leaf count` per line),
+which flamegraph.pl, speedscope and inferno all read, and summarised by the
+extension whose loop or command was on the stack.
+"""
+import collections
+import os
+import sys
+import threading
+import time
+
+DEFAULT_INTERVAL = 0.005
+
+# Leaf frames that mean the event loop is waiting for I/O, not running code
+_IDLE_LEAVES = {("selectors", "select"), ("selectors", "poll"), ("select", "select")}
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or os.path.basename(code.co_filename)
+    return module, code.co_name
+
+
+class SamplingProfiler:
+    """Samples one thread's stack from a daemon thread until stopped."""
+
+    def __init__(self, thread_id=None, interval=DEFAULT_INTERVAL):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.started = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+            self.stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """Return the samples as collapsed stacks, heaviest first."""
+        lines = []
+        for stack, count in self.stacks.most_common():
+            lines.append(";".join(f"{module}.{name}" for module, name in stack) + f" {count}")
+        return "\n".join(lines) + "\n"
+
+    def by_extension(self):
+        """Return [(label, samples)] attributing each sample to the outermost extension frame.
+
+        The label is `extension.function`, i.e. the cog's loop or command
+        handler. Samples with no extension frame count as `idle` (waiting in
+        select) or `other` (discord.py, aiohttp, asyncio internals).
+        """
+        totals = collections.Counter()
+        for stack, count in self.stacks.items():
+            owner = None
+            for module, name in stack:
+                if module.startswith("extensions."):
+                    owner = f"{module[len('extensions.'):]}.{name}"
+                    break
+            if owner is None:
+                owner = "idle" if stack and stack[-1] in _IDLE_LEAVES else "other"
+            totals[owner] += count
+        return totals.most_common()
@@ -0,0 +1,92 @@
+"""Row-level diffing of the FAA restrictions table between polls.
+
+`RestrictionsTable` keeps the last parsed table indexed by row identity and the
+hash of the page it came from. Each poll either matches the previous hash
+(nothing to parse) or yields a `RestrictionsDiff` of added, removed (cancelled)
+and modified rows.
+
+A row's identity is (requesting, providing, restriction text) plus its
+occurrence number among identical rows, so a restriction whose start/stop time
+is amended shows up as modified rather than as one cancellation and one new
+entry.
+"""
+import hashlib
+import time
+from collections import namedtuple
+
+from utils.faa_parse import restriction_matches
+
+
+class RestrictionsDiff(namedtuple("RestrictionsDiff", "added removed modified")):
+    def filter(self, req="ALL", prov="ALL"):
+        """Return the part of the diff touching one requesting/providing facility pair."""
+        return RestrictionsDiff(
+            [row for row in self.added if restriction_matches(row, req, prov)],
+            [row for row in self.removed if restriction_matches(row, req, prov)],
+            [(old, row) for old, row in self.modified if restriction_matches(row, req, prov)],
+        )
+
+
+def body_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def index_rows(rows):
+    """Return {identity: row} for [requesting, providing, restriction, start, stop] rows."""
+    index = {}
+    occurrences = {}
+    for row in rows:
+        base = (row[0], row[1], row[2])
+        n = occurrences.get(base, 0)
+        occurrences[base] = n + 1
+        index[base + (n,)] = tuple(row[:5])
+    return index
+
+
+class RestrictionsTable:
+    """The previous restrictions table, indexed for diffing against the next poll."""
+
+    def __init__(self, rows=(), digest=None, fresh=True):
+        self.digest = digest
+        self._set_rows(index_rows(rows))
+        if not fresh:
+            # Restored from disk: usable for diffing, but not as a recent fetch
+            self.updated_at = 0.0
+
+    def _set_rows(self, rows):
+        self.rows = rows
+        self.updated_at = time.monotonic() if rows or self.digest else 0.0
+        # Requesting/providing facility -> identities, so one facility's rows are found without a scan
+        self.by_req = {}
+        self.by_prov = {}
+        for key in rows:
+            self.by_req.setdefault(key[0].upper(), []).append(key)
+            self.by_prov.setdefault(key[1].upper(), []).append(key)
+
+    def select(self, req="ALL", prov="ALL"):
+        """Return the current rows for a requesting/providing facility pair, in table order."""
+        if req != "ALL":
+            keys = self.by_req.get(req, [])
+        elif prov != "ALL":
+            keys = self.by_prov.get(prov, [])
+        else:
+            keys = self.rows
+        return [self.rows[key] for key in keys if restriction_matches(self.rows[key], req, prov)]
+
+    def unchanged(self, digest):
+        """True when the page body hashes the same as the last one applied (the table is then still current)."""
+        if digest is None or digest != self.digest:
+            return False
+        self.updated_at = time.monotonic()
+        return True
+
+    def apply(self, rows, digest=None):
+        """Replace the table with `rows` and return what changed."""
+        new = index_rows(rows)
+        old = self.rows
+        added = [row for key, row in new.items() if key not in old]
+        removed = [row for key, row in old.items() if key not in new]
+        modified = [(old[key], row) for key, row in new.items() if key in old and old[key] != row]
+        self.digest = digest
+        self._set_rows(new)
+        return RestrictionsDiff(added, removed, modified)
@@ -0,0 +1,106 @@
+import time
+import discord
+from io import BytesIO
+from config import CHANNEL_ID
+from utils.data_manager import load_channel_routes
+from utils.metrics import DISCORD_SEND_SECONDS, DISCORD_SEND_ERRORS, HTTP_429
+
+# Monitor names that can be routed with `!route`
+MONITORS = ("cid", "callsign", "type", "coc", "newcid", "faa", "p56", "area", "dm")
+
+
+# channel_routes.json, read on first use; `!route add/remove` call reload_routes() after saving
+_routes = None
+
+
+def get_routes():
+    """Return {monitor: [channel ids]} as saved with `!route`, from memory."""
+    global _routes
+    if _routes is None:
+        _routes = load_channel_routes()
+    return _routes
+
+
+def reload_routes():
+    """Drop the in-memory routes so the next lookup reads channel_routes.json again."""
+    global _routes
+    _routes = None
+
+
+def get_route_channel_ids(monitor):
+    """Return the channel ids a monitor posts to, falling back to CHANNEL_ID."""
+    channel_ids = get_routes().get(monitor) or []
+    if not channel_ids and CHANNEL_ID:
+        return [CHANNEL_ID]
+    return channel_ids
+
+
+def get_route_channels(bot, monitor):
+    """Resolve routed channel ids to channel objects the bot can see (any guild)."""
+    channels = []
+    for channel_id in get_route_channel_ids(monitor):
+        channel = bot.get_channel(channel_id)
+        if channel:
+            channels.append(channel)
+    return channels
+
+
+def _file_payload(file):
+    """Read a discord.File once so the same bytes can be uploaded to every destination."""
+    if file is None:
+        return None
+    if isinstance(file, tuple):
+        return file
+    data = file.fp.read()
+    return (file.filename, data)
+
+
+def _make_file(payload):
+    filename, data = payload
+    return discord.File(BytesIO(data), filename=filename)
+
+
+def _record_failure(op, error):
+    DISCORD_SEND_ERRORS.inc(op=op)
+    if getattr(error, "status", None) == 429:
+        HTTP_429.inc(source="discord")
+
+
+async def send_routed(bot, monitor, embed=None, file=None, files=None, content=None):
+    """Send one rendered embed to every channel routed for `monitor`.
+
+    Returns the list of sent messages so callers can edit them later.
+    """
+    payloads = [_file_payload(f) for f in (files or [file]) if f is not None]
+    sent = []
+    for channel in get_route_channels(bot, monitor):
+        start = time.perf_counter()
+        try:
+            if payloads:
+                msg = await channel.send(content=content, embed=embed, files=[_make_file(p) for p in payloads])
+            else:
+                msg = await channel.send(content=content, embed=embed)
+            sent.append(msg)
+        except Exception as e:
+            _record_failure("send", e)
+            print(f"[routing] Failed to send {monitor} alert to {channel.id}: {e}")
+        finally:
+            DISCORD_SEND_SECONDS.observe(time.perf_counter() - start, op="send")
+    return sent
+
+
+async def edit_routed(messages, embed, file=None):
+    """Edit every fanned-out copy of a message, re-using one set of attachment bytes."""
+    payload = _file_payload(file)
+    for msg in messages or []:
+        start = time.perf_counter()
+        try:
+            if payload:
+                await msg.edit(embed=embed, attachments=[_make_file(payload)])
+            else:
+                await msg.edit(embed=embed, attachments=[])
+        except Exception as e:
+            _record_failure("edit", e)
+            print(f"[routing] Failed to edit message {msg.id}: {e}")
+        finally:
+            DISCORD_SEND_SECONDS.observe(time.perf_counter() - start, op="edit")
@@ -0,0 +1,140 @@
+"""Connection history built from datafeed logon/logoff transitions.
+
+Every feed cycle `SessionIndex.update` compares the snapshot's connections
+with the sessions it has open: new (cid, callsign, type, logon_time) keys are
+inserted as open sessions and keys that disappeared are closed with the time
+of the last snapshot they were in. Rows live in SQLite (data/sessions.sqlite3,
+stdlib, no server) with indexes on (cid, logon) and (callsign, logon), so
+`!lastseen` and `!sessions` are index lookups rather than scans.
+
+Sessions still open when the bot stops are picked up again on the next start:
+those still online carry on, and the rest are closed at the last cycle the
+bot recorded, since nothing is known after that.
+"""
+import os
+import sqlite3
+import threading
+
+from utils.data_manager import DATA_DIR
+from utils.time_utils import parse_iso_utc
+
+SESSIONS_DB = os.path.join(DATA_DIR, "sessions.sqlite3")
+_TYPES = {"pilot": "pilot", "controller": "atc", "atis": "atis"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    cid INTEGER NOT NULL,
+    callsign TEXT NOT NULL,
+    type TEXT NOT NULL,
+    server TEXT,
+    logon REAL NOT NULL,
+    logoff REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_cid ON sessions (cid, logon);
+CREATE INDEX IF NOT EXISTS sessions_callsign ON sessions (callsign, logon);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+"""
+
+_COLUMNS = "cid, callsign, type, server, logon, logoff"
+
+
+def _epoch(value, default):
+    try:
+        return parse_iso_utc(value).timestamp()
+    except (TypeError, ValueError, OverflowError):
+        return default
+
+
+class SessionIndex:
+    """Session log in SQLite plus the in-memory set of sessions open right now."""
+
+    def __init__(self, path=SESSIONS_DB):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Used from one worker thread for writes and others for reads; the lock serialises them
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;" + _SCHEMA)
+        self._lock = threading.Lock()
+        # (type, cid, callsign) -> [row id, feed logon_time, logon epoch]; logon_time is None
+        # for sessions resumed from the database until the feed confirms them
+        self.open = {}
+        self.last_update = None
+        self._resume()
+
+    def _resume(self):
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'last_update'").fetchone()
+        self.last_update = row[0] if row else None
+        for row_id, kind, cid, callsign, logon in self._db.execute(
+            "SELECT id, type, cid, callsign, logon FROM sessions WHERE logoff IS NULL"
+        ):
+            self.open[(kind, cid, callsign)] = [row_id, None, logon]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def update(self, snapshot, now):
+        """Record one snapshot (taken at epoch `now`). Returns (opened, closed) counts."""
+        current = {}
+        for section in (snapshot.pilots, snapshot.controllers, snapshot.atis):
+            for client in section:
+                current[(_TYPES[client._source], client.cid, client.callsign)] = client
+
+        new = []
+        gone = [key for key in self.open if key not in current]
+        for key, client in current.items():
+            entry = self.open.get(key)
+            if entry is not None:
+                if entry[1] == client.logon_time:
+                    continue
+                if entry[1] is None and entry[2] == _epoch(client.logon_time, None):
+                    entry[1] = client.logon_time  # resumed session confirmed by the feed
+                    continue
+                gone.append(key)  # reconnected under the same callsign between two cycles
+            new.append(key)
+        ended_at = self.last_update if self.last_update is not None else now
+
+        with self._lock, self._db:
+            for key in gone:
+                self._db.execute("UPDATE sessions SET logoff = ? WHERE id = ?", (ended_at, self.open.pop(key)[0]))
+            for key in new:
+                kind, cid, callsign = key
+                client = current[key]
+                logon = _epoch(client.logon_time, now)
+                cursor = self._db.execute(
+                    "INSERT INTO sessions (cid, callsign, type, server, logon) VALUES (?, ?, ?, ?, ?)",
+                    (cid, callsign, kind, client.server, logon),
+                )
+                self.open[key] = [cursor.lastrowid, client.logon_time, logon]
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_update', ?)", (now,))
+        self.last_update = now
+        return len(new), len(gone)
+
+    def _query(self, where, args, limit):
+        with self._lock:
+            return self._db.execute(
+                f"SELECT {_COLUMNS} FROM sessions WHERE {where} ORDER BY logon DESC LIMIT ?",
+                (*args, limit),
+            ).fetchall()
+
+    def by_cid(self, cid, limit=10):
+        """Most recent sessions for a CID as (cid, callsign, type, server, logon, logoff), newest first."""
+        return self._query("cid = ?", (int(cid),), limit)
+
+    def by_callsign(self, callsign, limit=10):
+        """Most recent sessions for a callsign; `*` matches any run of characters (e.g. `AAL*`)."""
+        callsign = callsign.upper()
+        if "*" in callsign:
+            # GLOB is case-sensitive, so a fixed prefix still uses the callsign index
+            return self._query("callsign GLOB ?", (callsign,), limit)
+        return self._query("callsign = ?", (callsign,), limit)
+
+    def hours(self, cid, since, now):
+        """Return {type: hours} a CID was connected between `since` and `now` (open sessions count to `now`)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT type, SUM(MIN(COALESCE(logoff, ?), ?) - MAX(logon, ?)) FROM sessions "
+                "WHERE cid = ? AND COALESCE(logoff, ?) > ? GROUP BY type",
+                (now, now, since, int(cid), now, since),
+            ).fetchall()
+        return {kind: total / 3600 for kind, total in rows if total}
@@ -0,0 +1,292 @@
+"""Append-only, compressed archive of datafeed snapshots.
+
+Layout (under data/archive/ by default)::
+
+    20240501T12-00.fz     one segment per UTC hour (and per restart within it)
+    20240501T12-01.fz
+    20240501T13-00.fz
+
+A segment is a single compressed stream (zstd when `zstandard` is installed,
+otherwise zlib) of newline-delimited JSON frames, flushed after every frame so
+a crash loses at most the frame being written. The first frame of a segment is
+a keyframe holding every connection; each later frame only holds what changed
+since the previous snapshot: connections that logged on (`a`), the fields that
+changed on existing ones (`u`) and the keys that logged off (`d`). Pilots move
+every cycle, so a delta is mostly positions; everything else (names, flight
+plans, ATIS) is written once.
+
+Segment names are the time index: a range scan opens only the hours that
+overlap it and reads them front to back. `scan` yields reconstructed feeds
+(`{"general", "pilots", "controllers", "atis"}`), which is what
+`scripts/replay_server.py --archive` serves to replay a window through the
+monitors.
+"""
+import glob
+import json
+import os
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from utils.data_manager import DATA_DIR
+from utils.time_utils import parse_iso_utc
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+SECTIONS = ("pilots", "controllers", "atis")
+_KIND = {"pilot": "p", "controller": "c", "atis": "a"}
+_SECTION = {"p": "pilots", "c": "controllers", "a": "atis"}
+
+
+def _key(record):
+    kind = _KIND[record._source]
+    return f"{kind}:{record.cid}:{record.callsign}"
+
+
+def _value(value):
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def _changed_fields(old, new):
+    # Records from consecutive snapshots never share objects, so compare slot by slot
+    return {
+        name: _value(getattr(new, name))
+        for name in new._slot_names
+        if getattr(old, name) != getattr(new, name)
+    }
+
+
+def _hour_of(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y%m%dT%H")
+
+
+def _segment_hour(path):
+    name = os.path.basename(path)
+    return datetime.strptime(name[:11], "%Y%m%dT%H").replace(tzinfo=timezone.utc)
+
+
+class _Compressor:
+    """Streaming compressor flushed at frame boundaries, so the file is always readable."""
+
+    def __init__(self):
+        if zstandard is not None:
+            self.ext = ".zst"
+            self._obj = zstandard.ZstdCompressor(level=3).compressobj()
+            self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self.ext = ".fz"
+            self._obj = zlib.compressobj(6)
+            self._flush_mode = zlib.Z_SYNC_FLUSH
+
+    def compress(self, data):
+        return self._obj.compress(data) + self._obj.flush(self._flush_mode)
+
+
+def _read_segment(path):
+    """Return a segment's decompressed bytes; a truncated tail (crash mid-write) is ignored."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{os.path.basename(path)} needs the zstandard package")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return zlib.decompressobj().decompress(data)
+
+
+def _segment_frames(path):
+    for line in _read_segment(path).split(b"\n"):
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Partial last line
+            return
+
+
+class ArchiveWriter:
+    """Appends snapshots to the current hour's segment as keyframe + deltas."""
+
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        self.path = None
+        self._file = None
+        self._compressor = None
+        self._hour = None
+        self._prev = None  # key -> record of the last written snapshot
+        self.frames = 0
+        self.bytes_written = 0
+
+    def _open_segment(self, hour):
+        os.makedirs(self.directory, exist_ok=True)
+        self.close()
+        self._compressor = _Compressor()
+        seq = len(glob.glob(os.path.join(self.directory, f"{hour}-*")))
+        self.path = os.path.join(self.directory, f"{hour}-{seq:02d}{self._compressor.ext}")
+        self._file = open(self.path, "ab")
+        self._hour = hour
+        self._prev = None
+
+    def append(self, snapshot, ts):
+        """Write one FeedSnapshot taken at epoch `ts`. Returns the compressed size of the frame."""
+        hour = _hour_of(ts)
+        if hour != self._hour:
+            self._open_segment(hour)
+
+        current = {}
+        for section in (snapshot.pilots, snapshot.controllers, snapshot.atis):
+            for record in section:
+                current[_key(record)] = record
+
+        prev = self._prev
+        if prev is None:
+            frame = {"t": ts, "k": 1, "a": {key: record.to_dict() for key, record in current.items()}}
+        else:
+            added = {}
+            updated = {}
+            for key, record in current.items():
+                old = prev.get(key)
+                if old is None:
+                    added[key] = record.to_dict()
+                elif old is not record:
+                    changes = _changed_fields(old, record)
+                    if changes:
+                        updated[key] = changes
+            removed = [key for key in prev if key not in current]
+            frame = {"t": ts, "a": added, "u": updated, "d": removed}
+
+        line = json.dumps(frame, separators=(",", ":")).encode("utf-8") + b"\n"
+        data = self._compressor.compress(line)
+        self._file.write(data)
+        self._file.flush()
+        self._prev = current
+        self.frames += 1
+        self.bytes_written += len(data)
+        return len(data)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def segments(directory=ARCHIVE_DIR, start=None, end=None):
+    """Return segment paths overlapping [start, end] (epoch seconds, either open), oldest first."""
+    paths = sorted(glob.glob(os.path.join(directory, "*.fz")) + glob.glob(os.path.join(directory, "*.zst")))
+    picked = []
+    for path in paths:
+        try:
+            hour = _segment_hour(path)
+        except ValueError:
+            continue
+        hour_start = hour.timestamp()
+        if start is not None and hour_start + 3600 <= start:
+            continue
+        if end is not None and hour_start > end:
+            continue
+        picked.append(path)
+    return picked
+
+
+def scan(start=None, end=None, directory=ARCHIVE_DIR):
+    """Yield (ts, {key: client dict}) for every archived snapshot in [start, end], in order.
+
+    The dict is the reconstructed state and is reused between frames, so copy
+    anything that must outlive one iteration.
+    """
+    for path in segments(directory, start, end):
+        state = {}
+        for frame in _segment_frames(path):
+            if frame.get("k"):
+                state = frame["a"]
+            else:
+                for key in frame.get("d", ()):
+                    state.pop(key, None)
+                for key, changes in frame.get("u", {}).items():
+                    client = state.get(key)
+                    if client is not None:
+                        # Every dict here came fresh from json.loads, so update in place
+                        client.update(changes)
+                state.update(frame.get("a", {}))
+            ts = frame["t"]
+            if end is not None and ts > end:
+                return
+            if start is None or ts >= start:
+                yield ts, state
+
+
+def logons(start=None, end=None, directory=ARCHIVE_DIR):
+    """Yield (ts, kind, cid, callsign) for each connection seen logging on in [start, end].
+
+    Only the keys are read, so this is much cheaper than `scan` for "who used
+    callsign X" questions. Connections already online when a segment starts are
+    reported at its first frame.
+    """
+    for path in segments(directory, start, end):
+        for frame in _segment_frames(path):
+            ts = frame["t"]
+            if end is not None and ts > end:
+                return
+            if start is not None and ts < start:
+                continue
+            for key in frame.get("a", ()):
+                kind, cid, callsign = key.split(":", 2)
+                yield ts, _SECTION[kind], int(cid), callsign
+
+
+def to_feed(ts, state):
+    """Rebuild a v3 datafeed document from one scanned state."""
+    feed = {
+        "general": {
+            "update_timestamp": datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        },
+    }
+    for section in SECTIONS:
+        feed[section] = []
+    for key, client in state.items():
+        feed[_SECTION[key[0]]].append(client)
+    return feed
+
+
+def snapshot_time(snapshot):
+    """Epoch seconds of a snapshot's update_timestamp (now if missing)."""
+    dt = parse_iso_utc(snapshot.update_timestamp) if snapshot.update_timestamp else None
+    return dt.timestamp() if dt else datetime.now(timezone.utc).timestamp()
+
+
+def prune(retention_days, directory=ARCHIVE_DIR, now=None):
+    """Delete segments older than `retention_days`. Returns how many were removed."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = (now - timedelta(days=retention_days)).timestamp()
+    removed = 0
+    for path in segments(directory, end=cutoff - 3600):
+        os.remove(path)
+        removed += 1
+    return removed
+
+
+def stats(directory=ARCHIVE_DIR):
+    """Return (segment count, total bytes, first hour, last hour) for `!archive status`."""
+    paths = segments(directory)
+    total = sum(os.path.getsize(p) for p in paths)
+    first = _segment_hour(paths[0]) if paths else None
+    last = _segment_hour(paths[-1]) if paths else None
+    return len(paths), total, first, last
+
+
+def export(start, end, out_dir, directory=ARCHIVE_DIR):
+    """Write every snapshot in [start, end] as NNNN.json feeds (replay_server --feeds format)."""
+    os.makedirs(out_dir, exist_ok=True)
+    count = 0
+    for ts, state in scan(start, end, directory):
+        count += 1
+        with open(os.path.join(out_dir, f"{count:04d}.json"), "w", encoding="utf-8") as f:
+            json.dump(to_feed(ts, state), f)
+    return count
@@ -1,7 +1,55 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from dateutil import parser
 
 
+@lru_cache(maxsize=4096)
+def parse_iso_utc(value):
+    """Parse a timestamp into an aware UTC datetime.
+
+    Fast path for the datafeed's fixed format (`2024-05-01T12:34:56.1234567Z`);
+    anything else goes through dateutil. Results are memoised because
+    logon_time values repeat every cycle for the life of a connection.
+    """
+    if (
+        len(value) >= 20 and value[-1] == "Z" and value[4] == "-" and value[7] == "-"
+        and value[10] == "T" and value[13] == ":" and value[16] == ":"
+    ):
+        try:
+            micro = 0
+            if value[19] == ".":
+                # The feed uses 7 fractional digits; datetime keeps 6
+                micro = int(value[20:-1][:6].ljust(6, "0"))
+            elif len(value) != 20:
+                raise ValueError(value)
+            return datetime(
+                int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                int(value[11:13]), int(value[14:16]), int(value[17:19]),
+                micro, tzinfo=timezone.utc,
+            )
+        except ValueError:
+            pass
+
+    dt = parser.parse(value)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def format_utc_relative(value, fmt="%Y-%m-%d %H:%MZ", default="N/A"):
+    """Format a timestamp as a Zulu time plus a Discord relative timestamp.
+
+    Returns `default` for empty values and the raw value if it cannot be parsed.
+    """
+    if not value or value == "N/A":
+        return default
+    try:
+        dt = parse_iso_utc(value)
+    except Exception:
+        return str(value)
+    return f"{dt.strftime(fmt)}\n<t:{int(dt.timestamp())}:R>"
+
+
 def format_date(iso_string):
     if not iso_string:
         return "N/A"
@@ -13,6 +61,6 @@ def format_date(iso_string):
 
 def format_time(iso_str):
     try:
-        return parser.isoparse(iso_str).strftime("%Y-%m-%d %H:%MZ")
+        return parse_iso_utc(iso_str).strftime("%Y-%m-%d %H:%MZ")
     except Exception:
         return iso_str or "N/A"
@@ -0,0 +1,182 @@
+"""Recent position history for watched pilots, for drawing flown tracks on maps.
+
+Each watched CID gets a `TrackBuffer`: a fixed-capacity ring of (ts, lat, lon,
+alt, gs) held in `array('d')` columns, so a buffer is a few flat arrays rather
+than thousands of tuples and memory stays bounded however long the flight.
+Before a track goes into a Mapbox URL it is simplified with Douglas-Peucker
+(`simplify_track`), which keeps the turns and drops the straight legs, so the
+encoded polyline stays short.
+
+The monitor loops record positions every cycle (`tracks.record`) and the
+status embed asks for the simplified path when it renders a map.
+"""
+import math
+import time
+from array import array
+
+# 3 hours at one position per 15s feed cycle
+TRACK_CAPACITY = 720
+# Tracks not updated for this long (pilot disconnected or no longer watched) are dropped
+TRACK_IDLE_SECONDS = 1800
+# Douglas-Peucker tolerance in degrees (~0.6 NM); doubled until the path fits MAX_PATH_POINTS
+SIMPLIFY_EPSILON = 0.01
+MAX_PATH_POINTS = 100
+
+
+class TrackBuffer:
+    """Fixed-capacity ring of (ts, lat, lon, alt, gs) samples, oldest overwritten first."""
+
+    __slots__ = ("capacity", "session", "_ts", "_lat", "_lon", "_alt", "_gs", "_start", "_len")
+
+    def __init__(self, capacity=TRACK_CAPACITY, session=None):
+        self.capacity = capacity
+        self.session = session  # logon_time of the connection the track belongs to
+        zeros = [0.0] * capacity
+        self._ts = array("d", zeros)
+        self._lat = array("d", zeros)
+        self._lon = array("d", zeros)
+        self._alt = array("d", zeros)
+        self._gs = array("d", zeros)
+        self._start = 0
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def append(self, ts, lat, lon, alt=0.0, gs=0.0):
+        if self._len == self.capacity:
+            i = self._start
+            self._start = (self._start + 1) % self.capacity
+        else:
+            i = (self._start + self._len) % self.capacity
+            self._len += 1
+        self._ts[i] = ts
+        self._lat[i] = lat
+        self._lon[i] = lon
+        self._alt[i] = alt or 0.0
+        self._gs[i] = gs or 0.0
+
+    def touch(self, ts):
+        """Move the newest sample's timestamp forward without adding a point."""
+        if self._len:
+            self._ts[(self._start + self._len - 1) % self.capacity] = ts
+
+    def last(self):
+        """Return the newest (ts, lat, lon, alt, gs), or None when empty."""
+        if not self._len:
+            return None
+        i = (self._start + self._len - 1) % self.capacity
+        return self._ts[i], self._lat[i], self._lon[i], self._alt[i], self._gs[i]
+
+    def _order(self):
+        return ((self._start + k) % self.capacity for k in range(self._len))
+
+    def points(self):
+        """Return every sample as (ts, lat, lon, alt, gs), oldest first."""
+        return [(self._ts[i], self._lat[i], self._lon[i], self._alt[i], self._gs[i]) for i in self._order()]
+
+    def latlon(self):
+        """Return [(lat, lon)], oldest first."""
+        return [(self._lat[i], self._lon[i]) for i in self._order()]
+
+
+def douglas_peucker(points, epsilon):
+    """Simplify [(lat, lon)] keeping every point further than `epsilon` degrees from the simplified line.
+
+    Longitude is scaled by cos(latitude) so the tolerance is roughly the same
+    distance in every direction. Iterative, so long tracks can't hit the
+    recursion limit.
+    """
+    n = len(points)
+    if n < 3:
+        return list(points)
+    scale = math.cos(math.radians(sum(p[0] for p in points) / n))
+    xs = [p[1] * scale for p in points]
+    ys = [p[0] for p in points]
+    keep = bytearray(n)
+    keep[0] = keep[n - 1] = 1
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        x1, y1, x2, y2 = xs[first], ys[first], xs[last], ys[last]
+        dx, dy = x2 - x1, y2 - y1
+        length = math.hypot(dx, dy)
+        worst, index = -1.0, -1
+        for i in range(first + 1, last):
+            if length:
+                dist = abs(dy * (xs[i] - x1) - dx * (ys[i] - y1)) / length
+            else:
+                dist = math.hypot(xs[i] - x1, ys[i] - y1)
+            if dist > worst:
+                worst, index = dist, i
+        if worst > epsilon:
+            keep[index] = 1
+            if index - first > 1:
+                stack.append((first, index))
+            if last - index > 1:
+                stack.append((index, last))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def simplify_track(points, epsilon=SIMPLIFY_EPSILON, max_points=MAX_PATH_POINTS):
+    """Douglas-Peucker with a growing tolerance until at most `max_points` remain."""
+    simplified = douglas_peucker(points, epsilon)
+    while len(simplified) > max_points:
+        epsilon *= 2
+        simplified = douglas_peucker(simplified, epsilon)
+    return simplified
+
+
+class TrackStore:
+    """TrackBuffers by CID for the pilots the monitors are watching."""
+
+    def __init__(self, capacity=TRACK_CAPACITY):
+        self.capacity = capacity
+        self.buffers = {}
+        self._last_prune = 0.0
+
+    def record(self, pilot, now=None):
+        """Append a pilot record's current position to its CID's track."""
+        lat = pilot.get("latitude")
+        lon = pilot.get("longitude")
+        if lat is None or lon is None:
+            return
+        now = time.time() if now is None else now
+        cid = pilot.get("cid")
+        session = pilot.get("logon_time")
+        buf = self.buffers.get(cid)
+        if buf is None or buf.session != session:
+            # New connection: start a fresh track rather than joining two flights
+            buf = self.buffers[cid] = TrackBuffer(self.capacity, session)
+        last = buf.last()
+        # Several loops watch the same pilot and may see the same snapshot
+        if last is None or last[1] != lat or last[2] != lon:
+            buf.append(now, lat, lon, pilot.get("altitude"), pilot.get("groundspeed"))
+        else:
+            # Stationary (e.g. parked): keep one sample, but mark it seen so it isn't pruned
+            buf.touch(now)
+        if now - self._last_prune > 60:
+            self.prune(now)
+
+    def prune(self, now=None):
+        now = time.time() if now is None else now
+        self._last_prune = now
+        for cid in [cid for cid, buf in self.buffers.items() if now - buf.last()[0] > TRACK_IDLE_SECONDS]:
+            del self.buffers[cid]
+
+    def get(self, cid, session=None):
+        """Return the CID's TrackBuffer, or None (also when it belongs to another session)."""
+        buf = self.buffers.get(cid)
+        if buf is None or (session is not None and buf.session != session):
+            return None
+        return buf
+
+    def path(self, cid, session=None):
+        """Return the CID's track as a simplified [(lat, lon)] ready for a map path."""
+        buf = self.get(cid, session)
+        if buf is None or len(buf) < 2:
+            return []
+        return simplify_track(buf.latlon())
+
+
+tracks = TrackStore()
@@ -1,28 +1,154 @@
+import asyncio
+import time
 import aiohttp
 import requests
+from config import VATSIM_DATA_URL, VATSIM_TRANSCEIVERS_URL, VATUSA_API_URL
+from utils.client_records import FeedSnapshot
+from utils.json_decode import loads, decode_feed_snapshot, decode_sections, extract_cids, extract_update_timestamp
+from utils.feed_scheduler import scheduler
+from utils.metrics import FEED_FETCH_SECONDS, FEED_PARSE_SECONDS, FEED_ERRORS, HTTP_429, CACHE_REQUESTS
 
-VATSIM_DATA_URL = "https://data.vatsim.net/v3/vatsim-data.json"
+# The feed refreshes every 15s; every loop and embed in the same cycle shares one download.
+FEED_CACHE_TTL = 10
 
+# The raw body is kept so partial consumers can slice it; the snapshot is decoded on first use
+_feed_cache = {"raw": None, "snapshot": None, "fetched_at": 0.0, "lock": None}
 
-async def fetch_vatsim_data():
-    """Fetch and return the full VATSIM data feed as a dictionary."""
+
+def get_feed_timestamp(data):
+    """Return the feed's `general.update_timestamp` (identifies one snapshot)."""
+    if isinstance(data, FeedSnapshot):
+        return data.update_timestamp
+    if not isinstance(data, dict):
+        return None
+    return (data.get("general") or {}).get("update_timestamp")
+
+
+async def fetch_vatsim_raw():
+    """Fetch the VATSIM data feed and return the undecoded response body."""
+    start = time.perf_counter()
     try:
         async with aiohttp.ClientSession() as session:
             async with session.get(VATSIM_DATA_URL) as response:
                 if response.status == 429:
+                    HTTP_429.inc(source="vatsim")
+                    scheduler.note_rate_limited(response.headers.get("Retry-After"))
                     raise Exception("Rate limited by VATSIM API (429)")
                 elif response.status != 200:
                     raise Exception(f"Failed to fetch data: HTTP {response.status}")
-                return await response.json()
+                raw = await response.read()
+        FEED_FETCH_SECONDS.observe(time.perf_counter() - start)
+        scheduler.note_success()
+        return raw
     except Exception as e:
+        FEED_ERRORS.inc(stage="fetch")
         print(f"[VATSIM Fetch Error] {e}")
         return None
 
 
+async def fetch_vatsim_data():
+    """Fetch and return the full VATSIM data feed as a dictionary."""
+    raw = await fetch_vatsim_raw()
+    if raw is None:
+        return None
+    try:
+        with FEED_PARSE_SECONDS.time(kind="full"):
+            return loads(raw)
+    except Exception as e:
+        FEED_ERRORS.inc(stage="decode")
+        print(f"[VATSIM Decode Error] {e}")
+        return None
+
+
+async def _get_cached_raw():
+    """Return this cycle's raw feed body, downloading it at most once per FEED_CACHE_TTL.
+
+    Must be called with the cache lock held. While backing off after a 429 the
+    last body is served again (or None if there isn't one) without a request.
+    """
+    if _feed_cache["raw"] is not None and time.monotonic() - _feed_cache["fetched_at"] < FEED_CACHE_TTL:
+        CACHE_REQUESTS.inc(cache="feed", result="hit")
+        return _feed_cache["raw"]
+    if scheduler.backoff_remaining():
+        CACHE_REQUESTS.inc(cache="feed", result="stale")
+        return _feed_cache["raw"]
+    CACHE_REQUESTS.inc(cache="feed", result="miss")
+    raw = await fetch_vatsim_raw()
+    if raw is None:
+        return None
+    _feed_cache["raw"] = raw
+    _feed_cache["snapshot"] = None
+    _feed_cache["fetched_at"] = time.monotonic()
+    scheduler.observe(extract_update_timestamp(raw))
+    return raw
+
+
+def _get_lock():
+    # Created lazily so the lock belongs to the bot's running event loop
+    if _feed_cache["lock"] is None:
+        _feed_cache["lock"] = asyncio.Lock()
+    return _feed_cache["lock"]
+
+
+async def fetch_vatsim_snapshot():
+    """Return the current feed as a FeedSnapshot of compact client records.
+
+    The snapshot is shared for FEED_CACHE_TTL seconds so concurrent loops do not
+    re-download or re-decode the feed. Only the client sections are decoded
+    (see utils.json_decode), so the full decoded dict is never built.
+    """
+    async with _get_lock():
+        raw = await _get_cached_raw()
+        if raw is None:
+            return None
+        if _feed_cache["snapshot"] is None:
+            try:
+                with FEED_PARSE_SECONDS.time(kind="snapshot"):
+                    _feed_cache["snapshot"] = decode_feed_snapshot(raw)
+            except Exception as e:
+                FEED_ERRORS.inc(stage="decode")
+                print(f"[VATSIM Decode Error] {e}")
+                return None
+        return _feed_cache["snapshot"]
+
+
+async def fetch_vatsim_sections(*sections):
+    """Return a dict holding only the requested top-level feed sections.
+
+    For consumers that need one or two sections (e.g. just `controllers`);
+    the rest of the feed is never decoded.
+    """
+    async with _get_lock():
+        raw = await _get_cached_raw()
+    if raw is None:
+        return None
+    try:
+        with FEED_PARSE_SECONDS.time(kind="sections"):
+            return decode_sections(raw, sections)
+    except Exception as e:
+        FEED_ERRORS.inc(stage="decode")
+        print(f"[VATSIM Decode Error] {e}")
+        return None
+
+
+async def fetch_online_cids():
+    """Return the CIDs of every connected pilot, controller and ATIS, without decoding the feed."""
+    async with _get_lock():
+        raw = await _get_cached_raw()
+    if raw is None:
+        return None
+    try:
+        with FEED_PARSE_SECONDS.time(kind="cids"):
+            return extract_cids(raw)
+    except Exception as e:
+        FEED_ERRORS.inc(stage="decode")
+        print(f"[VATSIM Decode Error] {e}")
+        return None
+
+
 def fetch_transceivers_data():
     """Fetch and return the transceivers data."""
-    url = "https://data.vatsim.net/v3/transceivers-data.json"
-    response = requests.get(url)
+    response = requests.get(VATSIM_TRANSCEIVERS_URL)
     response.raise_for_status()
     return response.json()
 
@@ -47,7 +173,7 @@ async def fetch_user_name(cid, session=None):
         close_session = True
 
     try:
-        url = f"https://api.vatusa.net/v2/user/{cid}"
+        url = f"{VATUSA_API_URL}/v2/user/{cid}"
         timeout = aiohttp.ClientTimeout(total=5)
         async with session.get(url, timeout=timeout) as response:
             if response.status == 200: